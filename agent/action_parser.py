@@ -9,6 +9,7 @@ import json
 import logging
 import random
 import re
+from dataclasses import dataclass
 
 from models import ParsedAction
 
@@ -32,7 +33,43 @@ def _default_action() -> dict:
 _JUNK_BEFORE_BRACE = re.compile(r'(?<=["\d])\s*[);\.,!]+\s*(?=\})')
 
 
+def is_complete_action(text: str) -> bool:
+    """True if *text* is a JSON object that validates as a ParsedAction.
+
+    Used to stop a streamed generation as soon as the answer is in.
+    """
+    for candidate in (text, _JUNK_BEFORE_BRACE.sub("", text)):
+        try:
+            ParsedAction.model_validate(json.loads(candidate))
+            return True
+        except (ValueError, TypeError):
+            continue
+    return False
+
+
+@dataclass
+class ParseStats:
+    """Which path each parse() call took; empty + failed fell back to explore."""
+
+    clean: int = 0  # output was valid JSON as-is
+    repaired: int = 0  # valid after stripping junk before the closing brace
+    extracted: int = 0  # {...} block cut out of surrounding text
+    failed: int = 0  # unparseable
+    empty: int = 0  # no output at all (error or timeout)
+
+    @property
+    def total(self) -> int:
+        return self.clean + self.repaired + self.extracted + self.failed + self.empty
+
+    @property
+    def failure_rate(self) -> float:
+        return (self.failed + self.empty) / self.total if self.total else 0.0
+
+
 class ActionParser:
+    def __init__(self):
+        self.stats = ParseStats()
+
     def parse(self, llm_output: str | None) -> dict:
         """
         Parse LLM output into {\"action\": ..., \"reason\": ..., <extra fields>}.
@@ -40,14 +77,20 @@ class ActionParser:
         Extra fields beyond ``action``/``reason`` are passed through unchanged.
         """
         if not llm_output:
+            self.stats.empty += 1
             return _default_action()
 
         output = llm_output.strip()
 
         # Fast path: output is clean JSON
         if output.startswith("{"):
-            result = self._try_parse(output) or self._try_parse(self._clean(output))
+            result = self._try_parse(output)
+            if result:
+                self.stats.clean += 1
+                return result
+            result = self._try_parse(self._clean(output))
             if result:
+                self.stats.repaired += 1
                 return result
 
         # Fallback: extract first {...} block from mixed text
@@ -59,8 +102,10 @@ class ActionParser:
                 self._clean(candidate)
             )
             if result:
+                self.stats.extracted += 1
                 return result
 
+        self.stats.failed += 1
         print(f"[ActionParser] Could not parse action. Raw: {output[:200]}")
         return _default_action()
 
@@ -7,6 +7,8 @@ Composes PrereqFilter (what is possible?) with ConcreteActionBuilder
 Callers import only this module — they never depend on the internals.
 """
 
+from collections.abc import Mapping
+
 from action_specs import ACTION_SPECS, ActionSpec
 from models import ActionOption, GameState
 from concrete_action_builder import ConcreteActionBuilder
@@ -34,11 +36,11 @@ class ActionPlanner:
     # Delegated PrereqFilter API
     # ------------------------------------------------------------------
 
-    def get_valid_actions(self, inv: dict[str, int]) -> list[str]:
+    def get_valid_actions(self, inv: Mapping[str, int]) -> list[str]:
         """Base actions whose prerequisites are met by *inv*."""
         return self._prereq.get_valid_actions(inv)
 
-    def format_valid_actions(self, inv: dict[str, int]) -> str:
+    def format_valid_actions(self, inv: Mapping[str, int]) -> str:
         return self._prereq.format_valid_actions(inv)
 
     # ------------------------------------------------------------------
@@ -46,7 +48,13 @@ class ActionPlanner:
     # ------------------------------------------------------------------
 
     def get_concrete_actions(
-        self, inv: dict[str, int], state: GameState
+        self,
+        inv: Mapping[str, int],
+        state: GameState,
+        valid_actions: list[str] | None = None,
     ) -> list[ActionOption]:
-        """Specific, labelled actions derived from inventory + live game state."""
-        return self._builder.build(inv, state)
+        """Specific, labelled actions derived from inventory + live game state.
+
+        Pass *valid_actions* (get_valid_actions(inv)) to skip recomputing it.
+        """
+        return self._builder.build(inv, state, valid_actions)
@@ -6,6 +6,7 @@ Single responsibility: define *what* each action needs and what it yields.
 No game-state logic lives here.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 
 
@@ -67,7 +68,7 @@ ACTION_SPECS: dict[str, ActionSpec] = {
 }
 
 # Canonical prefab aliases — only entries where the key differs from the value.
-# normalize_inv falls back to the lowercased key when no alias is found.
+# canonical_prefab falls back to the lowercased key when no alias is found.
 PREFAB_ALIASES: dict[str, str] = {
     "twig": "twigs",
     "rock": "rocks",
@@ -79,30 +80,41 @@ PREFAB_ALIASES: dict[str, str] = {
 # ---------------------------------------------------------------------------
 
 
-def normalize_inv(inv: dict[str, int]) -> dict[str, int]:
-    """Map inventory keys to canonical prefab names, summing duplicates."""
+def canonical_prefab(name: str) -> str:
+    """Return the canonical (lowercased, de-aliased) prefab name."""
+    key = name.lower()
+    return PREFAB_ALIASES.get(key, key)
+
+
+def normalize_inv(inv: Mapping[str, int]) -> Mapping[str, int]:
+    """Map inventory keys to canonical prefab names, summing duplicates.
+
+    An InventoryView is already canonical and is returned as-is.
+    """
+    from models.inventory import InventoryView  # models imports this module
+
+    if isinstance(inv, InventoryView):
+        return inv
     result: dict[str, int] = {}
     for key, count in inv.items():
-        canonical = PREFAB_ALIASES.get(key.lower(), key.lower())
+        canonical = canonical_prefab(key)
         result[canonical] = result.get(canonical, 0) + count
     return result
 
 
-def has_prereqs(inv: dict[str, int], requires: dict[str, int]) -> bool:
+def has_prereqs(inv: Mapping[str, int], requires: dict[str, int]) -> bool:
     """Return True if *inv* (already normalised) satisfies all *requires*."""
     for item, needed in requires.items():
-        canonical = PREFAB_ALIASES.get(item.lower(), item.lower())
-        if inv.get(canonical, 0) < needed:
+        if inv.get(canonical_prefab(item), 0) < needed:
             return False
     return True
 
 
-def missing_items(inv: dict[str, int], requires: dict[str, int]) -> dict[str, int]:
+def missing_items(inv: Mapping[str, int], requires: dict[str, int]) -> dict[str, int]:
     """Return only the items and counts still needed from *requires*."""
     result: dict[str, int] = {}
     for item, needed in requires.items():
-        canonical = PREFAB_ALIASES.get(item.lower(), item.lower())
-        have = inv.get(canonical, 0)
+        have = inv.get(canonical_prefab(item), 0)
         if have < needed:
             result[item] = needed - have
     return result
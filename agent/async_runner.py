@@ -0,0 +1,187 @@
+"""
+async_runner.py — asyncio agent loop that overlaps state ingestion with inference.
+
+DSAIAgent.run() is ``decide(); sleep(interval)``: with a 4 s LLM call and a
+5 s interval the agent acts on state up to ~9 s old. AsyncAgentRunner
+instead keeps polling the state file every ``poll_interval`` while the LLM
+call is in flight, works each new snapshot up to an Observation (read,
+trackers, planner, goals), and dispatches the newest one the moment the
+previous inference returns. Pacing comes from inference latency, not a
+fixed sleep.
+
+If a snapshot triggers a direct action (emergency override, death, broken
+state) while an inference is in flight, that inference is cancelled — its
+answer would overwrite the more urgent action. So is one whose snapshot the
+agent's PreemptionPolicy says a newer one invalidates (a threat appeared,
+health dropped), even when that newer snapshot still needs the LLM.
+
+All agent calls run on the event-loop thread, so DSAIAgent needs no
+locking; only the HTTP request is concurrent.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+from inference_backend import AsyncInferenceBackend
+from llm_agent import DSAIAgent, Observation
+from preemption import PreemptionStats
+
+
+@dataclass
+class RunnerStats:
+    decisions: int = 0  # LLM decisions completed and emitted
+    direct: int = 0  # emitted without the LLM (overrides, explore, cache, plans)
+    superseded: int = 0  # observations replaced by a newer one before dispatch
+    cancelled: int = 0  # in-flight inferences cancelled (see preemption)
+    staleness: float = 0.0  # summed seconds from state read to action emit
+
+    @property
+    def mean_staleness(self) -> float:
+        return self.staleness / self.decisions if self.decisions else 0.0
+
+
+class AsyncAgentRunner:
+    def __init__(
+        self,
+        agent: DSAIAgent,
+        llm: AsyncInferenceBackend,
+        poll_interval: float = 0.25,
+    ):
+        """
+        Args:
+            agent:         Fully wired agent; only observe(), prompt_for() and
+                           complete() are used.
+            llm:           Anything with ``async generate(prompt, schema) -> str | None``.
+            poll_interval: How often the state file is checked, both while
+                           idle and while an inference is in flight.
+        """
+        self.agent = agent
+        self.llm = llm
+        self.poll_interval = poll_interval
+        self.stats = RunnerStats()
+        self.preemption = PreemptionStats()
+        self._pending: Observation | None = None
+        self._inflight: asyncio.Task | None = None
+        self._inflight_obs: Observation | None = None
+        self._inflight_prompt = ""
+        self._inflight_started = 0.0  # time.perf_counter() at dispatch
+
+    async def run(self, max_decisions: int | None = None) -> None:
+        """Loop until cancelled (or after *max_decisions* LLM decisions)."""
+        try:
+            while max_decisions is None or self.stats.decisions < max_decisions:
+                self._ingest(self.agent.observe())
+
+                if self._inflight is None and self._pending is not None:
+                    self._dispatch()
+
+                if self._inflight is None:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    {self._inflight}, timeout=self.poll_interval
+                )
+                if done:
+                    self._complete()
+        finally:
+            if self._inflight is not None:
+                self._inflight.cancel()
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _ingest(self, result: Observation | dict | None) -> None:
+        if isinstance(result, Observation):
+            if self._pending is not None:
+                self.stats.superseded += 1
+            self._pending = result
+            if self._inflight is not None:
+                reason = self.agent.preemption_reason(
+                    self._inflight_obs.state, result.state
+                )
+                if reason is not None:
+                    self._cancel(reason)
+        elif isinstance(result, dict):
+            # observe() already emitted it; anything queued or running is moot
+            self.stats.direct += 1
+            self._pending = None
+            if self._inflight is not None:
+                reason = None
+                if self.agent.last_state is not None:
+                    reason = self.agent.preemption_reason(
+                        self._inflight_obs.state, self.agent.last_state
+                    )
+                self._cancel(reason or "direct")
+
+    def _cancel(self, reason: str) -> None:
+        print(f"[AsyncRunner] Cancelling in-flight inference ({reason})")
+        task, self._inflight = self._inflight, None
+        started, cancelled_at = self._inflight_started, time.perf_counter()
+        task.add_done_callback(
+            lambda _: self.preemption.record(
+                reason, started, cancelled_at, time.perf_counter()
+            )
+        )
+        task.cancel()
+        self.stats.cancelled += 1
+
+    def _dispatch(self) -> None:
+        obs, self._pending = self._pending, None
+        if self.agent.plan_step(obs) is not None:
+            self.stats.direct += 1
+            return
+        prompt = self.agent.prompt_for(obs)
+        cached = self.agent.cached_response(obs)
+        if cached is not None:
+            self.agent.complete(obs, prompt, cached, store=False)
+            self.stats.direct += 1
+            return
+        self._inflight_prompt = prompt
+        self._inflight_obs = obs
+        schema = self.agent.output_schema(obs)
+        self._inflight_started = time.perf_counter()
+        self._inflight = asyncio.create_task(
+            self.llm.generate(self._inflight_prompt, schema=schema, options=obs.options)
+        )
+
+    def _complete(self) -> None:
+        task, self._inflight = self._inflight, None
+        obs = self._inflight_obs
+        self.agent.timer.start()
+        self.agent.complete(obs, self._inflight_prompt, task.result())
+        self.stats.decisions += 1
+        self.stats.staleness += self.agent.clock.time() - obs.read_at
+
+
+def run_async(
+    agent: DSAIAgent, llm: AsyncInferenceBackend, poll_interval: float
+) -> None:
+    """Blocking entry point for main.py: run until Ctrl+C, then print stats."""
+    runner = AsyncAgentRunner(agent, llm, poll_interval=poll_interval)
+    print(f"[AsyncRunner] Starting — model={llm.model}, poll={poll_interval}s")
+    print("[AsyncRunner] Press Ctrl+C to stop\n")
+
+    async def _main() -> None:
+        try:
+            await runner.run()
+        finally:
+            await llm.aclose()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+    if agent.decision_cache is not None:
+        agent.decision_cache.close()
+    stats = runner.stats
+    print(
+        f"\n[AsyncRunner] Stopped after {stats.decisions} decisions "
+        f"({stats.direct} direct, {stats.superseded} superseded, "
+        f"{stats.cancelled} cancelled), mean staleness "
+        f"{stats.mean_staleness:.2f}s, {agent.idle_polls} polls with nothing new"
+    )
+    if runner.preemption.total:
+        print(f"[AsyncRunner] Preemption: {runner.preemption.summary()}")
@@ -0,0 +1,6 @@
+"""
+benchmarks — Standalone microbenchmarks for the agent's hot paths.
+
+Run from the agent/ directory, e.g.:
+    uv run python -m benchmarks.bench_state_parse
+"""
@@ -0,0 +1,102 @@
+"""
+bench_decision_context.py — Goal/action derivation per tick: repeated calls vs DecisionContext.
+
+"direct" is what observe() did before DecisionContext: the dusk override
+asks GoalManager for the short-term goal and the planner for valid actions,
+then the planner rebuilds valid actions inside get_concrete_actions and the
+goal is derived twice more (directly and inside format_for_prompt).
+"context" is the same work through one DecisionContext. Reports the number
+of get_short_term_goal / get_valid_actions calls and microseconds per tick
+for each fixture.
+
+Usage:
+    uv run python -m benchmarks.bench_decision_context [--iterations 5000]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from action_planner import ActionPlanner
+from decision_context import DecisionContext
+from goal_manager import GoalManager
+from models import GameState
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+class CountingGoalManager(GoalManager):
+    def __init__(self):
+        self.goal_calls = 0
+
+    def get_short_term_goal(self, state, inv):
+        self.goal_calls += 1
+        return super().get_short_term_goal(state, inv)
+
+
+class CountingPlanner(ActionPlanner):
+    def __init__(self):
+        super().__init__()
+        self.valid_calls = 0
+        wrapped = self._prereq.get_valid_actions
+
+        def counted(inv):
+            self.valid_calls += 1
+            return wrapped(inv)
+
+        self._prereq.get_valid_actions = counted
+
+
+def direct(state: GameState, goals: GoalManager, planner: ActionPlanner) -> tuple:
+    inv = state.inventory_view
+    if (state.time_of_day or 0.0) > 0.75:
+        goals.get_short_term_goal(state, inv)
+        planner.get_valid_actions(inv)
+    return (
+        planner.get_concrete_actions(inv, state),
+        goals.get_short_term_goal(state, inv),
+        goals.format_for_prompt(state, inv),
+    )
+
+
+def context(state: GameState, goals: GoalManager, planner: ActionPlanner) -> tuple:
+    ctx = DecisionContext(state, state.inventory_view, goals, planner)
+    if (state.time_of_day or 0.0) > 0.75:
+        _ = ctx.short_term_goal, ctx.valid_actions
+    return ctx.concrete_actions, ctx.short_term_goal, ctx.goals_text
+
+
+def measure(fn, state: GameState, iterations: int) -> tuple[int, int, float]:
+    """(goal calls per tick, valid-action calls per tick, microseconds per tick)."""
+    goals, planner = CountingGoalManager(), CountingPlanner()
+    fn(state, goals, planner)
+    counts = goals.goal_calls, planner.valid_calls
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(state, goals, planner)
+    return *counts, (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'fixture':<28} {'path':<8} {'goals':>5} {'valid':>5} {'us/tick':>8}")
+    for path in sorted(FIXTURES.glob("*.json")):
+        state = GameState.model_validate(json.loads(path.read_text()))
+        results = {
+            name: measure(fn, state, args.iterations)
+            for name, fn in (("direct", direct), ("context", context))
+        }
+        for name, (goal_calls, valid_calls, us) in results.items():
+            print(
+                f"{path.stem:<28} {name:<8} {goal_calls:>5} {valid_calls:>5} {us:>8.1f}"
+            )
+        saving = 1 - results["context"][2] / results["direct"][2]
+        print(f"{'':<28} saving {saving:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+bench_delta_export.py — Bytes written and parse cost: full snapshots vs deltas.
+
+Simulates an exporter session where vitals drift slowly, a few entities come
+and go and the log buffers are mostly empty, then replays it through
+StateReader once as full snapshots and once as keyframes + deltas. Deltas
+are applied to the keyframe's parsed GameState, so only what they change is
+validated; the gap grows with --entities.
+
+Usage:
+    uv run python -m benchmarks.bench_delta_export [--ticks 240] [--keyframe-every 12] [--entities 30]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_state_parse import make_snapshot
+from state_delta import encode, make_delta
+from state_handoff import pack, write_atomic
+from state_reader import StateReader
+
+
+def simulate(ticks: int, n_entities: int = 30, seed: int = 0) -> list[dict]:
+    """A session of state documents with realistic, mostly-small changes."""
+    import json
+
+    rng = random.Random(seed)
+    doc = json.loads(make_snapshot(n_entities, seed))
+    docs = []
+    for tick in range(ticks):
+        doc = dict(doc)
+        doc["time_of_day"] = round((tick % 480) / 480, 2)
+        if rng.random() < 0.2:
+            doc["hunger"] = doc["hunger"] - 1
+        entities = list(doc["nearby_entities"])
+        if rng.random() < 0.3 and entities:
+            entities.pop(rng.randrange(len(entities)))
+        if rng.random() < 0.3:
+            entities.append({"name": "rabbit", "type": "other", "distance": 12.0})
+        doc["nearby_entities"] = sorted(entities, key=lambda e: e["distance"])
+        doc["speech_log"] = ["Take that, nature!"] if rng.random() < 0.1 else []
+        doc["action_log"] = []
+        docs.append(doc)
+    return docs
+
+
+def run(docs: list[dict], keyframe_every: int | None) -> tuple[int, float]:
+    """Return (payload bytes written, seconds spent in StateReader.read)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game_state.json"
+        reader = StateReader(path)
+        written = 0
+        spent = 0.0
+        keyframe: tuple[int, dict] | None = None
+        for seq, doc in enumerate(docs, start=1):
+            if keyframe_every is None:
+                payload = encode(doc)
+                write_atomic(path, payload, seq)
+            elif keyframe is None or seq - keyframe[0] >= keyframe_every:
+                payload = encode(doc)
+                keyframe_file = path.with_name("game_state.keyframe.json")
+                keyframe_file.write_bytes(pack(payload, seq, keyframe=True))
+                write_atomic(path, payload, seq, keyframe=True)
+                keyframe = (seq, doc)
+            else:
+                payload = encode(make_delta(keyframe[1], doc))
+                write_atomic(path, payload, seq, base=keyframe[0])
+            written += len(payload)
+
+            start = time.perf_counter()
+            assert reader.read() is not None
+            spent += time.perf_counter() - start
+        return written, spent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=240)
+    parser.add_argument("--keyframe-every", type=int, default=12)
+    parser.add_argument("--entities", type=int, default=30)
+    args = parser.parse_args()
+
+    docs = simulate(args.ticks, args.entities)
+    full_bytes, full_s = run(docs, None)
+    delta_bytes, delta_s = run(docs, args.keyframe_every)
+    n = len(docs)
+    print(f"{'format':>6}  {'bytes/tick':>10}  {'read us/tick':>12}")
+    print(f"{'full':>6}  {full_bytes / n:>10.0f}  {full_s / n * 1e6:>12.1f}")
+    print(f"{'delta':>6}  {delta_bytes / n:>10.0f}  {delta_s / n * 1e6:>12.1f}")
+    print(f"bytes saved: {1 - delta_bytes / full_bytes:.0%}")
+
+
+if __name__ == "__main__":
+    main()
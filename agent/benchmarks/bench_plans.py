@@ -0,0 +1,70 @@
+"""
+bench_plans.py — LLM calls per simulated day with and without multi-step plans.
+
+Replays a simulated day (bench_prompt_prefix.simulate) through DSAIAgent
+with a stand-in that always plans the next offered options, once per
+--plan-steps value. To keep plans from running unrealistically long, a
+fraction of snapshots reports a failed action and a spider occasionally
+wanders into view; both invalidate the current plan. Reports LLM calls,
+steps issued from plans and why plans were dropped.
+
+Usage:
+    uv run python -m benchmarks.bench_plans [--ticks 240] [--fail-rate 0.1] [--threat-rate 0.03]
+"""
+
+import argparse
+import json
+import random
+
+from benchmarks.bench_prompt_prefix import simulate
+from state_recorder import TraceRecord
+from stub_backend import StubBackend, planning_policy
+from tools.replay import replay
+
+_SPIDER = {"name": "spider", "type": "hostile", "distance": 9.0}
+
+
+def perturb(
+    records: list[TraceRecord], fail_rate: float, threat_rate: float, seed: int = 0
+) -> list[TraceRecord]:
+    """*records* with failed actions and brief threats sprinkled in."""
+    rng = random.Random(seed)
+    out = []
+    for rec in records:
+        doc = json.loads(rec.payload)
+        if rng.random() < fail_rate:
+            doc["action_log"] = [
+                {"result": "failed", "action": "pick_up_item", "reason": "blocked"}
+            ]
+        if rng.random() < threat_rate:
+            doc["threats"] = [_SPIDER]
+        out.append(TraceRecord(rec.timestamp, rec.seq, json.dumps(doc).encode("utf-8")))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=240, help="Simulated day length")
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    parser.add_argument("--threat-rate", type=float, default=0.03)
+    parser.add_argument("--steps", type=int, nargs="+", default=[0, 1, 3, 5])
+    args = parser.parse_args()
+
+    records = perturb(simulate(args.ticks), args.fail_rate, args.threat_rate)
+    baseline = None
+    print(f"{'plan steps':>10} {'actions':>8} {'LLM calls':>10} {'saved':>6}  dropped")
+    for steps in args.steps:
+        llm = StubBackend(planning_policy(steps))
+        result = replay(records, llm=llm, max_plan_steps=steps)
+        baseline = baseline or llm.calls
+        saved = 1 - llm.calls / baseline if baseline else 0.0
+        print(
+            f"{steps:>10} {len(result.actions):>8} {llm.calls:>10} {saved:>6.0%}  "
+            + ", ".join(
+                f"{k} {v}" for k, v in result.plan_stats.invalidated.items() if v
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
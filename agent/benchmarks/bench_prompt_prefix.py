@@ -0,0 +1,117 @@
+"""
+bench_prompt_prefix.py — Prompt prefix shared between consecutive decisions, per layout.
+
+Replays a simulated day (or the given trace/fixtures) through DSAIAgent
+once per prompt layout, capturing every prompt sent to the LLM, and reports
+how much of each prompt is identical to the previous one. Ollama keeps the
+KV cache of the last prompt while the model stays loaded and only prefills
+what follows the first differing token, so the shared prefix is the part of
+the prompt that costs nothing.
+
+With --url the captured prompts are also sent to a live Ollama server and
+its prompt_eval_count / prompt_eval_duration are reported per layout.
+
+Usage:
+    uv run python -m benchmarks.bench_prompt_prefix [--ticks 120] [--source PATH]
+                                                    [--url http://localhost:11434 --model qwen3:8b]
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+from pathlib import Path
+
+from ollama_client import OllamaClient
+from prompt import LAYOUTS
+from state_recorder import TraceRecord
+from stub_backend import StubBackend, first_valid_action
+from tools.replay import load_records, replay
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "day1_fresh.json"
+
+
+def simulate(ticks: int, seed: int = 0) -> list[TraceRecord]:
+    """Day-one foraging: hunger ticks down, the clock runs, entities drift."""
+    rng = random.Random(seed)
+    doc = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    records = []
+    for tick in range(ticks):
+        doc = dict(doc)
+        doc["time_of_day"] = round(0.15 + tick * 0.004, 3)
+        doc["hunger"] = doc["hunger"] - 1
+        doc["nearby_entities"] = [
+            {**e, "distance": round(max(1.0, e["distance"] + rng.uniform(-3, 3)), 1)}
+            for e in doc["nearby_entities"]
+        ]
+        payload = json.dumps(doc).encode()
+        records.append(TraceRecord(timestamp=tick * 5.0, seq=None, payload=payload))
+    return records
+
+
+def shared_prefix(a: str, b: str) -> int:
+    return len(os.path.commonprefix([a, b]))
+
+
+def capture(records: list[TraceRecord], layout: str) -> list[str]:
+    """Every prompt the agent builds while replaying *records*."""
+    prompts: list[str] = []
+
+    def policy(prompt: str) -> str:
+        prompts.append(prompt)
+        return first_valid_action(prompt)
+
+    replay(records, llm=StubBackend(policy), prompt_layout=layout)
+    return prompts
+
+
+def prefix_report(prompts: list[str]) -> tuple[float, float]:
+    """(mean prompt chars, mean fraction shared with the previous prompt)."""
+    if len(prompts) < 2:
+        return 0.0, 0.0
+    pairs = list(itertools.pairwise(prompts))
+    chars = sum(len(b) for _, b in pairs) / len(pairs)
+    shared = sum(shared_prefix(a, b) / len(b) for a, b in pairs) / len(pairs)
+    return chars, shared
+
+
+def live(prompts: list[str], url: str, model: str) -> str:
+    """Send *prompts* to Ollama in order and summarise its eval counters."""
+    client = OllamaClient(model=model, url=url, keep_alive="10m")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for prompt in prompts:
+            client.generate(prompt)
+    client.close()
+    return client.metrics.summary()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument(
+        "--source", type=Path, help="Trace file, state JSON or directory"
+    )
+    parser.add_argument("--url", help="Also measure prefill on a live Ollama")
+    parser.add_argument("--model", default="qwen3:8b")
+    parser.add_argument("--calls", type=int, default=20, help="Live calls per layout")
+    args = parser.parse_args()
+
+    records = load_records(args.source) if args.source else simulate(args.ticks)
+
+    print(f"{'layout':>13}  {'prompts':>7}  {'mean chars':>10}  {'shared prefix':>13}")
+    captured = {}
+    for layout in LAYOUTS:
+        prompts = captured[layout] = capture(records, layout)
+        chars, shared = prefix_report(prompts)
+        print(f"{layout:>13}  {len(prompts):>7}  {chars:>10.0f}  {shared:>13.0%}")
+
+    if args.url:
+        for layout, prompts in captured.items():
+            print(f"{layout:>13}  {live(prompts[: args.calls], args.url, args.model)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_speculation.py — Decision latency with and without speculative prefetch.
+
+Runs DSAIAgent in a closed loop against a toy world started from
+fixtures/day1_fresh.json: each emitted action takes effect before the next
+snapshot (the same effect model as speculation.predict_state), except that
+a fraction of actions fail, entities drift a few metres, hunger and the
+clock run down, and now and then a new item shows up. The LLM stand-in
+answers the first valid action after --latency seconds; the action then
+"executes" for --interval seconds, which is the window speculation uses.
+
+Reports mean time per decide(), LLM calls, speculation hit rate and the
+inference time saved.
+
+Usage:
+    uv run python -m benchmarks.bench_speculation [--ticks 60] [--latency 0.05] [--interval 0.08]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from models import GameState
+from speculation import SpeculationStats, predict_state
+from state_handoff import write_atomic
+from stub_backend import StubBackend, first_valid_action
+from tools.replay import wire_agent
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "day1_fresh.json"
+_DROPS = ["twigs", "flint", "rocks", "cutgrass"]
+
+
+def step_world(doc: dict, action: dict | None, rng: random.Random, fail_rate: float):
+    """*doc* one tick later, with *action* applied unless it failed."""
+    predicted = predict_state(GameState.model_validate(doc), action) if action else None
+    if predicted is not None and rng.random() >= fail_rate:
+        doc = predicted.model_dump()
+    else:
+        doc = dict(doc)
+        if action is not None:
+            doc["action_log"] = [
+                {"result": "failed", "action": action["action"], "reason": "blocked"}
+            ]
+    doc["time_of_day"] = round(doc["time_of_day"] + 0.002, 3)
+    doc["hunger"] = doc["hunger"] - 0.5
+    doc["nearby_entities"] = [
+        {**e, "distance": round(max(1.0, e["distance"] + rng.uniform(-3, 3)), 1)}
+        for e in doc["nearby_entities"]
+    ]
+    if rng.random() < 0.1:
+        drop = rng.choice(_DROPS)
+        doc["nearby_entities"].append(
+            {"name": drop, "type": "item", "distance": round(rng.uniform(2, 20), 1)}
+        )
+    return doc
+
+
+def run(
+    args: argparse.Namespace, speculate: bool
+) -> tuple[float, int, SpeculationStats | None]:
+    """(mean seconds per decide, LLM calls, speculation stats or None)."""
+
+    def policy(prompt: str) -> str:
+        time.sleep(args.latency)
+        return first_valid_action(prompt)
+
+    rng = random.Random(0)
+    llm = StubBackend(policy)
+    spec_llm = StubBackend(policy) if speculate else None
+    doc = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    spent = 0.0
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        agent, _ = wire_agent(workdir, llm, speculation_llm=spec_llm)
+        action = None
+        with contextlib.redirect_stdout(io.StringIO()):
+            for seq in range(1, args.ticks + 1):
+                doc = step_world(doc, action, rng, args.fail_rate)
+                write_atomic(workdir / "game_state.json", json.dumps(doc).encode(), seq)
+                start = time.perf_counter()
+                action = agent.decide()
+                spent += time.perf_counter() - start
+                time.sleep(args.interval)  # the action executes in game
+        if agent.speculator is not None:
+            agent.speculator.close()
+    calls = llm.calls + (spec_llm.calls if spec_llm else 0)
+    return spent / args.ticks, calls, agent.speculator and agent.speculator.stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.05, help="LLM seconds")
+    parser.add_argument("--interval", type=float, default=0.08, help="Action seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    base, base_calls, _ = run(args, speculate=False)
+    spec, spec_calls, stats = run(args, speculate=True)
+    print(f"{'':>12} {'ms/decide':>10} {'LLM calls':>10}")
+    print(f"{'baseline':>12} {base * 1e3:>10.1f} {base_calls:>10}")
+    print(f"{'speculative':>12} {spec * 1e3:>10.1f} {spec_calls:>10}")
+    print(f"Speculation: {stats.summary()}")
+    if base:
+        print(f"Decision latency {spec / base - 1:+.0%} vs baseline")
+
+
+if __name__ == "__main__":
+    main()
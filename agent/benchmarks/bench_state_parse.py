@@ -0,0 +1,82 @@
+"""
+bench_state_parse.py — Parse cost of game_state.json per StateReader mode.
+
+Builds synthetic snapshots with 30, 300 and 3000 nearby entities and times
+each ParseMode on the same bytes (file I/O excluded).
+
+Usage:
+    uv run python -m benchmarks.bench_state_parse [--repeat 200]
+"""
+
+import argparse
+import json
+import random
+import timeit
+from pathlib import Path
+
+from state_reader import ParseMode, StateReader
+
+_NAMES = ["evergreen", "sapling", "grass", "flint", "rocks", "berrybush", "rabbit"]
+_TYPES = ["harvestable", "other", "food", "hostile"]
+
+
+def make_snapshot(n_entities: int, seed: int = 0) -> bytes:
+    """Return a realistic state file body with *n_entities* nearby entities."""
+    rng = random.Random(seed)
+    state = {
+        "day": 4,
+        "time_of_day": 0.42,
+        "phase": "day",
+        "season": "autumn",
+        "health": 120,
+        "hunger": 90,
+        "sanity": 180,
+        "temperature": 22,
+        "is_raining": False,
+        "inventory": ["log x6", "twigs x4", "cutgrass x9", "flint x2", "axe"],
+        "equipped": "axe",
+        "current_action": "chop",
+        "action_target": "evergreen",
+        "position": {"x": 101.5, "z": -44.0},
+        "nearby_entities": [
+            {
+                "name": rng.choice(_NAMES),
+                "type": rng.choice(_TYPES),
+                "distance": round(rng.uniform(1, 30), 2),
+            }
+            for _ in range(n_entities)
+        ],
+        "threats": [{"name": "spider", "distance": 14.2}],
+        "speech_log": ["Take that, nature!"],
+        "action_log": [{"result": "success", "action": "CHOP"}],
+        "memory_log": [{"source": "event", "text": "Built: campfire"}],
+    }
+    return json.dumps(state).encode()
+
+
+def bench(n_entities: int, repeat: int) -> dict[str, float]:
+    """Return microseconds per parse for every mode."""
+    data = make_snapshot(n_entities)
+    results: dict[str, float] = {}
+    for mode in ParseMode:
+        reader = StateReader(Path("unused.json"), mode=mode)
+        reader._parse(data)  # warm up
+        seconds = timeit.timeit(lambda r=reader: r._parse(data), number=repeat)
+        results[mode.value] = seconds / repeat * 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    modes = [m.value for m in ParseMode]
+    print(f"{'entities':>8}  " + "  ".join(f"{m + ' (us)':>13}" for m in modes))
+    for n in (30, 300, 3000):
+        row = bench(n, args.repeat)
+        print(f"{n:>8}  " + "  ".join(f"{row[m]:>13.1f}" for m in modes))
+
+
+if __name__ == "__main__":
+    main()
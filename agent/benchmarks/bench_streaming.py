@@ -0,0 +1,62 @@
+"""
+bench_streaming.py — Time-to-decision: blocking generate vs streaming with early stop.
+
+Starts a FakeOllama server (tools/fake_ollama) that "generates" a valid
+action object followed by a rambling explanation, one token every
+--token-ms, and times OllamaClient.generate() in both modes. The server also reports how many
+tokens it actually produced, i.e. how much generation the early stop saved.
+
+Usage:
+    uv run python -m benchmarks.bench_streaming [--calls 5] [--token-ms 20] [--ramble 60]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from ollama_client import OllamaClient
+from tools.fake_ollama import FakeConfig, FakeOllama, LatencyModel
+
+ANSWER = '{"action":"chop_tree","target":"evergreen","reason":"need logs for a fire"}'
+
+
+def bench(stream: bool, calls: int, token_s: float, ramble: int) -> tuple[float, int]:
+    """Return (mean seconds to decision, tokens the server generated)."""
+    config = FakeConfig(
+        latency=LatencyModel(median=0.0),
+        token_ms=token_s * 1000,
+        policy="script",
+        script=[ANSWER],
+        ramble=ramble,
+    )
+    server = FakeOllama(config).start()
+    client = OllamaClient(url=server.url, stream=stream)
+    decisions = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(calls):
+            assert client.generate("prompt")
+            decisions.append(client.last_timing.decision)
+    client.close()
+    time.sleep(token_s * 2)  # let the server notice the last cancellation
+    server.stop()
+    return sum(decisions) / len(decisions), server.stats.generated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--ramble", type=int, default=60)
+    args = parser.parse_args()
+
+    token_s = args.token_ms / 1000
+    print(f"{'mode':>9}  {'decision ms':>11}  {'tokens generated':>16}")
+    for stream in (False, True):
+        mean, generated = bench(stream, args.calls, token_s, args.ramble)
+        mode = "streaming" if stream else "blocking"
+        print(f"{mode:>9}  {mean * 1e3:>11.0f}  {generated:>16}")
+
+
+if __name__ == "__main__":
+    main()
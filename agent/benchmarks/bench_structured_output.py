@@ -0,0 +1,103 @@
+"""
+bench_structured_output.py — Parse-failure and forced-explore rates, free-form vs schema-constrained.
+
+Takes recorded prompts (a conversation_log.jsonl, or prompts captured from a
+simulated day) and reports, per mode, how often ActionParser fell back to
+explore and how often the parsed action would have been rejected by
+DSAIAgent (unknown action or missing target) and replaced by a forced
+explore.
+
+    recorded    the responses stored in the log (what the agent actually got)
+    free-form   the prompts re-sent to Ollama without a schema
+    schema      the prompts re-sent with ParsedAction.output_schema(options)
+
+The last two need --url.
+
+Usage:
+    uv run python -m benchmarks.bench_structured_output [--log state/conversation_log.jsonl]
+                                                        [--url http://localhost:11434 --model qwen3:8b]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+from pathlib import Path
+
+from action_parser import ActionParser
+from benchmarks.bench_prompt_prefix import capture, simulate
+from models import ParsedAction
+from ollama_client import OllamaClient
+from stub_backend import offered_options
+
+
+def rates(prompts: list[str], responses: list[str | None]) -> tuple[float, float]:
+    """(parse-failure rate, forced-explore rate) for *responses* to *prompts*."""
+    parser = ActionParser()
+    rejected = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for prompt, raw in zip(prompts, responses):
+            action = parser.parse(raw)
+            options = offered_options(prompt)
+            offered = [o for o in options if o.action == action["action"]]
+            needs_target = any(o.target is not None for o in offered)
+            if not offered or (needs_target and not action.get("target")):
+                rejected += 1
+    failed = parser.stats.failed + parser.stats.empty
+    n = len(prompts) or 1
+    # A parse fallback is explore, which is always offered: count it once
+    return failed / n, (failed + rejected) / n
+
+
+def generate_all(
+    client: OllamaClient, prompts: list[str], constrained: bool
+) -> list[str | None]:
+    responses = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for prompt in prompts:
+            schema = None
+            if constrained:
+                schema = ParsedAction.output_schema(offered_options(prompt))
+            responses.append(client.generate(prompt, schema=schema))
+    return responses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--log", type=Path, help="conversation_log.jsonl to replay")
+    parser.add_argument("--ticks", type=int, default=40, help="Simulated prompts")
+    parser.add_argument("--url", help="Ollama URL for the free-form/schema runs")
+    parser.add_argument("--model", default="qwen3:8b")
+    parser.add_argument("--limit", type=int, default=50, help="Max prompts sent")
+    args = parser.parse_args()
+    logging.disable(logging.ERROR)  # ActionParser logs every failure with a traceback
+
+    recorded: list[str | None] = []
+    if args.log:
+        entries = [json.loads(line) for line in args.log.open(encoding="utf-8")]
+        entries = [e for e in entries if "[VALID_ACTIONS]" in e["prompt"]]
+        prompts = [e["prompt"] for e in entries]
+        recorded = [e["response"] for e in entries]
+    else:
+        prompts = capture(simulate(args.ticks), "default")
+
+    print(f"{'mode':>9}  {'prompts':>7}  {'parse fail':>10}  {'forced explore':>14}")
+    if recorded:
+        failed, forced = rates(prompts, recorded)
+        print(f"{'recorded':>9}  {len(prompts):>7}  {failed:>10.1%}  {forced:>14.1%}")
+    if not args.url:
+        if not recorded:
+            print("(no --log and no --url: nothing to measure)")
+        return
+
+    prompts = prompts[: args.limit]
+    client = OllamaClient(model=args.model, url=args.url)
+    for mode, constrained in (("free-form", False), ("schema", True)):
+        failed, forced = rates(prompts, generate_all(client, prompts, constrained))
+        print(f"{mode:>9}  {len(prompts):>7}  {failed:>10.1%}  {forced:>14.1%}")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+bench_tail_latency.py — Throughput and tail latency against a fake (or real) Ollama.
+
+Two measurements:
+
+    load   --clients threads send the prompts of a simulated day through
+           OllamaClient.generate() until --requests calls are done; reports
+           req/s, p50/p95/p99/max call latency and failures.
+    agent  the same day replayed through the full DSAIAgent.decide()
+           pipeline with an OllamaClient; reports ticks/s, per-stage times
+           and the client's metrics.
+
+By default an in-process FakeOllama is started with the given latency model
+and failure rates (see tools/fake_ollama); --url points at a running server
+instead. Same seed, same numbers.
+
+Usage:
+    uv run python -m benchmarks.bench_tail_latency --latency lognormal --median 0.2 --sigma 0.8
+    uv run python -m benchmarks.bench_tail_latency --latency heavy-tail --alpha 1.2 --clients 4
+    uv run python -m benchmarks.bench_tail_latency --url http://localhost:11434 --model qwen3:8b
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import threading
+import time
+from itertools import count
+
+from benchmarks.bench_prompt_prefix import capture, simulate
+from ollama_client import OllamaClient
+from tools.fake_ollama import FakeOllama, add_arguments, config_from_args
+from tools.replay import replay
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(samples)}
+
+
+def load(
+    url: str,
+    model: str,
+    prompts: list[str],
+    requests: int,
+    clients: int,
+    timeout: float,
+) -> tuple[float, list[float], int]:
+    """(wall seconds, latencies of successful calls, failed calls)."""
+    tickets = count()
+    latencies: list[float] = []
+    failed = 0
+    lock = threading.Lock()
+
+    def worker() -> None:
+        nonlocal failed
+        client = OllamaClient(
+            model=model, url=url, timeout=timeout, backoff_initial=0.0
+        )
+        while (n := next(tickets)) < requests:
+            start = time.perf_counter()
+            raw = client.generate(prompts[n % len(prompts)])
+            elapsed = time.perf_counter() - start
+            with lock:
+                if raw is None:
+                    failed += 1
+                else:
+                    latencies.append(elapsed)
+        client.close()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        threads = [threading.Thread(target=worker) for _ in range(clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    return time.perf_counter() - start, latencies, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Use a running server instead of a fake one")
+    parser.add_argument("--model", default="fake")
+    parser.add_argument("--ticks", type=int, default=60, help="Simulated day length")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--client-timeout", type=float, default=10.0)
+    parser.add_argument("--skip-agent", action="store_true")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    fake = None
+    url = args.url
+    if url is None:
+        fake = FakeOllama(config_from_args(args)).start()
+        url = fake.url
+
+    records = simulate(args.ticks)
+    prompts = capture(records, "default")
+
+    wall, latencies, failed = load(
+        url, args.model, prompts, args.requests, args.clients, args.client_timeout
+    )
+    p = percentiles(latencies)
+    print(
+        f"[load]  {args.requests} calls, {args.clients} clients: "
+        f"{args.requests / wall:.1f} req/s, {failed} failed"
+    )
+    print(
+        "        latency ms  " + "  ".join(f"{k}={v * 1e3:.0f}" for k, v in p.items())
+    )
+
+    if not args.skip_agent:
+        client = OllamaClient(
+            model=args.model, url=url, timeout=args.client_timeout, backoff_initial=0.0
+        )
+        result = replay(records, llm=client)
+        client.close()
+        print(
+            f"[agent] {result.ticks} ticks, {result.decisions} decisions: "
+            f"{result.ticks_per_sec:.1f} ticks/s"
+        )
+        print(f"        {client.metrics.summary()}")
+        print(result.timer.report())
+
+    if fake is not None:
+        fake.stop()
+        s = fake.stats
+        print(
+            f"[fake]  {s.requests} requests, {s.errors} injected errors, "
+            f"{s.timeouts} injected timeouts, {s.generated} tokens"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+clock.py — Injectable time source so the agent loop can run on virtual time.
+
+Production code uses SYSTEM_CLOCK. Replay (tools/replay.py) passes a
+VirtualClock that jumps to each recorded snapshot's timestamp, so TTLs and
+poll intervals behave as recorded while the loop runs as fast as the CPU
+allows.
+"""
+
+import time
+
+
+class Clock:
+    """Wall clock: thin wrapper over the time module."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when told to; sleep() advances it instantly."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def set(self, now: float) -> None:
+        """Jump to *now* (never backwards)."""
+        self.now = max(self.now, now)
+
+
+SYSTEM_CLOCK = Clock()
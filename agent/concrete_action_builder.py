@@ -8,6 +8,9 @@ Depends on PrereqFilter for prerequisite checking and on entity_sets for
 prefab classification. Has no knowledge of prompts or HTTP clients.
 """
 
+from collections.abc import Mapping
+
+from action_specs import normalize_inv
 from entity_sets import (
     EDIBLE_PREFABS,
     HARVESTABLE_ENTITIES,
@@ -26,9 +29,17 @@ class ConcreteActionBuilder:
     def __init__(self, prereq_filter: PrereqFilter | None = None) -> None:
         self._filter = prereq_filter or PrereqFilter()
 
-    def build(self, inv: dict[str, int], state: GameState) -> list[ActionOption]:
+    def build(
+        self,
+        inv: Mapping[str, int],
+        state: GameState,
+        valid_actions: list[str] | None = None,
+    ) -> list[ActionOption]:
         """Return concrete, specific action options the LLM can pick from.
 
+        *valid_actions* is PrereqFilter.get_valid_actions(inv) if the caller
+        has already computed it.
+
         Order (most specific / high priority first):
           1. Craft actions (ingredient costs shown inline)
           2. Tool-gated actions (chop_tree, mine_rock)
@@ -38,10 +49,10 @@ class ConcreteActionBuilder:
           6. attack_enemy / run_from_enemy for active threats
           7. explore / idle (always last)
         """
-        from action_specs import normalize_inv  # local to avoid circular at module load
-
         inv_norm = normalize_inv(inv)
-        base_valid = set(self._filter.get_valid_actions(inv))
+        if valid_actions is None:
+            valid_actions = self._filter.get_valid_actions(inv_norm)
+        base_valid = set(valid_actions)
         actions: list[ActionOption] = []
 
         # 1. Craft actions — only those whose prereqs are met
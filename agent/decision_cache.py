@@ -0,0 +1,230 @@
+"""
+decision_cache.py — LRU + TTL cache of LLM decisions keyed by game situation.
+
+Many ticks show the model effectively the same situation: same inventory,
+same trees a few metres further away. The situation key (decision_key) is
+deliberately much coarser than state_fingerprint's change-detection key —
+two snapshots with the same semantic key never reach the cache, since
+observe() skips them. It keeps phase and season, vitals in ~10-point
+buckets, inventory counts, what is equipped, the threats by name and the
+offered actions with their targets reduced to base names
+("log (12.3m)" -> "log"); day, clock, temperature and distances are left
+out.
+
+A cached decision is only served if its action + target base name is still
+among the current valid actions; the target is then rewritten to the
+current option ("log (9.8m)"). Entries expire after ``ttl`` seconds of wall
+time, the cache is persisted to JSON so it survives restarts, and
+DSAIAgent clears it on death and world reset.
+"""
+
+import hashlib
+import json
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from action_parser import is_complete_action
+from clock import SYSTEM_CLOCK, Clock
+from models import ActionOption, GameState
+
+_TARGET_DETAIL = re.compile(r"\s*\(.*\)$")
+
+
+def target_base(target: str | None) -> str | None:
+    """'log (12.3m)' -> 'log'; 'boards (logx4)' -> 'boards'."""
+    if target is None:
+        return None
+    return _TARGET_DETAIL.sub("", target).strip()
+
+
+def retarget(action: dict, options: list[ActionOption]) -> dict | None:
+    """*action* pointed at the matching current option, or None if not offered.
+
+    Matches on action name + target base name, so a decision taken for
+    "log (12.3m)" still applies to "log (9.8m)" a few ticks later.
+    """
+    base = target_base(action.get("target"))
+    for opt in options:
+        if opt.action == action["action"] and target_base(opt.target) == base:
+            result = dict(action)
+            if opt.target is not None:
+                result["target"] = opt.target
+            return result
+    return None
+
+
+def reuse_answer(raw: str | None, options: list[ActionOption]) -> dict | None:
+    """An LLM answer generated for another snapshot, retargeted to *options*.
+
+    None if *raw* is not a clean action or its choice is not offered here.
+    """
+    if not raw or not is_complete_action(raw):
+        return None
+    try:
+        action = json.loads(raw)
+    except json.JSONDecodeError:  # only valid after repair; not worth a re-parse
+        return None
+    return retarget(action, options)
+
+
+def decision_key(
+    state: GameState,
+    options: list[ActionOption],
+    vital_quantum: float = 10.0,
+    item_counts: bool = True,
+) -> tuple:
+    """The parts of *state* and *options* a decision actually depends on.
+
+    With *item_counts* False only the inventory's item names count.
+    """
+    inv = state.inventory_view
+    return (
+        state.phase,
+        state.season,
+        math.floor(state.health / vital_quantum),
+        math.floor(state.hunger / vital_quantum),
+        math.floor(state.sanity / vital_quantum),
+        tuple(sorted(inv.items())) if item_counts else tuple(sorted(inv)),
+        state.equipped,
+        tuple(sorted(t.name for t in state.threats)),
+        tuple(sorted({(o.action, target_base(o.target) or "") for o in options})),
+    )
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0  # found but older than ttl (counted as a miss too)
+    guarded: int = 0  # found but no longer a valid action (counted as a miss too)
+    stores: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DecisionCache:
+    def __init__(
+        self,
+        cache_file: Path | None = None,
+        max_entries: int = 512,
+        ttl: float = 300.0,
+        save_every: int = 20,
+        vital_quantum: float = 10.0,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        """
+        Args:
+            cache_file:  JSON file to load from / persist to (None: memory only).
+            max_entries: LRU capacity.
+            ttl:         Seconds a decision stays servable.
+            save_every:  Persist after this many stores (and on close()).
+            vital_quantum: Health/hunger/sanity bucket width in the key.
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.save_every = save_every
+        self.vital_quantum = vital_quantum
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._unsaved = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Public interface
+    # ------------------------------------------------------------------
+
+    def key(self, state: GameState, options: list[ActionOption]) -> str:
+        """Situation key: decision_key hashed to a JSON-safe string."""
+        raw = repr(decision_key(state, options, self.vital_quantum))
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def lookup(self, state: GameState, options: list[ActionOption]) -> dict | None:
+        """Return a cached action re-targeted to *options*, or None."""
+        key = self.key(state, options)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if self.clock.time() - entry["stored_at"] > self.ttl:
+            del self._entries[key]
+            self.stats.expired += 1
+            self.stats.misses += 1
+            return None
+
+        action = retarget(entry["action"], options)
+        if action is None:
+            self.stats.guarded += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return action
+
+    def store(
+        self, state: GameState, options: list[ActionOption], action: dict
+    ) -> None:
+        """Remember *action* as the decision for this situation."""
+        key = self.key(state, options)
+        self._entries[key] = {
+            "action": dict(action),
+            "stored_at": self.clock.time(),
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.stats.stores += 1
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def clear(self) -> None:
+        """Drop every entry (death / world reset) and persist the empty cache."""
+        self._entries.clear()
+        self.stats.invalidations += 1
+        self.save()
+
+    def save(self) -> None:
+        if self.cache_file is None:
+            return
+        self._unsaved = 0
+        try:
+            tmp = self.cache_file.with_name(self.cache_file.name + ".tmp")
+            tmp.write_text(json.dumps(list(self._entries.items())), encoding="utf-8")
+            tmp.replace(self.cache_file)
+        except OSError as e:
+            print(f"[DecisionCache] Warning: Failed to save: {e}")
+
+    def close(self) -> None:
+        if self._unsaved:
+            self.save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            items = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[DecisionCache] Warning: Ignoring unreadable cache: {e}")
+            return
+        now = self.clock.time()
+        for key, entry in items[-self.max_entries :]:
+            if now - entry["stored_at"] <= self.ttl:
+                self._entries[key] = entry
+        print(f"[DecisionCache] Loaded {len(self._entries)} decisions")
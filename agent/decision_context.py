@@ -0,0 +1,67 @@
+"""
+decision_context.py — Everything derived from one snapshot, computed at most once.
+
+Within one decide() several consumers need the same derived values: the
+emergency override looks at the short-term goal and the craftable actions,
+the planner needs the valid base actions again, goal formatting re-derives
+the short-term goal. DecisionContext memoizes each of them for the tick:
+
+    inv               normalized inventory
+    short_term_goal   GoalManager.get_short_term_goal
+    long_term_goal    GoalManager.get_long_term_goal
+    goals_text        the [GOALS] block, from the two goals above
+    valid_actions     base actions whose prerequisites are met
+    concrete_actions  ActionOptions built from valid_actions
+
+Values are computed lazily, so a tick that ends in an override never pays
+for the planner. StateFieldError from the goal rules propagates on access
+(nothing is cached) exactly as from the direct calls.
+"""
+
+from collections.abc import Mapping
+from functools import cached_property
+
+from action_planner import ActionPlanner
+from action_specs import normalize_inv
+from goal_manager import GoalManager, LongTermGoal, ShortTermGoal
+from models import ActionOption, GameState
+
+
+class DecisionContext:
+    """Per-tick memo of goals and actions for *state* and *inv*."""
+
+    def __init__(
+        self,
+        state: GameState,
+        inv: Mapping[str, int],
+        goal_manager: GoalManager,
+        planner: ActionPlanner,
+    ):
+        self.state = state
+        self.inv = normalize_inv(inv)
+        self._goal_manager = goal_manager
+        self._planner = planner
+
+    @cached_property
+    def short_term_goal(self) -> ShortTermGoal | None:
+        return self._goal_manager.get_short_term_goal(self.state, self.inv)
+
+    @cached_property
+    def long_term_goal(self) -> LongTermGoal:
+        return self._goal_manager.get_long_term_goal(self.state)
+
+    @cached_property
+    def goals_text(self) -> str:
+        return self._goal_manager.format_goals(
+            self.long_term_goal, self.short_term_goal
+        )
+
+    @cached_property
+    def valid_actions(self) -> list[str]:
+        return self._planner.get_valid_actions(self.inv)
+
+    @cached_property
+    def concrete_actions(self) -> list[ActionOption]:
+        return self._planner.get_concrete_actions(
+            self.inv, self.state, self.valid_actions
+        )
@@ -11,6 +11,7 @@ It produces:
   - A preferred_actions list to reorder valid_actions (most relevant first)
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -141,7 +142,7 @@ class GoalManager:
         return self._LONG_TERM.get(season, self._LONG_TERM["autumn"])
 
     def get_short_term_goal(
-        self, state: GameState, inv: dict[str, int]
+        self, state: GameState, inv: Mapping[str, int]
     ) -> ShortTermGoal | None:
         """Return the most urgent short-term goal, or None if stable.
 
@@ -218,11 +219,15 @@ class GoalManager:
 
         return None
 
-    def format_for_prompt(self, state: GameState, inv: dict[str, int]) -> str:
+    def format_for_prompt(self, state: GameState, inv: Mapping[str, int]) -> str:
         """Return the formatted [GOALS] block content (no XML tags)."""
-        ltg = self.get_long_term_goal(state)
-        stg = self.get_short_term_goal(state, inv)
+        return self.format_goals(
+            self.get_long_term_goal(state), self.get_short_term_goal(state, inv)
+        )
 
+    @staticmethod
+    def format_goals(ltg: LongTermGoal, stg: ShortTermGoal | None) -> str:
+        """format_for_prompt() for goals the caller already has."""
         lines: list[str] = [
             f"Long-term ({ltg.season.capitalize()}): {ltg.description}",
         ]
@@ -241,7 +246,7 @@ class GoalManager:
         return any(e.name in _FIRE_PREFABS for e in (state.nearby_entities or []))
 
     def _fire_goal(
-        self, state: GameState, inv: dict[str, int], phase: str
+        self, state: GameState, inv: Mapping[str, int], phase: str
     ) -> ShortTermGoal:
         if self._fire_nearby(state):
             return ShortTermGoal(
@@ -0,0 +1,170 @@
+"""
+inference_backend.py — The interface DSAIAgent uses to get a decision from a model.
+
+Adapters:
+    ollama  OllamaClient / AsyncOllamaClient        (/api/generate)
+    openai  OpenAIClient / AsyncOpenAIClient         (/v1/chat/completions:
+            vLLM, llama.cpp server, LM Studio)
+    stub    StubBackend / AsyncStubBackend           (in-process, deterministic)
+
+Every adapter fills the same InferenceMetrics, so latency and token counts
+can be compared across servers. create_backend() is the one place that maps
+a backend name to an adapter; main.py and the debug CLI both use it.
+"""
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from models import ActionOption
+from preemption import CancelToken
+
+
+@dataclass
+class CallTiming:
+    """Wall-clock breakdown of one generate call, in seconds."""
+
+    connect: float = 0.0  # TCP connect (0.0 when a pooled connection was reused)
+    ttfb: float = 0.0  # request start -> response headers received
+    total: float = 0.0  # request start -> body fully read (or stream cancelled)
+    decision: float = 0.0  # request start -> a complete action was available
+    early_stop: bool = False  # stream cancelled once the action was parsed
+
+
+@dataclass
+class InferenceMetrics:
+    """Per-backend totals over the session.
+
+    Token counts come from the server (Ollama eval counters, OpenAI usage,
+    llama.cpp timings) and only for calls that reported them: a stream
+    stopped early usually does not.
+    """
+
+    calls: int = 0  # requests that got a response (latency is over these)
+    failures: int = 0  # unreachable, timed out or HTTP error
+    latency: float = 0.0  # summed CallTiming.total
+    decision: float = 0.0  # summed CallTiming.decision
+    max_latency: float = 0.0
+    usage_calls: int = 0  # calls that reported token counts
+    prompt_tokens: int = 0  # prompt tokens actually prefilled
+    completion_tokens: int = 0
+    prompt_seconds: float = 0.0  # prefill time, when the server reports it
+    completion_seconds: float = 0.0  # decode time, when the server reports it
+
+    def record_call(self, timing: CallTiming) -> None:
+        self.calls += 1
+        self.latency += timing.total
+        self.decision += timing.decision
+        self.max_latency = max(self.max_latency, timing.total)
+
+    def record_usage(
+        self,
+        prompt_tokens: int,
+        completion_tokens: int,
+        prompt_seconds: float = 0.0,
+        completion_seconds: float = 0.0,
+    ) -> None:
+        self.usage_calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.prompt_seconds += prompt_seconds
+        self.completion_seconds += completion_seconds
+
+    def summary(self) -> str:
+        if not self.calls:
+            return f"no completed calls ({self.failures} failed)"
+        text = (
+            f"{self.calls} calls ({self.failures} failed), mean "
+            f"{self.latency / self.calls * 1e3:.0f}ms (decision "
+            f"{self.decision / self.calls * 1e3:.0f}ms, max "
+            f"{self.max_latency * 1e3:.0f}ms)"
+        )
+        if self.usage_calls:
+            n = self.usage_calls
+            text += (
+                f", prefill {self.prompt_tokens / n:.0f} tok/call in "
+                f"{self.prompt_seconds / n * 1e3:.0f}ms, decode "
+                f"{self.completion_tokens / n:.0f} tok/call"
+            )
+        return text
+
+
+class InferenceBackend(Protocol):
+    model: str
+    metrics: InferenceMetrics
+    last_timing: CallTiming | None
+
+    def is_available(self) -> bool: ...
+
+    def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        cancel: CancelToken | None = None,
+        options: list[ActionOption] | None = None,
+    ) -> str | None:
+        """Raw model text for *prompt*, or None on failure.
+
+        *schema* (ParsedAction.output_schema) asks the server to constrain
+        the output to matching JSON where it supports that. Once *cancel* is
+        set the answer is moot: return None as soon as possible. *options*
+        are the actions the prompt offers, for backends that vet answers
+        (InferenceCascade); the others ignore them.
+        """
+        ...
+
+    def close(self) -> None: ...
+
+
+class AsyncInferenceBackend(Protocol):
+    """InferenceBackend for the asyncio runner."""
+
+    model: str
+    metrics: InferenceMetrics
+    last_timing: CallTiming | None
+
+    async def is_available(self) -> bool: ...
+
+    async def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        options: list[ActionOption] | None = None,
+    ) -> str | None: ...
+
+    async def aclose(self) -> None: ...
+
+
+BACKENDS = ("ollama", "openai", "stub")
+DEFAULT_URLS = {
+    "ollama": "http://localhost:11434",
+    "openai": "http://localhost:8080",  # llama.cpp server; vLLM uses :8000
+}
+
+
+def create_backend(
+    name: str,
+    model: str,
+    url: str | None = None,
+    use_async: bool = False,
+    **options,
+) -> InferenceBackend | AsyncInferenceBackend:
+    """Build the adapter for backend *name*.
+
+    *options* are passed to the HTTP adapters (stream, keep_alive,
+    num_predict, stop, ...) and ignored by the stub.
+    """
+    # Imported here: the adapters import CallTiming/InferenceMetrics from this module
+    if name == "stub":
+        from stub_backend import AsyncStubBackend, StubBackend
+
+        return AsyncStubBackend() if use_async else StubBackend()
+    if name == "ollama":
+        from ollama_client import AsyncOllamaClient as async_cls
+        from ollama_client import OllamaClient as sync_cls
+    elif name == "openai":
+        from openai_client import AsyncOpenAIClient as async_cls
+        from openai_client import OpenAIClient as sync_cls
+    else:
+        raise ValueError(f"Unknown backend {name!r} (choose from {BACKENDS})")
+    cls = async_cls if use_async else sync_cls
+    return cls(model=model, url=url or DEFAULT_URLS[name], **options)
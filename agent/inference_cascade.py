@@ -0,0 +1,238 @@
+"""
+inference_cascade.py — Small-model-first inference with escalation.
+
+An InferenceCascade is an InferenceBackend made of tiers, cheapest first
+(e.g. gemma3:1b, then qwen3:8b). Each tick goes to the first tier; its
+answer is accepted unless
+
+    failed       the call returned nothing (error, timeout)
+    unparseable  ActionParser could not get an action out of it
+    invalid      the action is not among the offered options (generate's
+                 *options*), or lacks a target the offered variants need
+                 (what DSAIAgent.complete would reject); not checked when
+                 the caller passes no options
+    low_confidence
+                 the tier's confidence is below min_confidence: a
+                 "confidence" field in the reply if the model reports one,
+                 else the geometric-mean token probability when the client
+                 was built with logprobs=True
+
+in which case the next tier is asked. The last tier's answer is returned
+as is. Metrics are blended: one call is the whole cascade, so mean latency
+is what the agent actually waited; per-tier usage is in metrics.tiers.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+
+from action_parser import ActionParser
+from inference_backend import (
+    AsyncInferenceBackend,
+    CallTiming,
+    InferenceBackend,
+    InferenceMetrics,
+)
+from models import ActionOption
+from preemption import CancelToken
+
+_REPORTED_CONFIDENCE = re.compile(r'"confidence"\s*:\s*"?([0-9]*\.?[0-9]+)')
+ESCALATION_REASONS = ("failed", "unparseable", "invalid", "low_confidence")
+
+
+@dataclass
+class TierStats:
+    model: str
+    calls: int = 0
+    answered: int = 0  # final answer came from this tier
+    latency: float = 0.0  # summed CallTiming.total of this tier's calls
+    escalations: dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(ESCALATION_REASONS, 0)
+    )
+
+
+@dataclass
+class CascadeMetrics(InferenceMetrics):
+    """InferenceMetrics of the cascade as a whole, plus per-tier counts."""
+
+    tiers: list[TierStats] = field(default_factory=list)
+
+    def summary(self) -> str:
+        text = super().summary()
+        for tier in self.tiers:
+            share = tier.answered / self.calls if self.calls else 0.0
+            mean = tier.latency / tier.calls * 1e3 if tier.calls else 0.0
+            escalated = ", ".join(f"{k} {v}" for k, v in tier.escalations.items() if v)
+            text += (
+                f"\n    {tier.model}: answered {tier.answered} ({share:.0%}), "
+                f"{tier.calls} calls, mean {mean:.0f}ms"
+                + (f"; escalated: {escalated}" if escalated else "")
+            )
+        return text
+
+
+def reported_confidence(raw: str) -> float | None:
+    """The "confidence" value in a raw reply, if the model included one."""
+    match = _REPORTED_CONFIDENCE.search(raw)
+    return float(match.group(1)) if match else None
+
+
+class _CascadeBase:
+    """Acceptance rules and bookkeeping shared by the sync and async cascades."""
+
+    def __init__(self, tiers: list, min_confidence: float | None = None):
+        """
+        Args:
+            tiers:          Backends, cheapest first; at least one.
+            min_confidence: Escalate below this confidence (0..1); None
+                            checks validity only.
+        """
+        if not tiers:
+            raise ValueError("InferenceCascade needs at least one tier")
+        self.tiers = tiers
+        self.min_confidence = min_confidence
+        self.model = "+".join(t.model for t in tiers)
+        self.metrics = CascadeMetrics(tiers=[TierStats(t.model) for t in tiers])
+        self.last_timing: CallTiming | None = None
+        self._parser = ActionParser()  # own stats; the agent's are per decision
+
+    def _escalation(
+        self, tier, raw: str | None, options: list[ActionOption] | None
+    ) -> str | None:
+        """Why *raw* from *tier* should go to the next tier, or None to accept it."""
+        if not raw:
+            return "failed"
+        before = self._parser.stats.failed
+        action = self._parser.parse(raw)
+        if self._parser.stats.failed > before:
+            return "unparseable"
+        if options is not None and not _is_offered(action, options):
+            return "invalid"
+        if self.min_confidence is not None:
+            confidence = reported_confidence(raw)
+            if confidence is None:
+                # Not part of the backend protocol: only HTTP clients have it
+                confidence = getattr(tier, "last_confidence", None)
+            if confidence is not None and confidence < self.min_confidence:
+                return "low_confidence"
+        return None
+
+    def _record(self, index: int, tier, started: float) -> tuple[float, float]:
+        """Count a call to tier *index* begun at *started*: (latency, decision time).
+
+        A tier that failed before timing anything (server unreachable) has
+        no last_timing; the call is timed here instead.
+        """
+        stats = self.metrics.tiers[index]
+        stats.calls += 1
+        timing = tier.last_timing
+        if timing is None:
+            elapsed = time.perf_counter() - started
+            decision = elapsed
+        else:
+            elapsed, decision = timing.total, timing.decision
+        stats.latency += elapsed
+        return elapsed, decision
+
+    def _finish(self, index: int, total: float, decision: float) -> None:
+        self.metrics.tiers[index].answered += 1
+        self.last_timing = CallTiming(total=total, decision=decision)
+        self.metrics.record_call(self.last_timing)
+
+    def _escalate(self, index: int, reason: str) -> None:
+        self.metrics.tiers[index].escalations[reason] += 1
+        print(
+            f"[InferenceCascade] {self.tiers[index].model}: {reason}, "
+            f"escalating to {self.tiers[index + 1].model}"
+        )
+
+
+def _is_offered(action: dict, options: list[ActionOption]) -> bool:
+    """True if DSAIAgent.complete would accept *action* for *options*."""
+    options = [o for o in options if o.action == action["action"]]
+    if not options:
+        return False
+    needs_target = any(o.target is not None for o in options)
+    return bool(action.get("target")) or not needs_target
+
+
+class InferenceCascade(_CascadeBase):
+    """InferenceBackend that tries *tiers* in order until one answer is acceptable."""
+
+    def __init__(
+        self, tiers: list[InferenceBackend], min_confidence: float | None = None
+    ):
+        super().__init__(tiers, min_confidence)
+
+    def is_available(self) -> bool:
+        return any(t.is_available() for t in self.tiers)
+
+    def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        cancel: CancelToken | None = None,
+        options: list[ActionOption] | None = None,
+    ) -> str | None:
+        total = 0.0
+        last = len(self.tiers) - 1
+        for index, tier in enumerate(self.tiers):
+            tier.last_timing = None  # not the previous call's, if this one fails
+            started = time.perf_counter()
+            raw = tier.generate(prompt, schema=schema, cancel=cancel, options=options)
+            elapsed, decision = self._record(index, tier, started)
+            if cancel is not None and cancel.cancelled:
+                return None  # no escalation for a moot answer
+            # The last tier's answer is final, whatever it is
+            reason = None if index == last else self._escalation(tier, raw, options)
+            if reason is None:
+                self._finish(index, total + elapsed, total + decision)
+                return raw
+            total += elapsed
+            self._escalate(index, reason)
+        return None  # unreachable: the last tier never escalates
+
+    def close(self) -> None:
+        for tier in self.tiers:
+            tier.close()
+
+
+class AsyncInferenceCascade(_CascadeBase):
+    """InferenceCascade for the asyncio runner."""
+
+    def __init__(
+        self, tiers: list[AsyncInferenceBackend], min_confidence: float | None = None
+    ):
+        super().__init__(tiers, min_confidence)
+
+    async def is_available(self) -> bool:
+        for tier in self.tiers:
+            if await tier.is_available():
+                return True
+        return False
+
+    async def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        options: list[ActionOption] | None = None,
+    ) -> str | None:
+        total = 0.0
+        last = len(self.tiers) - 1
+        for index, tier in enumerate(self.tiers):
+            tier.last_timing = None  # not the previous call's, if this one fails
+            started = time.perf_counter()
+            raw = await tier.generate(prompt, schema=schema, options=options)
+            elapsed, decision = self._record(index, tier, started)
+            # The last tier's answer is final, whatever it is
+            reason = None if index == last else self._escalation(tier, raw, options)
+            if reason is None:
+                self._finish(index, total + elapsed, total + decision)
+                return raw
+            total += elapsed
+            self._escalate(index, reason)
+        return None
+
+    async def aclose(self) -> None:
+        for tier in self.tiers:
+            await tier.aclose()
@@ -0,0 +1,162 @@
+"""
+inference_worker.py — Runs blocking generate() calls off the decision thread.
+
+DSAIAgent.decide() hands the call to an InferenceWorker and waits at most
+its per-tick deadline. The call itself keeps running when the wait times
+out: one worker thread, one job at a time, so a slow model never has two
+requests queued. The finished answer can be collected on a later tick or
+dropped — or cancelled when a newer snapshot makes it moot (preemption.py):
+the call gets a CancelToken, and a streaming client stops reading at once.
+cancel() may come from another thread (a ReflexLoop) while decide() waits.
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass
+
+from inference_backend import InferenceBackend
+from models import ActionOption
+from preemption import CancelToken, PreemptionStats
+
+_CANCEL_POLL = 0.05  # seconds between cancel checks while wait() blocks
+
+
+@dataclass
+class DeadlineStats:
+    met: int = 0  # answered within the tick's budget
+    missed: int = 0  # budget ran out, rule-based fallback emitted
+    late_used: int = 0  # late answer still valid and emitted on a later tick
+    late_dropped: int = 0  # late answer discarded (policy, stale or unparseable)
+
+    @property
+    def miss_rate(self) -> float:
+        total = self.met + self.missed
+        return self.missed / total if total else 0.0
+
+
+class InferenceWorker:
+    """Single background thread running *llm*.generate() one job at a time."""
+
+    def __init__(self, llm: InferenceBackend):
+        self.llm = llm
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()  # guards _job/_token against cancel()
+        self._job: Future | None = None
+        self._token: CancelToken | None = None
+        self.preemption = PreemptionStats()
+        self.last_duration = 0.0  # seconds the last finished job ran
+        self.last_cancel: str | None = None  # why the last waited-on job was cancelled
+
+    @property
+    def pending(self) -> bool:
+        """A submitted job has not been collected or dropped yet."""
+        return self._job is not None
+
+    def submit(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        options: list[ActionOption] | None = None,
+    ) -> None:
+        with self._lock:
+            if self._job is not None:
+                raise RuntimeError("InferenceWorker already has a job in flight")
+            self._token = CancelToken()
+            self._job = self._executor.submit(
+                self._run, prompt, schema, options, self._token
+            )
+
+    def wait(self, timeout: float | None) -> tuple[bool, str | None]:
+        """(finished, raw) after waiting up to *timeout* seconds (None: no limit).
+
+        A finished job is consumed; an unfinished one stays pending. A job
+        cancelled while waited on returns at once with raw None and its
+        reason in last_cancel; the call itself finishes unobserved, as after
+        drop().
+        """
+        with self._lock:
+            job, token = self._job, self._token
+        if job is None:
+            return False, None
+        end = None if timeout is None else time.monotonic() + max(timeout, 0.0)
+        raw = None
+        while not token.cancelled:
+            left = _CANCEL_POLL if end is None else end - time.monotonic()
+            try:
+                raw = job.result(timeout=max(min(left, _CANCEL_POLL), 0.0))
+                break
+            except CancelledError:
+                break  # cancelled before it started
+            except TimeoutError:
+                if end is not None and time.monotonic() >= end:
+                    if token.cancelled:
+                        break
+                    return False, None
+        with self._lock:
+            if self._job is job:
+                self._job = self._token = None
+        self.last_cancel = token.reason if token.cancelled else None
+        return True, None if token.cancelled else raw
+
+    def adopt(self, other: "InferenceWorker") -> None:
+        """Take over *other*'s pending job, to be waited on, dropped or
+        cancelled here. The call keeps running on *other*'s thread.
+        """
+        with self._lock:
+            if self._job is not None:
+                raise RuntimeError("InferenceWorker already has a job in flight")
+            with other._lock:
+                self._job, self._token = other._job, other._token
+                other._job = other._token = None
+
+    def drop(self) -> None:
+        """Forget the current job; a still-running call finishes unobserved.
+
+        The worker stays busy until it does, so the next submit() queues
+        behind it rather than loading the server with a second request.
+        """
+        with self._lock:
+            self._job = self._token = None
+
+    def cancel(self, reason: str) -> None:
+        """Cancel the current job and forget it.
+
+        A job still queued behind a dropped one never starts; a running one
+        sees its token and returns as soon as the client checks it.
+        """
+        with self._lock:
+            if self._job is None:
+                return
+            job, token = self._job, self._token
+            self._job = self._token = None
+        token.cancel(reason)
+        if job.cancel():  # never started: nothing wasted
+            at = token.cancelled_at
+            self.preemption.record(reason, at, at, at)
+        print(f"[InferenceWorker] Cancelled pending call ({reason})")
+
+    def close(self) -> None:
+        self._job = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(
+        self,
+        prompt: str,
+        schema: dict | None,
+        options: list[ActionOption] | None,
+        token: CancelToken,
+    ) -> str | None:
+        started = time.perf_counter()
+        try:
+            return self.llm.generate(
+                prompt, schema=schema, cancel=token, options=options
+            )
+        finally:
+            self.last_duration = time.perf_counter() - started
+            if token.cancelled:
+                self.preemption.record(
+                    token.reason, started, token.cancelled_at, time.perf_counter()
+                )
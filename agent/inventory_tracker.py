@@ -1,24 +1,24 @@
 """
 inventory_tracker.py — Tracks inventory state and emits deltas between ticks.
 
-Parse inventory strings, diff against previous tick,
+Reuse the snapshot's parsed InventoryView, diff against previous tick,
 and log changes to AgentMemory.
 """
 
 from memory import AgentMemory
-from models import GameState
+from models import GameState, InventoryView
 
 
 class InventoryTracker:
     def __init__(self, memory: AgentMemory):
         self.memory = memory
-        self._prev: dict[str, int] | None = None  # None = no tick seen yet
+        self._prev: InventoryView | None = None  # None = no tick seen yet
 
     def reset(self) -> None:
         """Clear stored inventory (e.g. on world reset)."""
         self._prev = None
 
-    def update(self, state: GameState) -> dict[str, int]:
+    def update(self, state: GameState) -> InventoryView:
         """Parse inventory from state, log any deltas, return current counts."""
         current = self._parse(state)
         if self._prev is not None:  # skip delta on very first tick
@@ -27,26 +27,19 @@ class InventoryTracker:
         return current
 
     @property
-    def current(self) -> dict[str, int]:
-        return self._prev if self._prev is not None else {}
+    def current(self) -> InventoryView:
+        return self._prev if self._prev is not None else InventoryView()
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _parse(state: GameState) -> dict[str, int]:
-        """Convert ["log x20", "axe"] -> {"log": 20, "axe": 1}."""
-        result: dict[str, int] = {}
-        for item in state.inventory:
-            if " x" in item:
-                name, _, count = item.rpartition(" x")
-                result[name.strip()] = int(count)
-            else:
-                result[item.strip()] = 1
-        return result
+    def _parse(state: GameState) -> InventoryView:
+        """Convert ["log x20", "axe"] -> {"log": 20, "axe": 1} (cached on state)."""
+        return state.inventory_view
 
-    def _log_delta(self, current: dict[str, int]) -> None:
+    def _log_delta(self, current: InventoryView) -> None:
         if self._prev is None:
             return  # Type guard: cannot compute delta without previous state
 
@@ -0,0 +1,48 @@
+"""
+json_scanner.py — Incremental scanner that finds complete top-level JSON objects.
+
+Fed arbitrary chunks of LLM output (a streamed response arrives a few
+characters at a time), it tracks brace depth and string/escape state across
+chunk boundaries and returns each ``{...}`` the moment its closing brace
+arrives. Text outside objects (preamble, markdown fences, rambling after
+the answer) is skipped. It does not validate JSON — callers json.loads()
+the returned text.
+"""
+
+
+class JsonObjectScanner:
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current: list[str] = []  # chunks of the object being scanned
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consume *chunk*; return the objects it completed (usually none)."""
+        completed = []
+        start = 0 if self._depth else -1
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._depth:
+                    self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    start = i
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._current.append(chunk[start : i + 1])
+                    completed.append("".join(self._current))
+                    self._current = []
+                    start = -1
+        if self._depth and start >= 0:
+            self._current.append(chunk[start:])
+        return completed
@@ -6,34 +6,62 @@ All I/O, HTTP, parsing, and memory concerns are delegated to injected collaborat
 (see main.py for wiring). This class only contains the decision loop.
 """
 
+import json
 import random
 import time
+from collections.abc import Mapping
+from dataclasses import dataclass
 
 from action_parser import ActionParser
 from action_writer import ActionWriter
+from clock import SYSTEM_CLOCK, Clock
 from conversation_log import ConversationLog
-from goal_manager import GoalManager, StateFieldError, _require_field, Urgency
+from decision_cache import DecisionCache, reuse_answer
+from decision_context import DecisionContext
+from goal_manager import GoalManager, ShortTermGoal, StateFieldError, Urgency
 from action_planner import (
     ActionPlanner as GoalPlanner,
 )  # TODO GoalPlanner alias kept for attribute names
 from inventory_tracker import InventoryTracker
 from memory import AgentMemory
-from models import ActionOption, GameState
-from ollama_client import OllamaClient
-from prompt import build_prompt
+from plan_executor import PlanExecutor
+from preemption import PreemptionPolicy
+from models import ActionOption, GameState, ParsedAction
+from inference_backend import InferenceBackend
+from inference_worker import DeadlineStats, InferenceWorker
+from prompt import build_prompt, last_report
+from reflexes import ActionArbiter, reflex_action
+from speculation import Speculator, predict_state
+from stage_timer import StageTimer
 from state_reader import StateReader
+from state_recorder import StateRecorder
+from tick_scheduler import TickScheduler
 from world_tracker import WorldTracker
 
 # Available exploration directions for fallback actions
 _EXPLORE_DIRECTIONS = ["N", "S", "E", "W", "NE", "NW", "SE", "SW"]
 
+# What to do with an LLM answer that arrives after its tick's deadline
+LATE_POLICIES = ("next-tick", "discard")
+
+
+@dataclass
+class Observation:
+    """One snapshot worked up to the point where the LLM is needed."""
+
+    state: GameState
+    inv: Mapping[str, int]
+    options: list[ActionOption]  # valid actions, goal-preferred first
+    goals: str
+    read_at: float  # clock.time() when the snapshot was read
+
 
 class DSAIAgent:
     def __init__(
         self,
         state_reader: StateReader,
         memory: AgentMemory,
-        llm_client: OllamaClient,
+        llm_client: InferenceBackend,
         action_parser: ActionParser,
         action_writer: ActionWriter,
         inventory_tracker: InventoryTracker,
@@ -41,7 +69,49 @@ class DSAIAgent:
         world_tracker: WorldTracker,
         goal_planner: GoalPlanner,
         goal_manager: GoalManager,
+        state_recorder: StateRecorder | None = None,
+        clock: Clock = SYSTEM_CLOCK,
+        decision_cache: DecisionCache | None = None,
+        prompt_layout: str = "default",
+        structured_output: bool = False,
+        deadline: float | None = None,
+        late_policy: str = "next-tick",
+        prompt_budget: int | None = None,
+        max_plan_steps: int = 0,
+        arbiter: ActionArbiter | None = None,
+        preemption: PreemptionPolicy | None = None,
+        speculation_client: InferenceBackend | None = None,
     ):
+        """
+        Args:
+            deadline: Seconds decide() waits for the LLM before emitting the
+                top-ranked valid action instead (None waits as long as the
+                client does). The call keeps running in the background.
+            late_policy: "next-tick" lets an answer that missed its deadline
+                be emitted on the following tick if it is still a valid
+                action there; "discard" drops it.
+            prompt_budget: Token budget for the prompt (context window
+                minus reply); low-priority sections are shrunk to fit.
+            max_plan_steps: Follow-up steps the model may plan per reply,
+                issued on later ticks without an LLM call (0 = off).
+            arbiter: Shares action_writer with a ReflexLoop; actions decided
+                on a snapshot read before the last reflex are dropped.
+            preemption: Which state changes cancel an LLM call still in
+                flight for an earlier snapshot (None = never cancel). The
+                sync loop only has a call in flight across snapshots with a
+                deadline; with an arbiter, a reflex also cancels the call
+                decide() is waiting on. Only streaming clients stop the
+                generation; a plain request's answer is just discarded.
+            speculation_client: A second client (its own connection, timing
+                and metrics) for speculative calls: after each decision the
+                next state is predicted and its LLM call started right away;
+                the answer is used if the real next state matches the
+                prediction (see speculation.py). None = no speculation.
+        """
+        if late_policy not in LATE_POLICIES:
+            raise ValueError(
+                f"Unknown late_policy {late_policy!r} (choose from {LATE_POLICIES})"
+            )
         self.state_reader = state_reader
         self.memory = memory
         self.llm_client = llm_client
@@ -52,7 +122,37 @@ class DSAIAgent:
         self.world_tracker = world_tracker
         self.goal_planner = goal_planner
         self.goal_manager = goal_manager
+        self.state_recorder = state_recorder
+        self.clock = clock
+        self.decision_cache = decision_cache
+        self.prompt_layout = prompt_layout  # key of prompt.LAYOUTS
+        self.structured_output = structured_output  # send a JSON schema per tick
+        self.prompt_budget = prompt_budget
+        self.plan = PlanExecutor(max_plan_steps)
+        self.arbiter = arbiter
+        self._read_at = float("-inf")  # clock.time() of the snapshot being decided
+        self.deadline = deadline
+        self.late_policy = late_policy
+        self.deadline_stats = DeadlineStats()
+        # Calls run on a worker when they can outlive a tick or be cancelled
+        cancellable = preemption is not None and arbiter is not None
+        self._worker = (
+            InferenceWorker(llm_client) if deadline is not None or cancellable else None
+        )
+        self._worker_state: GameState | None = None  # snapshot of the worker's job
+        self.preemption = preemption
+        if cancellable:
+            arbiter.on_reflex = self._reflex_fired
+        self.speculator = (
+            Speculator(speculation_client) if speculation_client is not None else None
+        )
+        self.timer = StageTimer()  # per-stage wall time of decide()
+        self.last_state: GameState | None = None  # most recent snapshot read
+        self.state_changed = False  # last observe() saw a decision-relevant change
+        self.idle_polls = 0  # observe() calls skipped because nothing changed
+        self._idle_run: int | None = None  # skips since the state last changed
         self.decision_count = 0
+        self.rejected_count = 0  # LLM picks replaced by a forced explore
         self._last_action: str | None = None
         self._last_action_changed: bool | None = (
             None  # did state change after last action?
@@ -80,24 +180,104 @@ class DSAIAgent:
 
     def decide(self) -> dict | None:
         """Read game state, apply emergency overrides, call LLM, write action."""
+        obs = self.observe()
+        if not isinstance(obs, Observation):
+            if obs is not None and self.speculator is not None:
+                self.speculator.cancel("override")
+            return obs
+        step = self.plan_step(obs)
+        if step is not None:
+            return step
+        action = self._decide_with_llm(obs)
+        if action is not None and self.speculator is not None:
+            self._speculate(obs, action)
+        return action
+
+    def _decide_with_llm(self, obs: Observation) -> dict | None:
+        """The decision for *obs*: speculative, cached, on the worker or blocking.
+
+        None if a reflex cancelled the call (the reflex has already acted).
+        """
+        if self.speculator is not None:
+            hit = self.speculator.take(
+                obs.state, obs.options, obs.goals, timeout=self.deadline
+            )
+            self.timer.lap("speculation")
+            if hit is not None:
+                prompt, action = hit
+                print(f"[Agent] Speculative answer matches: {action['action']}")
+                return self.complete(obs, prompt, json.dumps(action), store=False)
+            if self.speculator.pending and not self._worker.pending:
+                # Right prompt, slow model: keep it as the late call, don't restart it
+                self._worker.adopt(self.speculator.worker)
+                self._worker_state = obs.state
+                return self._deadline_fallback(obs, "speculative call still running")
+            self.speculator.cancel("late")
+        prompt = self.prompt_for(obs)
+        raw = self.cached_response(obs)
+        if raw is not None:
+            return self.complete(obs, prompt, raw, store=False)
+        if self._worker is not None:
+            return self._decide_on_worker(obs, prompt)
+        raw = self.llm_client.generate(
+            prompt, schema=self.output_schema(obs), options=obs.options
+        )
+        self.timer.lap("llm")
+        return self.complete(obs, prompt, raw)
+
+    def observe(self) -> Observation | dict | None:
+        """Everything before the LLM call: read, track, override, plan, goals.
+
+        Returns the emitted action when no LLM call is needed (override,
+        unreadable state, death), None when there is nothing to decide, or an
+        Observation to hand to prompt_for() / complete().
+        """
+        self.timer.start()
+        self.state_changed = False
+        # Fast path: file untouched since the last parse (game paused / exporter idle)
+        if not self.state_reader.is_modified():
+            self.timer.lap("read")
+            return self._skip_unchanged()
+
         state = self.state_reader.read()
+        read_at = self._read_at = self.clock.time()
+        self.timer.lap("read")
+        self.last_state = state
         if not state:
             print("[Agent] Cannot read game state, exploring...")
             return self._emit(self._random_explore_action("No game state available"))
 
-        if not self.state_reader.has_changed(state):
-            print("[Agent] State unchanged, skipping decision")
-            if self._last_action:
-                self._last_action_changed = False
-            return None
+        # A call still running for an earlier snapshot may no longer apply
+        if self._worker is not None and self._worker.pending:
+            reason = self.preemption_reason(self._worker_state, state)
+            if reason is not None:
+                self._worker.cancel(reason)
+
+        # Trace every snapshot read, even ones that won't change the decision
+        if self.state_recorder and self.state_reader.last_payload is not None:
+            self.state_recorder.record(
+                self.state_reader.last_payload, self.state_reader.last_seq
+            )
+            self.timer.lap("record")
+
+        changed = self.state_reader.has_changed(state)
+        self.timer.lap("fingerprint")
+        if not changed:
+            return self._skip_unchanged()
+        if self._idle_run is not None:
+            print(f"[Agent] State changed after {self._idle_run} skipped polls")
+            self._idle_run = None
 
         self._last_action_changed = True if self._last_action else None
+        self.state_changed = True
 
         if self.state_reader.is_game_over(state):
             self.memory.clear()
             self.memory.add("You died. Cleared stale memory.", "system")
             self.inventory_tracker.reset()
             self.world_tracker.reset()
+            if self.decision_cache is not None:
+                self.decision_cache.clear()
             return self._emit(
                 self._random_explore_action("Game over — waiting for new world")
             )
@@ -111,19 +291,26 @@ class DSAIAgent:
             self.memory.add("World reset! Starting fresh.", "system")
             self.inventory_tracker.reset()
             self.world_tracker.reset()
+            if self.decision_cache is not None:
+                self.decision_cache.clear()
+            self.plan.cancel("override")
 
         # Track what changed in inventory and world since last tick
         self.inventory_tracker.update(state)
         self.world_tracker.update(state)
+        self.timer.lap("trackers")
 
-        # Inventory snapshot used by override + planner
+        # Parsed-once inventory view shared by override, planner, goals, prompt
         inv = self.inventory_tracker.current
+        # Goals and valid actions, each computed at most once this tick
+        ctx = DecisionContext(state, inv, self.goal_manager, self.goal_planner)
 
         # Emergency fast-path overrides (no LLM call needed)
         # Also validates required state fields via GoalManager — raises StateFieldError
         # if the Lua exporter is broken, which is caught below.
         try:
-            override = self._emergency_override(state, inv)
+            override = self._emergency_override(ctx)
+            self.timer.lap("override")
         except StateFieldError as exc:
             print(f"\n{'!' * 60}")
             print(str(exc))
@@ -136,12 +323,14 @@ class DSAIAgent:
         # Compute concrete, specific actions from inventory + live state
         # Returns list of ActionOption objects with action/target/reason fields.
         # PrereqFilter already excludes blocked and redundant actions.
-        concrete_actions = self.goal_planner.get_concrete_actions(inv, state)
+        concrete_actions = ctx.concrete_actions
+        self.timer.lap("planner")
 
         # Derive goals; preferred_actions bubble relevant variants to the top
         try:
-            stg = self.goal_manager.get_short_term_goal(state, inv)
-            goals = self.goal_manager.format_for_prompt(state, inv)
+            stg = ctx.short_term_goal
+            goals = ctx.goals_text
+            self.timer.lap("goals")
         except StateFieldError as exc:
             print(f"\n{'!' * 60}")
             print(str(exc))
@@ -149,36 +338,103 @@ class DSAIAgent:
             print(f"{'!' * 60}\n")
             return self._emit(self._random_explore_action("STATE BROKEN — PAUSE GAME"))
 
-        # Bubble preferred actions to the top of the concrete list
-        if stg and stg.preferred_actions:
-            # A preferred prefix matches if the action name matches
-            def _is_preferred(opt: ActionOption) -> bool:
-                return any(opt.action == p.split(":")[0] for p in stg.preferred_actions)
+        ordered = self._rank_options(concrete_actions, stg)
+        return Observation(
+            state=state, inv=inv, options=ordered, goals=goals, read_at=read_at
+        )
 
-            preferred = [a for a in concrete_actions if _is_preferred(a)]
-            rest = [a for a in concrete_actions if not _is_preferred(a)]
-            ordered: list[ActionOption] = preferred + rest
-        else:
-            ordered: list[ActionOption] = concrete_actions
+    def _reflex_fired(self, action: dict) -> None:
+        """ActionArbiter.on_reflex: the pending answer would be dropped anyway."""
+        if self._worker.pending:
+            self._worker.cancel("reflex")
+
+    def preemption_reason(self, decided_on: GameState, state: GameState) -> str | None:
+        """Why *state* invalidates a decision in flight for *decided_on*, or None."""
+        if self.preemption is None:
+            return None
+        return self.preemption.reason(decided_on, state)
+
+    def prompt_for(self, obs: Observation) -> str:
+        """Build the LLM prompt for *obs*.
+
+        Memory and last-action feedback are taken at call time, so an
+        Observation prepared while a previous inference was in flight still
+        sees that decision.
+        """
+        prompt = self._build_prompt(obs)
+        self.timer.lap("prompt")
+        report = last_report(self.prompt_layout)
+        if report is not None and report.shrunk():
+            trimmed = ", ".join(
+                f"{s.name} {s.full_tokens}->{s.tokens}" for s in report.shrunk()
+            )
+            print(
+                f"[Agent] Prompt {report.full_total}->{report.total} tokens "
+                f"(budget {report.budget}): {trimmed}"
+                + (" — STILL OVER BUDGET" if report.over_budget else "")
+            )
+        return prompt
 
-        # Normal path: ask the LLM
-        prompt = build_prompt(
-            state,
+    def _build_prompt(self, obs: Observation) -> str:
+        """The prompt for *obs*, without timing or budget reporting."""
+        return build_prompt(
+            obs.state,
             self.memory.recent(),
-            inv,
+            obs.inv,
             last_action=self._last_action,
             last_action_changed=self._last_action_changed,
-            world_history=self.world_tracker.summary_lines(state),
-            valid_actions=ordered,
-            goals=goals,
+            world_history=self.world_tracker.summary_lines(obs.state),
+            valid_actions=obs.options,
+            goals=obs.goals,
+            layout=self.prompt_layout,
+            max_tokens=self.prompt_budget,
+            plan_steps=self.plan.max_steps,
         )
-        raw = self.llm_client.generate(prompt)
+
+    def output_schema(self, obs: Observation) -> dict | None:
+        """JSON schema restricting the reply to *obs*'s options, if enabled."""
+        if not self.structured_output:
+            return None
+        return ParsedAction.output_schema(obs.options, self.plan.max_steps)
+
+    def plan_step(self, obs: Observation) -> dict | None:
+        """Emit the next step of the current plan for *obs*, if it still applies."""
+        action = self.plan.next_step(obs.state, obs.options)
+        self.timer.lap("plan")
+        if action is None:
+            return None
+        print(f"[Agent] {action['reason'].partition(':')[0]}: {action['action']}")
+        self.memory.add(action["reason"], "system")
+        self.decision_count += 1
+        return self._emit(action, keep_plan=True)
+
+    def cached_response(self, obs: Observation) -> str | None:
+        """A cached decision for *obs* as raw LLM-style JSON, or None."""
+        if self.decision_cache is None:
+            return None
+        action = self.decision_cache.lookup(obs.state, obs.options)
+        self.timer.lap("cache")
+        if action is None:
+            return None
+        print(f"[Agent] Cache hit: {action['action']} {action.get('target') or ''}")
+        return json.dumps(action)
+
+    def complete(
+        self, obs: Observation, prompt: str, raw: str | None, store: bool = True
+    ) -> dict:
+        """Parse and validate the LLM output for *obs*, log it and emit the action.
+
+        Valid LLM decisions are stored in the decision cache unless *store*
+        is False (answers from the cache itself, or late answers that were
+        generated for an earlier state).
+        """
         action = self.action_parser.parse(raw)
+        rejected = False
 
         # Validate: check if the LLM's action+target exists in our offered list
         # Build lookup: action name -> list of ActionOption objects
         actions_by_name: dict[str, list[ActionOption]] = {}
-        for opt in ordered:
+        for opt in obs.options:
             actions_by_name.setdefault(opt.action, []).append(opt)
 
         chosen_action = action["action"]
@@ -193,6 +449,7 @@ class DSAIAgent:
                 f"Rejected '{chosen_action}' (not in valid actions), forced explore",
                 "system",
             )
+            rejected = True
             action = self._random_explore_action(
                 f"'{chosen_action}' not a valid action"
             )
@@ -209,63 +466,194 @@ class DSAIAgent:
                     f"Rejected '{chosen_action}' (missing target), forced explore",
                     "system",
                 )
+                rejected = True
                 action = self._random_explore_action(
                     f"'{chosen_action}' must include a specific target"
                 )
 
+        self.timer.lap("parse")
+        if rejected:
+            self.rejected_count += 1
+        if self.decision_cache is not None and raw and store and not rejected:
+            self.decision_cache.store(obs.state, obs.options, action)
+        # A rejected reply's plan is not trusted either
+        self.plan.start(None if rejected else raw, action)
         self.conversation_log.record(prompt, raw or "", action)
 
         self.memory.add(action["reason"], "llm_reason")
 
         self.decision_count += 1
-        return self._emit(action)
+        self.timer.lap("log")
+        return self._emit(action, keep_plan=True)
 
-    def run(self, interval: float = 5.0) -> None:
-        """Poll decide() every interval seconds until interrupted."""
-        print(
-            f"[DSAIAgent] Starting — model={self.llm_client.model}, interval={interval}s"
-        )
+    def run(
+        self, interval: float = 5.0, scheduler: TickScheduler | None = None
+    ) -> None:
+        """Run decide() until interrupted.
+
+        Without a scheduler, polls every *interval* seconds. With one, each
+        tick waits for scheduler.wait() (state-file change or adaptive
+        timeout) and reports back whether anything was decided.
+        """
+        pacing = "event-driven" if scheduler else f"interval={interval}s"
+        print(f"[DSAIAgent] Starting — model={self.llm_client.model}, {pacing}")
         print("[DSAIAgent] Press Ctrl+C to stop\n")
         try:
             while True:
-                self.decide()
-                time.sleep(interval)
+                if scheduler:
+                    scheduler.wait()
+                    action = self.decide()
+                    scheduler.feedback(
+                        self.last_state,
+                        decided=action is not None,
+                        changed=self.state_changed,
+                    )
+                else:
+                    self.decide()
+                    self.clock.sleep(interval)
         except KeyboardInterrupt:
+            if scheduler:
+                scheduler.close()
+            if self.decision_cache is not None:
+                self.decision_cache.close()
+                cs = self.decision_cache.stats
+                print(
+                    f"[DSAIAgent] Decision cache: {cs.hits} hits / "
+                    f"{cs.hits + cs.misses} lookups ({cs.hit_rate:.0%}), "
+                    f"{cs.guarded} guarded, {cs.expired} expired"
+                )
+            print(f"[DSAIAgent] Inference: {self.llm_client.metrics.summary()}")
+            if self.plan.max_steps:
+                pls = self.plan.stats
+                dropped = ", ".join(f"{k} {v}" for k, v in pls.invalidated.items() if v)
+                print(
+                    f"[DSAIAgent] Plans: {pls.plans} plans, {pls.steps} steps without "
+                    f"an LLM call, {pls.completed} completed"
+                    + (f"; dropped: {dropped}" if dropped else "")
+                )
+            if self.arbiter is not None:
+                ars = self.arbiter.stats
+                fired = ", ".join(f"{k} {v}" for k, v in ars.reflexes.items())
+                print(
+                    f"[DSAIAgent] Reflexes: {sum(ars.reflexes.values())} written"
+                    + (f" ({fired})" if fired else "")
+                    + f"; {ars.deliberations} decisions written, "
+                    f"{ars.superseded} superseded by a reflex"
+                )
+            if self.speculator is not None:
+                self.speculator.close()
+                print(f"[DSAIAgent] Speculation: {self.speculator.stats.summary()}")
+                print(
+                    "[DSAIAgent] Speculative inference: "
+                    f"{self.speculator.llm.metrics.summary()}"
+                )
+            if self._worker is not None:
+                self._worker.close()
+                ds = self.deadline_stats
+                if self.deadline is not None:
+                    print(
+                        f"[DSAIAgent] Deadline {self.deadline:.2f}s: {ds.met} met, "
+                        f"{ds.missed} missed ({ds.miss_rate:.0%}); late answers "
+                        f"{ds.late_used} used, {ds.late_dropped} dropped"
+                    )
+                if self._worker.preemption.total:
+                    print(
+                        f"[DSAIAgent] Preemption: {self._worker.preemption.summary()}"
+                    )
+            ps = self.action_parser.stats
+            print(
+                f"[DSAIAgent] Parse: {ps.clean} clean, {ps.repaired} repaired, "
+                f"{ps.extracted} extracted, {ps.failed} failed, {ps.empty} empty; "
+                f"{self.rejected_count} rejected"
+            )
+            stats = self.state_reader.stats
             print(f"\n[DSAIAgent] Stopped after {self.decision_count} decisions.")
+            print(
+                f"[DSAIAgent] State reads: {stats.parsed} parsed, "
+                f"{stats.skipped} skipped, {stats.failed} failed; "
+                f"{self.idle_polls} polls with nothing new"
+            )
+            if self.state_recorder:
+                self.state_recorder.close()
+                rec = self.state_recorder.stats
+                print(
+                    f"[DSAIAgent] Trace: {rec.recorded} snapshots in {rec.chunks} "
+                    f"chunks ({rec.bytes_out} bytes), {rec.dropped} dropped → "
+                    f"{self.state_recorder.trace_file}"
+                )
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
-    def _emergency_override(self, state: GameState, inv: dict[str, int]) -> dict | None:
+    def _skip_unchanged(self) -> None:
+        """Count a poll with nothing new; log only the first of a run."""
+        self.idle_polls += 1
+        if self._idle_run is None:
+            print("[Agent] State unchanged, skipping decisions until it changes")
+            self._idle_run = 0
+        self._idle_run += 1
+        if self._last_action:
+            self._last_action_changed = False
+
+    @staticmethod
+    def _rank_options(
+        concrete_actions: list[ActionOption], stg: ShortTermGoal | None
+    ) -> list[ActionOption]:
+        """Bubble the short-term goal's preferred actions to the top."""
+        if not stg or not stg.preferred_actions:
+            return concrete_actions
+
+        # A preferred prefix matches if the action name matches
+        def _is_preferred(opt: ActionOption) -> bool:
+            return any(opt.action == p.split(":")[0] for p in stg.preferred_actions)
+
+        preferred = [a for a in concrete_actions if _is_preferred(a)]
+        rest = [a for a in concrete_actions if not _is_preferred(a)]
+        return preferred + rest
+
+    def _speculate(self, obs: Observation, action: dict) -> None:
+        """Start the LLM call for the state *action* is expected to lead to."""
+        if self.plan.active:
+            return  # the next step is already decided
+        predicted = predict_state(obs.state, action)
+        if predicted is None:
+            self.speculator.stats.unpredictable += 1
+            return
+        inv = predicted.inventory_view
+        ctx = DecisionContext(predicted, inv, self.goal_manager, self.goal_planner)
+        try:
+            options = self._rank_options(ctx.concrete_actions, ctx.short_term_goal)
+            goals = ctx.goals_text
+        except StateFieldError:
+            return  # reported when the real state arrives
+        nxt = Observation(
+            state=predicted, inv=inv, options=options, goals=goals, read_at=obs.read_at
+        )
+        prompt = self._build_prompt(nxt)
+        self.speculator.start(
+            predicted, options, goals, prompt, schema=self.output_schema(nxt)
+        )
+        self.timer.lap("speculation")
+
+    def _emergency_override(self, ctx: DecisionContext) -> dict | None:
         """Return a hardcoded action for critical situations, or None.
 
         Raises StateFieldError if required vitals are missing in the state.
         Callers must catch this and emit explore + warn.
         """
-        health = _require_field(state, "health", float)
-        threats = state.threats or []  # None → no threats (safe)
+        state = ctx.state
+        action = reflex_action(state)
+        if action is not None:
+            print(f"[Agent] EMERGENCY: {action['reason']}")
+            return action
         time_of_day = state.time_of_day or 0.0  # None → assume daytime (safe)
 
-        if health < 20:
-            print("[Agent] CRITICAL: Health very low!")
-            return {"action": "eat_food", "reason": "Health critically low"}
-
-        if threats:
-            t = threats[0]
-            tname = (t.name or "unknown").lower()
-            tdist = t.distance or "?"
-            print(f"[Agent] WARNING: {tname} nearby!")
-            return {
-                "action": "run_from_enemy",
-                "reason": f"Hostile {tname} at {tdist}m",
-            }
-
         if time_of_day > 0.75:
-            stg = self.goal_manager.get_short_term_goal(state, inv)
+            stg = ctx.short_term_goal
             if stg and stg.urgency in (Urgency.CRITICAL, Urgency.URGENT):
                 # Pick the first preferred action that's actually craftable
-                valid_set = set(self.goal_planner.get_valid_actions(inv))
+                valid_set = set(ctx.valid_actions)
                 for act in stg.preferred_actions:
                     if act in valid_set:
                         print(f"[Agent] DUSK/NIGHT: {stg.description[:60]}")
@@ -276,7 +664,76 @@ class DSAIAgent:
 
         return None
 
-    def _emit(self, action: dict) -> dict:
+    def _decide_on_worker(self, obs: Observation, prompt: str) -> dict | None:
+        """LLM decision for *obs* if it arrives within self.deadline, else a fallback.
+
+        A call still running from an earlier tick is given the budget first
+        (no second request is queued behind a slow model); its answer is
+        used if the chosen action is still offered, retargeted to *obs*.
+        Without a deadline the call is waited for until it answers or a
+        reflex cancels it (then None: nothing to emit).
+        """
+        until = None if self.deadline is None else time.monotonic() + self.deadline
+
+        def remaining() -> float | None:
+            return None if until is None else until - time.monotonic()
+
+        if self._worker.pending:
+            if self.late_policy == "discard":
+                self._worker.drop()
+                self.deadline_stats.late_dropped += 1
+            else:
+                finished, raw = self._worker.wait(remaining())
+                self.timer.lap("llm")
+                if not finished:
+                    return self._deadline_fallback(obs, "previous call still running")
+                late = reuse_answer(raw, obs.options)
+                if late is not None:
+                    self.deadline_stats.late_used += 1
+                    print(f"[Agent] Using late answer: {late['action']}")
+                    return self.complete(obs, prompt, json.dumps(late), store=False)
+                self.deadline_stats.late_dropped += 1
+
+        self._worker.submit(prompt, schema=self.output_schema(obs), options=obs.options)
+        self._worker_state = obs.state
+        finished, raw = self._worker.wait(remaining())
+        self.timer.lap("llm")
+        if not finished:
+            return self._deadline_fallback(obs, "no answer yet")
+        if self._worker.last_cancel is not None:
+            print(f"[Agent] LLM call cancelled ({self._worker.last_cancel})")
+            return None
+        if self.deadline is not None:
+            self.deadline_stats.met += 1
+        return self.complete(obs, prompt, raw)
+
+    def _deadline_fallback(self, obs: Observation, why: str) -> dict:
+        """Emit the top-ranked valid action (goal-preferred first) for a missed deadline."""
+        self.deadline_stats.missed += 1
+        print(f"[Agent] Deadline {self.deadline:.2f}s missed ({why}), using fallback")
+        if obs.options:
+            best = obs.options[0]
+            action = {
+                "action": best.action,
+                "target": best.target,
+                "reason": f"Deadline fallback: {best.reason or best.action}",
+            }
+        else:
+            action = self._random_explore_action("Deadline fallback: nothing offered")
+        self.memory.add(action["reason"], "system")
+        self.decision_count += 1
+        return self._emit(action)
+
+    def _emit(self, action: dict, keep_plan: bool = False) -> dict:
+        """Write *action*; anything but a plan step or LLM reply ends the plan."""
+        if not keep_plan:
+            self.plan.cancel("override")
+        if self.arbiter is not None:
+            if not self.arbiter.deliberate(action, self._read_at):
+                self.timer.lap("emit")
+                return action
+        else:
+            self.action_writer.write(action)
         self._last_action = action["action"]
-        self.action_writer.write(action)
+        self.timer.lap("emit")
         return action
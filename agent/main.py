@@ -5,21 +5,37 @@ main.py — CLI entry point and dependency-injection wiring.
 Usage:
     uv run main.py
     uv run main.py --model gemma3:1b --interval 8
+    uv run main.py --async --poll 0.25
+    uv run main.py --event-driven --min-interval 0.5 --max-interval 30
+    uv run main.py --interval 2 --deadline-fraction 0.8 --late-answers discard
+    uv run main.py --backend openai --url http://localhost:8080 --model qwen3-8b
+    uv run main.py --small-model gemma3:1b --model qwen3:8b --min-confidence 0.6
+    uv run main.py --interval 8 --reflex-interval 0.25
+    uv run main.py --interval 5 --speculate
 """
 
 import argparse
+from datetime import datetime
 from pathlib import Path
 
 from action_parser import ActionParser
 from action_writer import ActionWriter
+from async_runner import run_async
 from conversation_log import ConversationLog
+from decision_cache import DecisionCache
 from action_planner import ActionPlanner
 from goal_manager import GoalManager
+from inference_backend import BACKENDS, create_backend
+from inference_cascade import AsyncInferenceCascade, InferenceCascade
 from inventory_tracker import InventoryTracker
-from llm_agent import DSAIAgent
+from llm_agent import LATE_POLICIES, DSAIAgent
 from memory import AgentMemory
-from ollama_client import OllamaClient
-from state_reader import StateReader
+from preemption import PreemptionPolicy
+from prompt import LAYOUTS
+from reflexes import ActionArbiter, ReflexLoop
+from state_reader import ParseMode, StateReader
+from state_recorder import StateRecorder
+from tick_scheduler import TickScheduler
 from world_tracker import WorldTracker
 
 STATE_DIR = Path(__file__).resolve().parent.parent / "state"
@@ -28,33 +44,306 @@ STATE_DIR = Path(__file__).resolve().parent.parent / "state"
 def main():
     parser = argparse.ArgumentParser(description="Run Don't Starve LLM Agent")
     parser.add_argument(
-        "--model", default="llama2", help="Ollama model (default: llama2)"
+        "--backend",
+        choices=BACKENDS,
+        default="ollama",
+        help="Inference server protocol; stub answers in-process (default: ollama)",
     )
     parser.add_argument(
-        "--url", default="http://localhost:11434", help="Ollama API URL"
+        "--model", default="llama2", help="Model name (default: llama2)"
+    )
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Inference server URL (default: localhost:11434 for ollama, :8080 for openai)",
+    )
+    parser.add_argument(
+        "--small-model",
+        default=None,
+        help="Try this model first and escalate to --model only when its answer "
+        "is invalid or unconfident (e.g. gemma3:1b)",
+    )
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=None,
+        help="With --small-model: also escalate below this confidence (0-1), "
+        "self-reported or from token logprobs",
+    )
+    parser.add_argument(
+        "--api-key", default=None, help="Bearer token for --backend openai"
     )
     parser.add_argument(
         "--interval", type=float, default=5.0, help="Poll interval in seconds"
     )
+    parser.add_argument(
+        "--parse-mode",
+        choices=[m.value for m in ParseMode],
+        default=ParseMode.JSON.value,
+        help="How game_state.json is parsed (default: json)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream tokens and stop generation once a complete action arrives",
+    )
+    parser.add_argument(
+        "--prompt-layout",
+        choices=sorted(LAYOUTS),
+        default="default",
+        help="Section order; prefix-stable keeps static text first for KV-cache reuse",
+    )
+    parser.add_argument(
+        "--keep-alive",
+        default=None,
+        help='How long Ollama keeps the model loaded between calls, e.g. "30m"',
+    )
+    parser.add_argument(
+        "--structured-output",
+        action="store_true",
+        help="Constrain replies to a JSON schema of this tick's valid actions",
+    )
+    parser.add_argument(
+        "--num-predict",
+        type=int,
+        default=128,
+        help="Max tokens generated per decision (default: 128)",
+    )
+    parser.add_argument(
+        "--stop",
+        action="append",
+        help="Stop sequence for generation (repeatable)",
+    )
+    parser.add_argument(
+        "--event-driven",
+        action="store_true",
+        help="Tick on state-file changes with adaptive backoff instead of --interval",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=0.5,
+        help="Event-driven: minimum seconds between ticks (default: 0.5)",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=30.0,
+        help="Event-driven: longest backed-off timeout (default: 30)",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Overlap state polling with inference (asyncio runner)",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=0.25,
+        help="State poll interval in seconds for --async (default: 0.25)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse LLM decisions for equivalent situations (state/decision_cache.json)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=300.0,
+        help="Seconds a cached decision stays valid (default: 300)",
+    )
+    parser.add_argument(
+        "--num-ctx",
+        type=int,
+        default=None,
+        help="Model context window in tokens; the prompt is kept within it minus "
+        "--num-predict by shrinking memory, history and nearby first",
+    )
+    parser.add_argument(
+        "--plan-steps",
+        type=int,
+        default=0,
+        help="Let the model plan up to N follow-up actions per reply, issued on "
+        "later ticks without re-prompting until one fails (default: 0, off)",
+    )
+    parser.add_argument(
+        "--deadline-fraction",
+        type=float,
+        default=None,
+        help="Per-decision LLM budget as a fraction of --interval; on a miss the "
+        "top-ranked valid action is emitted (sync loop only; default: off)",
+    )
+    parser.add_argument(
+        "--late-answers",
+        choices=LATE_POLICIES,
+        default="next-tick",
+        help="LLM answers that missed their deadline: use on the next tick if "
+        "still valid, or discard (default: next-tick)",
+    )
+    parser.add_argument(
+        "--speculate",
+        action="store_true",
+        help="Predict the state each action leads to and start the next LLM call "
+        "while it executes; used if the real state matches (sync loop only)",
+    )
+    parser.add_argument(
+        "--no-preempt",
+        action="store_true",
+        help="Keep an in-flight LLM call when a newer state shows a threat or "
+        "a health drop, or a reflex fires (default: cancel it with --async, "
+        "--deadline-fraction or --reflex-interval; the plain sync loop never has "
+        "a call in flight when it reads a state). Only --stream calls stop "
+        "generating on the server; a plain request runs to the end and its "
+        "answer is discarded",
+    )
+    parser.add_argument(
+        "--reflex-interval",
+        type=float,
+        default=None,
+        help="Poll the state every N seconds on a reflex thread that flees "
+        "threats, eats at critical health and lights a torch in the dark while "
+        "the LLM deliberates (sync loop only; default: off)",
+    )
+    parser.add_argument(
+        "--record-trace",
+        action="store_true",
+        help="Record every state snapshot to state/traces/ for offline replay",
+    )
     args = parser.parse_args()
 
     STATE_DIR.mkdir(parents=True, exist_ok=True)
 
     memory = AgentMemory(STATE_DIR / "agent_memory.jsonl")
 
+    recorder = None
+    if args.record_trace:
+        session = datetime.now().strftime("%Y%m%d-%H%M%S")
+        recorder = StateRecorder(STATE_DIR / "traces" / f"{session}.trace.gz")
+
+    options = {}
+    if args.backend == "openai" and args.api_key:
+        options["api_key"] = args.api_key
+    options.update(
+        stream=args.stream,
+        keep_alive=args.keep_alive,
+        num_predict=args.num_predict,
+        stop=args.stop,
+    )
+    if args.backend == "ollama" and args.num_ctx:
+        options["num_ctx"] = args.num_ctx
+
+    def make_client():
+        client = create_backend(
+            args.backend,
+            model=args.model,
+            url=args.url,
+            use_async=args.use_async,
+            **options,
+        )
+        if args.small_model:
+            small = create_backend(
+                args.backend,
+                model=args.small_model,
+                url=args.url,
+                use_async=args.use_async,
+                logprobs=args.min_confidence is not None,
+                **options,
+            )
+            cascade_cls = AsyncInferenceCascade if args.use_async else InferenceCascade
+            client = cascade_cls([small, client], args.min_confidence)
+        return client
+
+    llm_client = make_client()
+
+    writer = ActionWriter(STATE_DIR / "action_command.json")
+    reflexes = None
+    if args.reflex_interval and not args.use_async:
+        arbiter = ActionArbiter(writer)
+        reflexes = ReflexLoop(
+            STATE_DIR / "game_state.json", arbiter, interval=args.reflex_interval
+        )
+
+    # Only built where a call can be in flight when a newer state arrives
+    preemption = None
+    if not args.no_preempt and (args.use_async or args.deadline_fraction or reflexes):
+        preemption = PreemptionPolicy()
+        print(
+            "[main] Preemption on: "
+            + (
+                "cancelled calls stop generating on the server"
+                if args.stream
+                else "cancelled answers are discarded, but without --stream "
+                "the server still generates them in full"
+            )
+        )
+    elif not args.no_preempt:
+        print(
+            "[main] Preemption off: needs --async, --deadline-fraction or "
+            "--reflex-interval"
+        )
+
     agent = DSAIAgent(
-        state_reader=StateReader(STATE_DIR / "game_state.json"),
+        state_reader=StateReader(
+            STATE_DIR / "game_state.json", mode=ParseMode(args.parse_mode)
+        ),
         memory=memory,
-        llm_client=OllamaClient(model=args.model, url=args.url),
+        llm_client=llm_client,
         action_parser=ActionParser(),
-        action_writer=ActionWriter(STATE_DIR / "action_command.json"),
+        action_writer=writer,
         inventory_tracker=InventoryTracker(memory),
         conversation_log=ConversationLog(STATE_DIR / "conversation_log.jsonl"),
         world_tracker=WorldTracker(ttl_seconds=120.0),
         goal_planner=ActionPlanner(),
         goal_manager=GoalManager(),
+        state_recorder=recorder,
+        decision_cache=(
+            DecisionCache(STATE_DIR / "decision_cache.json", ttl=args.cache_ttl)
+            if args.cache
+            else None
+        ),
+        prompt_layout=args.prompt_layout,
+        structured_output=args.structured_output,
+        deadline=(
+            args.deadline_fraction * args.interval
+            if args.deadline_fraction and not args.use_async
+            else None
+        ),
+        late_policy=args.late_answers,
+        max_plan_steps=args.plan_steps,
+        prompt_budget=(
+            args.num_ctx - (args.num_predict or 0) if args.num_ctx else None
+        ),
+        arbiter=reflexes.arbiter if reflexes else None,
+        preemption=preemption,
+        # Its own client: speculative calls overlap decisions on the same tick
+        speculation_client=(
+            make_client() if args.speculate and not args.use_async else None
+        ),
     )
-    agent.run(interval=args.interval)
+    if args.use_async:
+        run_async(agent, llm_client, poll_interval=args.poll)
+        return
+    if reflexes:
+        reflexes.start()
+    try:
+        if args.event_driven:
+            state_file = STATE_DIR / "game_state.json"
+            scheduler = TickScheduler(
+                state_file,
+                base_interval=args.interval,
+                min_interval=args.min_interval,
+                max_interval=args.max_interval,
+                # Its own reader: probing must not consume the agent's snapshot
+                probe=StateReader(state_file, mode=ParseMode(args.parse_mode)).read,
+            )
+            agent.run(scheduler=scheduler)
+        else:
+            agent.run(interval=args.interval)
+    finally:
+        if reflexes:
+            reflexes.stop()
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ This package contains all data models used across the agent system.
 """
 
 from models.actions import ActionCommand, ActionOption, ParsedAction
+from models.inventory import InventoryView
 from models.state import (
     ActionLogEntry,
     GameState,
@@ -19,6 +20,7 @@ __all__ = [
     "ActionLogEntry",
     "ActionOption",
     "GameState",
+    "InventoryView",
     "MemoryLogEntry",
     "NearbyEntity",
     "ParsedAction",
@@ -61,3 +61,59 @@ class ParsedAction(BaseModel):
     def to_dict(self) -> dict:
         """Return all fields (including extras) as a plain dict."""
         return self.model_dump()
+
+    @classmethod
+    def output_schema(cls, options: list[ActionOption], plan_steps: int = 0) -> dict:
+        """JSON schema for Ollama's ``format`` field, restricted to *options*.
+
+        ``action`` becomes an enum of the offered action names, and an
+        ``anyOf`` branch per action pins ``target`` to that action's own
+        offered targets (absent or null for target-less actions such as
+        chop_tree), so the sampler can only produce offered pairs.  Each
+        branch repeats ``reason`` (and ``then``) so it stands alone.
+        With *plan_steps* > 0 an optional ``then`` list of up to that many
+        follow-up {action, target} steps is allowed (see plan_executor);
+        those are free strings, since later steps may not be offered yet.
+        """
+        schema = cls.model_json_schema()
+        props = schema["properties"]
+        props["action"]["enum"] = sorted({o.action for o in options})
+        props["target"] = {"type": ["string", "null"]}
+        schema["required"] = ["action", "reason"]
+        if plan_steps > 0:
+            props["then"] = {
+                "type": "array",
+                "maxItems": plan_steps,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "action": {"type": "string"},
+                        "target": {"type": "string"},
+                    },
+                    "required": ["action"],
+                },
+            }
+        targets: dict[str, set[str | None]] = {}
+        for o in options:
+            targets.setdefault(o.action, set()).add(o.target)
+        branches = []
+        for action, offered in sorted(targets.items()):
+            # grammar converters take the anyOf over the sibling keywords,
+            # so every branch must be a complete object schema on its own
+            named = sorted(t for t in offered if t is not None)
+            branch = {
+                "type": "object",
+                "properties": {**props, "action": {"const": action}},
+                "required": ["action", "reason"],
+            }
+            if not named:
+                branch["properties"]["target"] = {"type": "null"}
+            elif None in offered:
+                branch["properties"]["target"] = {"enum": [*named, None]}
+            else:
+                branch["properties"]["target"] = {"type": "string", "enum": named}
+                branch["required"].append("target")
+            branches.append(branch)
+        if branches:
+            schema["anyOf"] = branches
+        return schema
@@ -0,0 +1,59 @@
+"""
+inventory.py — Parse-once, alias-normalised inventory view.
+
+GameState.inventory arrives as display strings (["log x20", "twig", ...]).
+InventoryView parses them a single time into canonical prefab counts and is
+shared by every consumer of that tick (trackers, planner, goals, prompt).
+"""
+
+from collections.abc import Iterator, Mapping
+
+from action_specs import canonical_prefab
+
+
+class InventoryView(Mapping[str, int]):
+    """Immutable mapping of canonical prefab name -> count.
+
+    Lookups are alias-aware: ``view["twig"]`` and ``"twig" in view`` resolve
+    to the canonical ``"twigs"`` entry, so callers never re-normalise.
+    """
+
+    __slots__ = ("_counts",)
+
+    def __init__(self, counts: Mapping[str, int] | None = None):
+        normalised: dict[str, int] = {}
+        for key, count in (counts or {}).items():
+            canonical = canonical_prefab(key)
+            normalised[canonical] = normalised.get(canonical, 0) + count
+        self._counts = normalised
+
+    @classmethod
+    def parse(cls, items: list[str]) -> "InventoryView":
+        """Convert ["log x20", "axe"] -> {"log": 20, "axe": 1} in one pass.
+
+        Repeated stacks of the same prefab are summed.
+        """
+        view = cls.__new__(cls)
+        counts: dict[str, int] = {}
+        for item in items:
+            if " x" in item:
+                name, _, count = item.rpartition(" x")
+                qty = int(count)
+            else:
+                name, qty = item, 1
+            canonical = canonical_prefab(name.strip())
+            counts[canonical] = counts.get(canonical, 0) + qty
+        view._counts = counts
+        return view
+
+    def __getitem__(self, key: str) -> int:
+        return self._counts[canonical_prefab(key)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __repr__(self) -> str:
+        return f"InventoryView({self._counts!r})"
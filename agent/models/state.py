@@ -4,8 +4,12 @@ state.py — Pydantic models for game state data.
 Defines the schema for game state snapshots exported from Don't Starve.
 """
 
+from functools import cached_property
+
 from pydantic import BaseModel, Field
 
+from models.inventory import InventoryView
+
 
 class Position(BaseModel):
     """2D position in the game world."""
@@ -130,27 +134,25 @@ class GameState(BaseModel):
         """Any threats nearby."""
         return len(self.threats) > 0
 
-    def get_inventory_dict(self) -> dict[str, int]:
+    @cached_property
+    def inventory_view(self) -> InventoryView:
         """
-        Parse inventory list into item counts.
+        Inventory parsed once into canonical item counts (cached per snapshot).
 
-        Converts ["log x20", "axe"] -> {"log": 20, "axe": 1}
+        Converts ["log x20", "twig"] -> {"log": 20, "twigs": 1}. Snapshots are
+        treated as immutable: build a new GameState rather than mutating
+        ``inventory`` or using model_copy(update=...) on a parsed one.
         """
-        result: dict[str, int] = {}
-        for item in self.inventory:
-            if " x" in item:
-                name, _, count = item.rpartition(" x")
-                result[name.strip()] = int(count)
-            else:
-                result[item.strip()] = 1
-        return result
+        return InventoryView.parse(self.inventory)
+
+    def get_inventory_dict(self) -> dict[str, int]:
+        """Mutable copy of inventory_view."""
+        return dict(self.inventory_view)
 
     def has_item(self, item_name: str) -> bool:
         """Check if inventory contains an item."""
-        inv_dict = self.get_inventory_dict()
-        return item_name in inv_dict
+        return item_name in self.inventory_view
 
     def get_item_count(self, item_name: str) -> int:
         """Get count of specific item in inventory."""
-        inv_dict = self.get_inventory_dict()
-        return inv_dict.get(item_name, 0)
+        return self.inventory_view.get(item_name, 0)
@@ -1,11 +1,76 @@
 """
 ollama_client.py — HTTP client for the local Ollama inference API.
+
+One persistent httpx.Client is kept for the life of the agent so every
+decision reuses a keep-alive connection. The server is assumed healthy until
+a call fails; only then is it re-probed (HEAD /), with exponential backoff
+between probes so a stopped server costs nothing per tick.
+
+With ``stream=True`` the response is read token by token through a
+JsonObjectScanner; as soon as the first complete object validates as an
+action the request is closed, which makes Ollama stop generating.
+
+AsyncOllamaClient is the same client on httpx.AsyncClient, for the asyncio
+runner (async_runner.py).
+
+The wire format lives in a few hooks (_generate_path, _body, _parse_response,
+_parse_stream_line) so openai_client.py can reuse the connection handling,
+health backoff and timing for /v1/chat/completions.
 """
 
+import json
+import math
+import time
+
 import httpx
 
+from action_parser import is_complete_action
+from inference_backend import CallTiming, InferenceMetrics
+from json_scanner import JsonObjectScanner
+from models import ActionOption
+from preemption import CancelToken
+
+
+class _TraceTimer:
+    """httpcore trace hook that timestamps connect and response-header events."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connect_started: float | None = None
+        self.connect = 0.0
+        self.headers_at: float | None = None
+        self.decided_at: float | None = None  # set by the streaming reader
+        self.early_stop = False
+
+    def __call__(self, event: str, info: dict) -> None:
+        now = time.perf_counter()
+        if event == "connection.connect_tcp.started":
+            self.connect_started = now
+        elif event == "connection.connect_tcp.complete" and self.connect_started:
+            self.connect = now - self.connect_started
+        elif event.endswith(".receive_response_headers.complete"):
+            self.headers_at = now
+
+
+def _cancelled(cancel: CancelToken | None, tag: str, streaming: bool = True) -> bool:
+    if cancel is None or not cancel.cancelled:
+        return False
+    if streaming:
+        print(f"[{tag}] Call cancelled ({cancel.reason}), stream closed")
+    else:
+        print(
+            f"[{tag}] Call cancelled ({cancel.reason}): answer discarded, but the "
+            "server generated it in full (only --stream calls can be stopped)"
+        )
+    return True
+
+
+class _OllamaBase:
+    """Configuration, health/backoff state and timing shared by both clients."""
+
+    _tag = "OllamaClient"  # log prefix
+    _generate_path = "/api/generate"
 
-class OllamaClient:
     def __init__(
         self,
         model: str = "llama2",
@@ -13,50 +78,384 @@ class OllamaClient:
         temperature: float = 0.7,
         top_p: float = 0.95,
         timeout: float = 60.0,
+        connect_timeout: float = 2.0,
+        max_connections: int = 4,
+        keepalive_expiry: float = 300.0,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 30.0,
+        stream: bool = False,
+        keep_alive: str | None = None,
+        num_predict: int | None = 128,
+        stop: list[str] | None = None,
+        logprobs: bool = False,
+        num_ctx: int | None = None,
     ):
+        """
+        Args:
+            timeout:          Read timeout for a generate call (the LLM is slow).
+            connect_timeout:  Connect timeout for generate calls and probes.
+            max_connections:  Pool size; the agent makes one call at a time.
+            keepalive_expiry: Seconds an idle pooled connection is kept open.
+            backoff_initial:  Delay before re-probing after the first failure;
+                              doubles on each failed probe up to backoff_max.
+            stream:           Stream tokens and stop as soon as a complete
+                              action object has arrived.
+            keep_alive:       How long Ollama keeps the model (and its KV
+                              cache) loaded after a call, e.g. "30m"; None
+                              uses the server default (5m).
+            num_predict:      Cap on generated tokens (an action is ~40);
+                              None lets the model run to its own limit.
+            stop:             Sequences that end generation early.
+            logprobs:         Ask for per-token log probabilities and expose
+                              their geometric mean as last_confidence
+                              (Ollama >= 0.12.11).
+            num_ctx:          Context window to load the model with; None
+                              uses the model default. Prompts longer than
+                              this are truncated by Ollama from the start.
+        """
         self.model = model
         self.url = url
         self.temperature = temperature
         self.top_p = top_p
         self.timeout = timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stream = stream
+        self.keep_alive = keep_alive
+        self.num_predict = num_predict
+        self.stop = stop
+        self.logprobs = logprobs
+        self.num_ctx = num_ctx
+        self._token_logprobs: list[float] = []  # of the current/last call
+        self.last_timing: CallTiming | None = None
+        self.metrics = InferenceMetrics()
+        self._client_options = {
+            "base_url": url,
+            "timeout": httpx.Timeout(timeout, connect=connect_timeout),
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        }
+        self._healthy = True  # optimistic until a call fails
+        self._backoff = 0.0
+        self._next_probe = 0.0  # monotonic time the next probe is allowed
+
+    @property
+    def last_confidence(self) -> float | None:
+        """Geometric-mean token probability of the last reply, if logprobs were on."""
+        if not self._token_logprobs:
+            return None
+        return math.exp(sum(self._token_logprobs) / len(self._token_logprobs))
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _skip_call(self) -> bool:
+        """True while the server is known down and the backoff has not expired."""
+        return not self._healthy and time.monotonic() < self._next_probe
+
+    def _report_unreachable(self) -> None:
+        self.metrics.failures += 1
+        print(
+            f"[{self._tag}] Cannot reach {self.url} "
+            f"(retry in {max(0.0, self._next_probe - time.monotonic()):.0f}s)"
+        )
+
+    def _body(self, prompt: str, schema: dict | None = None) -> dict:
+        # Sampling parameters are only honoured inside "options"
+        options = {"temperature": self.temperature, "top_p": self.top_p}
+        if self.num_predict is not None:
+            options["num_predict"] = self.num_predict
+        if self.stop:
+            options["stop"] = self.stop
+        if self.num_ctx is not None:
+            options["num_ctx"] = self.num_ctx
+        body = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": self.stream,
+            "options": options,
+        }
+        if schema is not None:
+            body["format"] = schema
+        if self.keep_alive:
+            body["keep_alive"] = self.keep_alive
+        if self.logprobs:
+            body["logprobs"] = True
+        return body
+
+    def _parse_response(self, data: dict) -> str:
+        """Text of a non-streamed response; records its token counts."""
+        self._record_usage(data)
+        self._record_logprobs(data.get("logprobs"))
+        return data.get("response", "")
+
+    def _parse_stream_line(self, line: str) -> tuple[str, bool]:
+        """(token, done) for one NDJSON line; records counts on the last one."""
+        chunk = json.loads(line)
+        if chunk.get("done"):
+            self._record_usage(chunk)
+        self._record_logprobs(chunk.get("logprobs"))
+        return chunk.get("response", ""), bool(chunk.get("done"))
+
+    def _record_usage(self, data: dict) -> None:
+        """Ollama's eval counters (durations in ns), present once done."""
+        if "eval_count" not in data and "prompt_eval_count" not in data:
+            return
+        self.metrics.record_usage(
+            prompt_tokens=data.get("prompt_eval_count", 0),
+            completion_tokens=data.get("eval_count", 0),
+            prompt_seconds=data.get("prompt_eval_duration", 0) / 1e9,
+            completion_seconds=data.get("eval_duration", 0) / 1e9,
+        )
+
+    def _record_logprobs(self, entries: list[dict] | None) -> None:
+        """Collect [{"token": ..., "logprob": ...}, ...] (Ollama and OpenAI shape)."""
+        self._token_logprobs.extend(e["logprob"] for e in entries or ())
+
+    def _handle_error(self, exc: Exception) -> None:
+        self.metrics.failures += 1
+        if isinstance(exc, httpx.TimeoutException):
+            print(f"[{self._tag}] Timeout — LLM took too long")
+            self._mark_unhealthy()
+        elif isinstance(exc, httpx.ConnectError):
+            print(f"[{self._tag}] Connection refused at {self.url}")
+            self._mark_unhealthy()
+        else:
+            print(f"[{self._tag}] Error: {exc}")
+
+    def _feed_line(
+        self,
+        line: str,
+        scanner: JsonObjectScanner,
+        parts: list[str],
+        trace: _TraceTimer,
+    ) -> bool:
+        """Consume one stream line; True once reading should stop."""
+        if not line:
+            return False
+        token, done = self._parse_stream_line(line)
+        parts.append(token)
+        if any(is_complete_action(obj) for obj in scanner.feed(token)):
+            trace.decided_at = time.perf_counter()
+            trace.early_stop = not done
+            return True
+        return done
+
+    def _check_status(self, response: httpx.Response) -> bool:
+        if response.status_code == 200:
+            self._mark_healthy()
+            return True
+        self.metrics.failures += 1
+        print(f"[{self._tag}] HTTP {response.status_code}")
+        if response.status_code >= 500:
+            self._mark_unhealthy()
+        return False
+
+    def _mark_healthy(self) -> None:
+        self._healthy = True
+        self._backoff = 0.0
+
+    def _mark_unhealthy(self) -> None:
+        self._healthy = False
+        self._backoff = min(
+            self.backoff_max,
+            self._backoff * 2 if self._backoff else self.backoff_initial,
+        )
+        self._next_probe = time.monotonic() + self._backoff
+
+    def _record_timing(self, trace: _TraceTimer) -> None:
+        total = time.perf_counter() - trace.start
+        ttfb = trace.headers_at - trace.start if trace.headers_at else total
+        decision = trace.decided_at - trace.start if trace.decided_at else total
+        self.last_timing = CallTiming(
+            connect=trace.connect,
+            ttfb=ttfb,
+            total=total,
+            decision=decision,
+            early_stop=trace.early_stop,
+        )
+        self.metrics.record_call(self.last_timing)
+        print(
+            f"[{self._tag}] connect={trace.connect * 1e3:.1f}ms "
+            f"ttfb={ttfb * 1e3:.0f}ms total={total * 1e3:.0f}ms"
+            + (" (stopped early)" if trace.early_stop else "")
+        )
+
+
+class OllamaClient(_OllamaBase):
+    def __init__(self, *args, transport: httpx.BaseTransport | None = None, **kwargs):
+        """See _OllamaBase; *transport* overrides httpx's (tests, fake servers)."""
+        super().__init__(*args, **kwargs)
+        self._client = httpx.Client(transport=transport, **self._client_options)
 
     def is_available(self) -> bool:
-        """Return True if the Ollama server is reachable."""
-        try:
-            httpx.head(self.url, timeout=2)
+        """Return True if the Ollama server is believed reachable.
+
+        Does not touch the network while the last call succeeded. After a
+        failure, probes at most once per backoff window.
+        """
+        if self._healthy:
             return True
+        if self._skip_call():
+            return False
+        try:
+            self._client.head("/", timeout=2)
         except httpx.HTTPError:
+            self._mark_unhealthy()
             return False
+        self._mark_healthy()
+        return True
 
-    def generate(self, prompt: str) -> str | None:
-        """Send prompt to Ollama and return the raw text response, or None on failure."""
+    def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        cancel: CancelToken | None = None,
+        options: list[ActionOption] | None = None,  # the model reads them in the prompt
+    ) -> str | None:
+        """Send prompt to Ollama and return the raw text response, or None on failure.
+
+        *schema* (see ParsedAction.output_schema) constrains the output to
+        matching JSON via Ollama's ``format`` field. A stream stops at the
+        first line read after *cancel* is set; a plain request cannot be
+        interrupted, but its answer is discarded.
+        """
         if not self.is_available():
-            print(f"[OllamaClient] Cannot reach Ollama at {self.url}")
+            self._report_unreachable()
             return None
 
-        print(f"[OllamaClient] Calling {self.model}...")
+        print(f"[{self._tag}] Calling {self.model}...")
+        self._token_logprobs = []
+        trace = _TraceTimer()
+        body = self._body(prompt, schema)
         try:
-            response = httpx.post(
-                f"{self.url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": self.temperature,
-                    "top_p": self.top_p,
-                },
-                timeout=self.timeout,
+            if self.stream:
+                return self._generate_streaming(body, trace, cancel)
+            response = self._client.post(
+                self._generate_path, json=body, extensions={"trace": trace}
             )
-            if response.status_code != 200:
-                print(f"[OllamaClient] HTTP {response.status_code}")
+            self._record_timing(trace)
+            if not self._check_status(response):
+                return None
+            if _cancelled(cancel, self._tag, streaming=False):
                 return None
-            return response.json().get("response", "")
-        except httpx.TimeoutException:
-            print("[OllamaClient] Timeout — LLM took too long")
+            return self._parse_response(response.json())
+        except Exception as e:
+            self._handle_error(e)
             return None
-        except httpx.ConnectError:
-            print(f"[OllamaClient] Connection refused at {self.url}")
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._client.close()
+
+    def _generate_streaming(
+        self, body: dict, trace: _TraceTimer, cancel: CancelToken | None = None
+    ) -> str | None:
+        """Read stream lines until the model is done, an action is complete or *cancel*."""
+        scanner = JsonObjectScanner()
+        parts: list[str] = []
+        with self._client.stream(
+            "POST", self._generate_path, json=body, extensions={"trace": trace}
+        ) as response:
+            if not self._check_status(response):
+                self._record_timing(trace)
+                return None
+            for line in response.iter_lines():
+                if _cancelled(cancel, self._tag):
+                    break
+                if self._feed_line(line, scanner, parts, trace):
+                    break
+        # Leaving the block closes the response; mid-stream that drops the
+        # connection, which is how Ollama learns to stop generating.
+        self._record_timing(trace)
+        if cancel is not None and cancel.cancelled:
             return None
+        return "".join(parts)
+
+
+class AsyncOllamaClient(_OllamaBase):
+    """OllamaClient on httpx.AsyncClient; generate() is a coroutine.
+
+    Cancelling the generate() task closes the request, so a superseded
+    inference stops server-side too.
+    """
+
+    def __init__(
+        self, *args, transport: httpx.AsyncBaseTransport | None = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._client = httpx.AsyncClient(transport=transport, **self._client_options)
+
+    async def is_available(self) -> bool:
+        """Async is_available(); same caching and backoff as OllamaClient."""
+        if self._healthy:
+            return True
+        if self._skip_call():
+            return False
+        try:
+            await self._client.head("/", timeout=2)
+        except httpx.HTTPError:
+            self._mark_unhealthy()
+            return False
+        self._mark_healthy()
+        return True
+
+    async def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        options: list[ActionOption] | None = None,
+    ) -> str | None:
+        """Async generate(); returns the raw text response or None on failure."""
+        if not await self.is_available():
+            self._report_unreachable()
+            return None
+
+        print(f"[{self._tag}] Calling {self.model}...")
+        self._token_logprobs = []
+        trace = _TraceTimer()
+        body = self._body(prompt, schema)
+
+        async def on_trace(event: str, info: dict) -> None:
+            trace(event, info)
+
+        try:
+            if self.stream:
+                return await self._generate_streaming(body, trace, on_trace)
+            response = await self._client.post(
+                self._generate_path,
+                json=body,
+                extensions={"trace": on_trace},
+            )
+            self._record_timing(trace)
+            if not self._check_status(response):
+                return None
+            return self._parse_response(response.json())
         except Exception as e:
-            print(f"[OllamaClient] Error: {e}")
+            self._handle_error(e)
             return None
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+    async def _generate_streaming(
+        self, body: dict, trace: _TraceTimer, on_trace
+    ) -> str | None:
+        scanner = JsonObjectScanner()
+        parts: list[str] = []
+        async with self._client.stream(
+            "POST", self._generate_path, json=body, extensions={"trace": on_trace}
+        ) as response:
+            if not self._check_status(response):
+                self._record_timing(trace)
+                return None
+            async for line in response.aiter_lines():
+                if self._feed_line(line, scanner, parts, trace):
+                    break
+        self._record_timing(trace)
+        return "".join(parts)
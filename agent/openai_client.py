@@ -0,0 +1,99 @@
+"""
+openai_client.py — Inference over an OpenAI-compatible /v1/chat/completions API.
+
+For local servers that speak the OpenAI protocol: vLLM, llama.cpp's
+llama-server, LM Studio. Connection pooling, health backoff, streaming with
+early stop and call timing are inherited from the Ollama clients; only the
+request body and response parsing differ.
+
+Mapping of the agent's options:
+    num_predict -> max_tokens
+    stop        -> stop
+    schema      -> response_format {"type": "json_schema", ...}
+    keep_alive  -> ignored (Ollama only)
+    logprobs    -> logprobs
+    num_ctx     -> ignored (context size is fixed when the server starts)
+
+Token counts come from ``usage`` (requested for streams via
+stream_options); llama.cpp additionally reports prefill/decode times in
+``timings``.
+"""
+
+import json
+
+from ollama_client import AsyncOllamaClient, OllamaClient
+
+
+class _OpenAIProtocol:
+    """Wire-format hooks for /v1/chat/completions, mixed into the Ollama clients."""
+
+    _tag = "OpenAIClient"
+    _generate_path = "/v1/chat/completions"
+
+    def __init__(self, *args, api_key: str | None = None, **kwargs):
+        """See _OllamaBase; *api_key* is sent as a Bearer token if given."""
+        super().__init__(*args, **kwargs)
+        if api_key:
+            self._client.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _body(self, prompt: str, schema: dict | None = None) -> dict:
+        body = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": self.stream,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+        }
+        if self.num_predict is not None:
+            body["max_tokens"] = self.num_predict
+        if self.stop:
+            body["stop"] = self.stop
+        if self.logprobs:
+            body["logprobs"] = True
+        if self.stream:
+            body["stream_options"] = {"include_usage": True}
+        if schema is not None:
+            body["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "action", "schema": schema},
+            }
+        return body
+
+    def _parse_response(self, data: dict) -> str:
+        self._record_usage(data)
+        choices = data.get("choices") or [{}]
+        self._record_logprobs((choices[0].get("logprobs") or {}).get("content"))
+        return choices[0].get("message", {}).get("content") or ""
+
+    def _parse_stream_line(self, line: str) -> tuple[str, bool]:
+        """(token, done) for one server-sent-events line."""
+        if not line.startswith("data:"):
+            return "", False  # comments, event names, keep-alives
+        payload = line[len("data:") :].strip()
+        if payload == "[DONE]":
+            return "", True
+        chunk = json.loads(payload)
+        self._record_usage(chunk)
+        choices = chunk.get("choices") or [{}]
+        self._record_logprobs((choices[0].get("logprobs") or {}).get("content"))
+        return choices[0].get("delta", {}).get("content") or "", False
+
+    def _record_usage(self, data: dict) -> None:
+        usage = data.get("usage")
+        if not usage:
+            return
+        timings = data.get("timings", {})  # llama.cpp only
+        self.metrics.record_usage(
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            prompt_seconds=timings.get("prompt_ms", 0.0) / 1e3,
+            completion_seconds=timings.get("predicted_ms", 0.0) / 1e3,
+        )
+
+
+class OpenAIClient(_OpenAIProtocol, OllamaClient):
+    pass
+
+
+class AsyncOpenAIClient(_OpenAIProtocol, AsyncOllamaClient):
+    pass
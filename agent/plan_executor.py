@@ -0,0 +1,120 @@
+"""
+plan_executor.py — Multi-step plans from one LLM reply, issued over successive ticks.
+
+With plans enabled the model may add follow-up steps to its answer:
+
+    {"action": "pick_up_item", "target": "twigs (3m)", "reason": "torch",
+     "then": [{"action": "pick_up_item", "target": "cutgrass"},
+              {"action": "craft_item", "target": "torch"}]}
+
+The first step is emitted as usual. Each following tick, before any prompt
+is built, PlanExecutor hands out the next step instead of calling the LLM,
+until the plan runs out or is invalidated:
+
+    failed       the state's action_log reports a failed action
+    threat       a threat is in view (the override will handle it)
+    unavailable  the step is not among the current valid actions
+                 (prerequisites gone, or never met)
+    override     DSAIAgent emitted something else (override, death, reset)
+
+A step matches a valid action by action name and target base name
+(decision_cache.retarget), so "cutgrass" runs as "cutgrass (4.1m)".
+"""
+
+import json
+from dataclasses import dataclass, field
+
+from decision_cache import retarget
+from models import ActionOption, GameState
+
+INVALIDATION_REASONS = ("failed", "threat", "unavailable", "override")
+
+
+@dataclass
+class PlanStats:
+    plans: int = 0  # replies that carried at least one follow-up step
+    steps: int = 0  # follow-up steps emitted without an LLM call
+    completed: int = 0  # plans whose every step was emitted
+    invalidated: dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(INVALIDATION_REASONS, 0)
+    )
+
+
+def plan_steps(raw: str | None, limit: int) -> list[dict]:
+    """The first *limit* well-formed "then" steps of a raw reply, else []."""
+    if not raw or limit <= 0:
+        return []
+    start, end = raw.find("{"), raw.rfind("}") + 1
+    try:
+        data = json.loads(raw[start:end]) if start != -1 else None
+    except json.JSONDecodeError:
+        return []
+    then = data.get("then") if isinstance(data, dict) else None
+    if not isinstance(then, list):
+        return []
+    steps = []
+    for step in then[:limit]:
+        if not isinstance(step, dict) or not isinstance(step.get("action"), str):
+            break  # keep the order: stop at the first malformed step
+        steps.append({"action": step["action"], "target": step.get("target")})
+    return steps
+
+
+class PlanExecutor:
+    """Queue of the follow-up steps of the last LLM reply."""
+
+    def __init__(self, max_steps: int = 3):
+        self.max_steps = max_steps  # follow-up steps kept per reply
+        self.stats = PlanStats()
+        self._steps: list[dict] = []
+        self._reason = ""
+        self._total = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self._steps)
+
+    def start(self, raw: str | None, action: dict) -> None:
+        """Replace the current plan with the follow-up steps in *raw*.
+
+        *action* is the validated first step, already emitted.
+        """
+        self._steps = plan_steps(raw, self.max_steps)
+        self._reason = action.get("reason", "")
+        self._total = len(self._steps) + 1
+        if self._steps:
+            self.stats.plans += 1
+
+    def next_step(self, state: GameState, options: list[ActionOption]) -> dict | None:
+        """The next step as an action for *options*, or None to ask the LLM.
+
+        Invalidates the plan when *state* shows it no longer applies.
+        """
+        if not self._steps:
+            return None
+        if any(entry.result != "success" for entry in state.action_log):
+            self.cancel("failed")
+            return None
+        if state.threats:
+            self.cancel("threat")
+            return None
+        step = retarget(self._steps[0], options)
+        if step is None:
+            self.cancel("unavailable")
+            return None
+        self._steps.pop(0)
+        done = self._total - len(self._steps)
+        step["reason"] = f"Plan step {done}/{self._total}: {self._reason}"
+        self.stats.steps += 1
+        if not self._steps:
+            self.stats.completed += 1
+        return step
+
+    def cancel(self, reason: str) -> None:
+        """Drop the remaining steps, counting why if there were any."""
+        if self._steps:
+            self.stats.invalidated[reason] += 1
+            print(
+                f"[PlanExecutor] Plan dropped ({reason}), {len(self._steps)} steps left"
+            )
+        self._steps = []
@@ -0,0 +1,102 @@
+"""
+preemption.py — Cancelling an LLM call whose answer no longer applies.
+
+A decision is made for one snapshot. If the next snapshot shows a threat
+or critical health, the pending answer is moot: the override will act on
+the new state anyway, and waiting for (or queueing behind) the old call
+only delays it. PreemptionPolicy decides which changes between the two
+snapshots invalidate the pending decision:
+
+    threat   a threat is in view that was not when the decision started
+    health   health fell below critical_health
+    damage   health fell by at least health_drop
+
+The sync loop (DSAIAgent + InferenceWorker) hands each call a CancelToken.
+It only has a call in flight across snapshots with a deadline; with a
+ReflexLoop, a fired reflex also cancels the call decide() waits on. The
+asyncio runner cancels the task. Only streaming HTTP clients can stop the
+generation itself: they check the token between lines and close the
+connection. A plain request runs to the end on the server and its answer
+is discarded.
+Either way PreemptionStats counts how long cancelling took (cancel() to
+the call returning) and the inference seconds spent on cancelled calls.
+"""
+
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from models import GameState
+
+
+class CancelToken:
+    """Set once by the decision thread, polled by the inference call."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: str | None = None
+        self.cancelled_at: float | None = None  # time.perf_counter()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str) -> None:
+        if self._event.is_set():
+            return
+        self.reason = reason
+        self.cancelled_at = time.perf_counter()
+        self._event.set()
+
+
+@dataclass
+class PreemptionStats:
+    cancelled: Counter = field(default_factory=Counter)  # by reason
+    latency: float = 0.0  # summed seconds from cancel() to the call returning
+    wasted: float = 0.0  # summed inference seconds of cancelled calls
+
+    @property
+    def total(self) -> int:
+        return sum(self.cancelled.values())
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency / self.total if self.total else 0.0
+
+    def record(
+        self, reason: str, started: float, cancelled_at: float, finished: float
+    ) -> None:
+        """Count one cancelled call (all times from time.perf_counter())."""
+        self.cancelled[reason] += 1
+        self.latency += max(finished - cancelled_at, 0.0)
+        self.wasted += max(finished - started, 0.0)
+
+    def summary(self) -> str:
+        reasons = ", ".join(f"{k} {v}" for k, v in self.cancelled.items())
+        return (
+            f"{self.total} cancelled"
+            + (f" ({reasons})" if reasons else "")
+            + f", mean cancel latency {self.mean_latency * 1e3:.0f}ms, "
+            f"{self.wasted:.1f}s of inference wasted"
+        )
+
+
+@dataclass
+class PreemptionPolicy:
+    threats: bool = True  # a new threat invalidates the pending decision
+    critical_health: float = 20.0  # so does crossing below this health
+    health_drop: float | None = 10.0  # ... or losing this much (None = ignore)
+
+    def reason(self, decided_on: GameState, state: GameState) -> str | None:
+        """Why *state* invalidates a decision made for *decided_on*, or None."""
+        if self.threats and state.threats and not decided_on.threats:
+            return "threat"
+        if state.health < self.critical_health <= decided_on.health:
+            return "health"
+        if (
+            self.health_drop is not None
+            and decided_on.health - state.health >= self.health_drop
+        ):
+            return "damage"
+        return None
@@ -9,9 +9,10 @@ Does NOT know anything about nearby entities, food choices, or enemies.
 That belongs in ConcreteActionBuilder.
 """
 
+from collections.abc import Mapping
+
 from action_specs import (
     ACTION_SPECS,
-    PREFAB_ALIASES,
     ActionSpec,
     has_prereqs,
     missing_items,
@@ -29,7 +30,7 @@ class PrereqFilter:
     # Core filtering
     # ------------------------------------------------------------------
 
-    def get_valid_actions(self, inv: dict[str, int]) -> list[str]:
+    def get_valid_actions(self, inv: Mapping[str, int]) -> list[str]:
         """Actions whose prerequisites are satisfied by *inv* and that aren't redundant.
 
         Redundant = craft action with redundant_if_held=True whose output is
@@ -52,7 +53,7 @@ class PrereqFilter:
     # Prompt formatting
     # ------------------------------------------------------------------
 
-    def format_valid_actions(self, inv: dict[str, int]) -> str:
+    def format_valid_actions(self, inv: Mapping[str, int]) -> str:
         """Sorted comma-separated list; craft_item entries include ingredient costs."""
         parts: list[str] = []
         for action in sorted(self.get_valid_actions(inv)):
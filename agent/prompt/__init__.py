@@ -14,24 +14,38 @@ Usage:
     )
 """
 
-from prompt.builder import PromptBuilder, create_default_builder
+from collections.abc import Mapping
+
+from prompt.budget import PromptReport, estimate_tokens
+from prompt.builder import (
+    PromptBuilder,
+    create_default_builder,
+    create_prefix_stable_builder,
+)
 from models.state import GameState
 from models.actions import ActionOption
 
-# Module-level builder instance (created once, reused)
-_default_builder: PromptBuilder | None = None
+# Builder factories by layout name; instances are created once and reused
+LAYOUTS = {
+    "default": create_default_builder,
+    "prefix-stable": create_prefix_stable_builder,
+}
+_builders: dict[str, PromptBuilder] = {}
 
 
 def build_prompt(
     state: GameState,
     memory: list[dict] | None = None,
-    inv: dict[str, int] | None = None,
+    inv: Mapping[str, int] | None = None,
     *,
     last_action: str | None = None,
     last_action_changed: bool | None = None,
     world_history: str = "",
     valid_actions: list[ActionOption] | None = None,
     goals: str = "",
+    layout: str = "default",
+    max_tokens: int | None = None,
+    plan_steps: int = 0,
 ) -> str:
     """
     Build prompt string from game state and valid actions.
@@ -42,31 +56,55 @@ def build_prompt(
     Args:
         state: Game state Pydantic model
         memory: Recent memory entries from AgentMemory
-        inv: DEPRECATED - inventory dict (unused, gets from state.get_inventory_dict())
+        inv: DEPRECATED - inventory dict (unused, sections read state.inventory_view)
         last_action: Action chosen on previous tick (for feedback)
         last_action_changed: Whether last action had an effect
         world_history: Recently-seen-but-gone entities summary
         valid_actions: List of ActionOption instances        goals: Formatted goals string from GoalManager
+        layout: Section order, a key of LAYOUTS ("prefix-stable" keeps
+            static text first so Ollama can reuse its KV cache)
+        max_tokens: Token budget; memory, world history and nearby are
+            shrunk first when the prompt would exceed it (see last_report)
+        plan_steps: Let the model add up to this many follow-up steps
+            (see plan_executor); 0 asks for a single action
 
     Returns:
         Complete prompt string ready for LLM
     """
-    global _default_builder
-
-    # Lazy-create the default builder on first call
-    if _default_builder is None:
-        _default_builder = create_default_builder()
+    # Lazy-create the builder for this layout on first call
+    builder = _builders.get(layout)
+    if builder is None:
+        builder = _builders[layout] = LAYOUTS[layout]()
 
     # Use empty list if valid_actions not provided (backward compat)
     valid_actions = valid_actions or []
 
-    return _default_builder.build(
-        state, valid_actions, goals, memory, last_action, last_action_changed, world_history
+    return builder.build(
+        state,
+        valid_actions,
+        goals,
+        memory,
+        last_action,
+        last_action_changed,
+        world_history,
+        max_tokens=max_tokens,
+        plan_steps=plan_steps,
     )
 
 
+def last_report(layout: str = "default") -> PromptReport | None:
+    """Per-section token counts of the last build_prompt() call with *layout*."""
+    builder = _builders.get(layout)
+    return builder.last_report if builder else None
+
+
 __all__ = [
     "build_prompt",
+    "last_report",
+    "estimate_tokens",
+    "PromptReport",
     "PromptBuilder",
     "create_default_builder",
+    "create_prefix_stable_builder",
+    "LAYOUTS",
 ]
@@ -0,0 +1,129 @@
+"""
+budget.py — Token estimation and budget fitting for the prompt builder.
+
+Section texts are counted with a token estimator (chars / 4 by default; pass
+a real tokenizer's count function for exact numbers). When a section is
+over its own max_tokens, or the whole prompt is over the builder's budget,
+sections are replaced by their next shorter() rendering, lowest Priority
+first and, within a priority, the largest first, until everything fits or
+only REQUIRED sections are left.
+"""
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from prompt.sections.base import Priority, PromptSection
+
+SEPARATOR = "\n\n"  # between rendered sections
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~4 characters per token for English and JSON."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+@dataclass
+class SectionTokens:
+    name: str
+    priority: Priority
+    tokens: int  # after shrinking
+    full_tokens: int  # before shrinking
+    steps: int = 0  # shorter() renderings taken
+
+    @property
+    def shrunk(self) -> bool:
+        return self.steps > 0
+
+
+@dataclass
+class PromptReport:
+    """Per-section token counts of one built prompt."""
+
+    budget: int | None
+    total: int = 0  # whole prompt, separators included
+    full_total: int = 0  # whole prompt before shrinking
+    sections: list[SectionTokens] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        """Still too long after shrinking everything that could be shrunk."""
+        return self.budget is not None and self.total > self.budget
+
+    def shrunk(self) -> list[SectionTokens]:
+        return [s for s in self.sections if s.shrunk]
+
+    def format(self) -> str:
+        """Table of sections and their token counts."""
+        lines = [f"{'section':<16} {'prio':<9} {'tokens':>7} {'full':>7}"]
+        for s in self.sections:
+            lines.append(
+                f"{s.name:<16} {s.priority.name:<9} {s.tokens:>7} {s.full_tokens:>7}"
+                + (f"  (shrunk x{s.steps})" if s.shrunk else "")
+            )
+        budget = f" / budget {self.budget}" if self.budget is not None else ""
+        lines.append(f"{'total':<26} {self.total:>7} {self.full_total:>7}{budget}")
+        return "\n".join(lines)
+
+
+def fit(
+    sections: list[PromptSection],
+    texts: list[str],
+    alternatives: list[Iterator[str]],
+    budget: int | None,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> tuple[list[str], PromptReport]:
+    """Shrink *texts* (one per section) to the per-section caps and *budget*.
+
+    *alternatives* holds each section's shorter() iterator. Returns the
+    final texts and the report.
+    """
+    texts = list(texts)
+    report = PromptReport(budget=budget)
+    for section, text in zip(sections, texts):
+        tokens = count_tokens(text)
+        report.sections.append(
+            SectionTokens(
+                name=type(section).__name__.removesuffix("Section"),
+                priority=section.priority,
+                tokens=tokens,
+                full_tokens=tokens,
+            )
+        )
+    exhausted = [False] * len(texts)
+
+    def shrink(i: int) -> bool:
+        text = next(alternatives[i], None)
+        if text is None:
+            exhausted[i] = True
+            return False
+        texts[i] = text
+        report.sections[i].tokens = count_tokens(text)
+        report.sections[i].steps += 1
+        return True
+
+    def total() -> int:
+        return count_tokens(SEPARATOR.join(t for t in texts if t))
+
+    report.full_total = total()
+    for i, section in enumerate(sections):
+        cap = section.max_tokens
+        while cap is not None and report.sections[i].tokens > cap and shrink(i):
+            pass
+
+    report.total = total()
+    while budget is not None and report.total > budget:
+        candidates = [
+            i
+            for i, s in enumerate(report.sections)
+            if s.tokens and not exhausted[i] and s.priority < Priority.REQUIRED
+        ]
+        if not candidates:
+            break
+        i = min(
+            candidates,
+            key=lambda i: (report.sections[i].priority, -report.sections[i].tokens),
+        )
+        if shrink(i):
+            report.total = total()
+    return texts, report
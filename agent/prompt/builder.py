@@ -2,8 +2,11 @@
 builder.py — Prompt builder orchestrating all sections.
 """
 
+from collections.abc import Callable
+
 from models.state import GameState
 from models.actions import ActionOption
+from prompt.budget import SEPARATOR, PromptReport, estimate_tokens, fit
 from prompt.sections.base import PromptSection
 from prompt.sections.context import PromptContext
 
@@ -11,8 +14,14 @@ from prompt.sections.context import PromptContext
 class PromptBuilder:
     """Orchestrates prompt sections and builds final prompt string."""
 
-    def __init__(self, sections: list[PromptSection]):
+    def __init__(
+        self,
+        sections: list[PromptSection],
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ):
         self.sections = sections
+        self.count_tokens = count_tokens
+        self.last_report: PromptReport | None = None  # token counts of the last build
 
     def build(
         self,
@@ -23,6 +32,8 @@ class PromptBuilder:
         last_action: str | None = None,
         last_action_changed: bool | None = None,
         world_history: str = "",
+        max_tokens: int | None = None,
+        plan_steps: int = 0,
     ) -> str:
         """
        Build prompt by rendering all sections with shared context.
@@ -35,6 +46,9 @@ class PromptBuilder:
             last_action: Action chosen on previous tick (for feedback)
             last_action_changed: Whether last action had an effect
             world_history: Recently-seen-but-gone entities summary
+            max_tokens: Prompt budget; lower-priority sections are shrunk
+                until the estimate fits (see prompt.budget)
+            plan_steps: Follow-up steps the model may add (0 = single action)
 
         Returns:
             Final prompt string with sections joined by double newlines
@@ -48,17 +62,21 @@ class PromptBuilder:
             last_action=last_action,
             last_action_changed=last_action_changed,
             world_history=world_history,
+            plan_steps=plan_steps,
         )
 
-        # Render all sections and filter empty ones
-        rendered = []
-        for section in self.sections:
-            text = section.format(ctx)
-            if text:  # Skip empty sections
-                rendered.append(text)
+        texts = [section.format(ctx) for section in self.sections]
+        # Shrink to the section caps and max_tokens; shorter() runs lazily
+        texts, self.last_report = fit(
+            self.sections,
+            texts,
+            [section.shorter(ctx) for section in self.sections],
+            max_tokens,
+            self.count_tokens,
+        )
 
-        # Join sections with double newlines
-        return "\n\n".join(rendered)
+        # Join non-empty sections with double newlines
+        return SEPARATOR.join(text for text in texts if text)
 
 
 def create_default_builder() -> PromptBuilder:
@@ -75,6 +93,7 @@ def create_default_builder() -> PromptBuilder:
     from prompt.sections.world_history import WorldHistorySection
     from prompt.sections.last_action import LastActionSection
     from prompt.sections.actions import ValidActionsSection
+    from prompt.sections.plan import PlanSection
 
     sections = [
         InstructionsSection(),
@@ -89,6 +108,29 @@ def create_default_builder() -> PromptBuilder:
         WorldHistorySection(),
         LastActionSection(),
         ValidActionsSection(),
+        PlanSection(),
     ]
 
     return PromptBuilder(sections)
+
+
+def create_prefix_stable_builder() -> PromptBuilder:
+    """Default sections reordered so consecutive prompts share a long prefix.
+
+    Sections are sorted by Stability (static, then slow, then volatile),
+    keeping the default order within each group, and the response-format
+    text is split out of ValidActionsSection into the static head. With the
+    model kept loaded (keep_alive), Ollama only prefills what follows the
+    first byte that differs from the previous prompt.
+    """
+    from prompt.sections.actions import ResponseFormatSection, ValidActionsSection
+
+    sections = [
+        ValidActionsSection(show_instructions=False)
+        if isinstance(section, ValidActionsSection)
+        else section
+        for section in create_default_builder().sections
+    ]
+    sections.insert(1, ResponseFormatSection())
+    sections.sort(key=lambda section: section.stability)  # stable sort
+    return PromptBuilder(sections)
@@ -4,21 +4,40 @@ actions.py — Valid actions section.
 
 from collections import defaultdict
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import Priority, PromptSection, Stability
 from prompt.sections.context import PromptContext
 
+RESPONSE_FORMAT = """Reply ONLY with JSON — no extra text, no markdown, no explanation.
+Each action shows "targets": [...]. Pick ONE value from the targets array.
+Format: {"action":"action_name","target":"chosen_target","reason":"why"}"""
+
+
+class ResponseFormatSection(PromptSection):
+    """Renders the JSON reply instructions on their own.
+
+    Used by the prefix-stable layout, which moves this static text ahead of
+    the volatile sections and renders ValidActionsSection without it.
+    """
+
+    stability = Stability.STATIC
+    priority = Priority.REQUIRED
+
+    def render(self, ctx: PromptContext) -> str:
+        return RESPONSE_FORMAT
+
 
 class ValidActionsSection(PromptSection):
     """Renders valid actions list with JSON format instructions."""
 
-    def __init__(self, instructions: str | None = None):
+    priority = Priority.REQUIRED
+
+    def __init__(self, instructions: str | None = None, show_instructions: bool = True):
         super().__init__()
         self.instructions = instructions or self._default_instructions()
+        self.show_instructions = show_instructions
 
     def _default_instructions(self) -> str:
-        return """Reply ONLY with JSON — no extra text, no markdown, no explanation.
-Each action shows "targets": [...]. Pick ONE value from the targets array.
-Format: {"action":"action_name","target":"chosen_target","reason":"why"}"""
+        return RESPONSE_FORMAT
 
     def render(self, ctx: PromptContext) -> str:
         valid_actions = ctx.current_turn_actions
@@ -49,9 +68,10 @@ Format: {"action":"action_name","target":"chosen_target","reason":"why"}"""
 
             actions_text = "\n".join(action_lines)
 
-        return f"""YOUR ONLY VALID CHOICES — pick exactly one action+target combination:
+        choices = f"""YOUR ONLY VALID CHOICES — pick exactly one action+target combination:
 [VALID_ACTIONS]
 {actions_text}
-[/VALID_ACTIONS]
-
-{self.instructions}"""
+[/VALID_ACTIONS]"""
+        if not self.show_instructions:
+            return choices
+        return f"{choices}\n\n{self.instructions}"
@@ -5,13 +5,40 @@ Each section is responsible for rendering one part of the prompt.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from enum import IntEnum
 
 from prompt.sections.context import PromptContext
 
 
+class Stability(IntEnum):
+    """How often a section's rendered text changes between ticks.
+
+    The prefix-stable layout orders sections by this, so the leading bytes
+    of consecutive prompts match and the model's KV cache can be reused.
+    """
+
+    STATIC = 0  # identical every tick (rules, response format)
+    SLOW = 1  # changes with inventory, goals or phase
+    VOLATILE = 2  # changes most ticks (vitals, positions, memory)
+
+
+class Priority(IntEnum):
+    """Which sections a token budget shrinks first (lowest first)."""
+
+    LOW = 0  # background the model can do without (memory, history, nearby)
+    NORMAL = 1
+    HIGH = 2  # vitals, threats, goals
+    REQUIRED = 3  # never shrunk: rules, response format, valid actions
+
+
 class PromptSection(ABC):
     """Base class for prompt sections following Template Method pattern."""
 
+    stability: Stability = Stability.VOLATILE
+    priority: Priority = Priority.NORMAL
+    max_tokens: int | None = None  # per-section cap, applied before the prompt budget
+
     def __init__(self, enabled: bool = True):
         """Initialize section with optional enable/disable flag."""
         self.enabled = enabled
@@ -42,3 +69,14 @@ class PromptSection(ABC):
         if not self.should_render(ctx):
             return ""
         return self.render(ctx)
+
+    def shorter(self, ctx: PromptContext) -> Iterator[str]:
+        """
+        Successively shorter renderings, used while the prompt is over budget.
+
+        The default drops the section outright; sections with a list to cut
+        (memory, nearby) yield trimmed versions first. REQUIRED sections
+        yield nothing.
+        """
+        if self.priority < Priority.REQUIRED:
+            yield ""
@@ -23,3 +23,6 @@ class PromptContext(BaseModel):
     world_history: str = Field(
         default="", description="Recently seen entities now out of view"
     )
+    plan_steps: int = Field(
+        default=0, description="Follow-up steps the model may add (0 = no plans)"
+    )
@@ -2,13 +2,16 @@
 goals.py — Goals section.
 """
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import Priority, PromptSection, Stability
 from prompt.sections.context import PromptContext
 
 
 class GoalsSection(PromptSection):
     """Renders long-term and short-term goals."""
 
+    stability = Stability.SLOW
+    priority = Priority.HIGH
+
     def should_render(self, ctx: PromptContext) -> bool:
         return super().should_render(ctx) and bool(ctx.goals)
 
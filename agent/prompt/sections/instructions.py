@@ -2,13 +2,16 @@
 instructions.py — System instructions section.
 """
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import Priority, PromptSection, Stability
 from prompt.sections.context import PromptContext
 
 
 class InstructionsSection(PromptSection):
     """Renders system rules and instructions."""
 
+    stability = Stability.STATIC
+    priority = Priority.REQUIRED
+
     def __init__(self, rules: str | None = None):
         super().__init__()
         self.rules = rules or self._default_rules()
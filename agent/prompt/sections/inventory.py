@@ -2,15 +2,17 @@
 inventory.py — Inventory section.
 """
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import PromptSection, Stability
 from prompt.sections.context import PromptContext
 
 
 class InventorySection(PromptSection):
     """Renders current inventory items."""
 
+    stability = Stability.SLOW
+
     def render(self, ctx: PromptContext) -> str:
-        inv = ctx.state.get_inventory_dict()
+        inv = ctx.state.inventory_view
 
         inv_line = (
             ", ".join(
@@ -2,19 +2,34 @@
 memory.py — Agent memory section.
 """
 
-from prompt.sections.base import PromptSection
+from collections.abc import Iterator
+
+from prompt.sections.base import Priority, PromptSection
 from prompt.sections.context import PromptContext
 
 
 class MemorySection(PromptSection):
     """Renders recent memory with deduplication."""
 
+    priority = Priority.LOW
+
     def __init__(self, max_entries: int = 8, lookahead: int = 12):
         super().__init__()
         self.max_entries = max_entries
         self.lookahead = lookahead
 
     def render(self, ctx: PromptContext) -> str:
+        return self._render(ctx, self.max_entries)
+
+    def shorter(self, ctx: PromptContext) -> Iterator[str]:
+        """Half as many entries each step, then no section at all."""
+        n = self.max_entries // 2
+        while n > 0 and ctx.memory:
+            yield self._render(ctx, n)
+            n //= 2
+        yield ""
+
+    def _render(self, ctx: PromptContext, max_entries: int) -> str:
         memory = ctx.memory
 
         if not memory:
@@ -33,7 +48,7 @@ class MemorySection(PromptSection):
 
         # Show most recent entries
         lines = []
-        for entry in filtered[-self.max_entries :]:
+        for entry in filtered[-max_entries:]:
             source = entry.get("source", "event")
             text = entry.get("text", "")
             lines.append(f"  - [{source}] {text}")
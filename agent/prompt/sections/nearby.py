@@ -2,24 +2,39 @@
 nearby.py — Nearby entities section.
 """
 
-from prompt.sections.base import PromptSection
+from collections.abc import Iterator
+
+from prompt.sections.base import Priority, PromptSection
 from prompt.sections.context import PromptContext
 
 
 class NearbySection(PromptSection):
     """Renders nearby entities list."""
 
+    priority = Priority.LOW
+
     def __init__(self, max_entities: int = 5):
         super().__init__()
         self.max_entities = max_entities
 
     def render(self, ctx: PromptContext) -> str:
+        return self._render(ctx, self.max_entities)
+
+    def shorter(self, ctx: PromptContext) -> Iterator[str]:
+        """Half as many (nearest-first) entities each step, then no section."""
+        n = min(self.max_entities, len(ctx.state.nearby_entities)) // 2
+        while n > 0:
+            yield self._render(ctx, n)
+            n //= 2
+        yield ""
+
+    def _render(self, ctx: PromptContext, max_entities: int) -> str:
         state = ctx.state
 
         nearby_lines = (
             "\n".join(
                 f"  - {e.name} ({e.type}) - {e.distance}m"
-                for e in state.nearby_entities[: self.max_entities]
+                for e in state.nearby_entities[:max_entities]
             )
             or "  (none)"
         )
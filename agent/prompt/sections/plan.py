@@ -0,0 +1,20 @@
+"""
+plan.py — Optional multi-step plan instructions.
+"""
+
+from prompt.sections.base import PromptSection, Stability
+from prompt.sections.context import PromptContext
+
+
+class PlanSection(PromptSection):
+    """Invites a short plan of follow-up steps when ctx.plan_steps > 0."""
+
+    stability = Stability.STATIC
+
+    def should_render(self, ctx: PromptContext) -> bool:
+        return super().should_render(ctx) and ctx.plan_steps > 0
+
+    def render(self, ctx: PromptContext) -> str:
+        return f"""If the next moves are obvious, you may add up to {ctx.plan_steps} follow-up steps, in order:
+{{"action":"...","target":"...","reason":"...","then":[{{"action":"pick_up_item","target":"cutgrass"}},{{"action":"craft_item","target":"torch"}}]}}
+Steps run one per turn without asking you again, until one fails or danger appears."""
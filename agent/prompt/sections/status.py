@@ -2,7 +2,7 @@
 status.py — Player status section (vitals, day, weather).
 """
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import Priority, PromptSection
 from prompt.sections.context import PromptContext
 
 CRITICAL_VITALS_THRESHOLD = 50
@@ -21,6 +21,8 @@ def _stat_label(value, max_value) -> str:
 class StatusSection(PromptSection):
     """Renders player vitals, day, phase, season, weather."""
 
+    priority = Priority.HIGH
+
     def render(self, ctx: PromptContext) -> str:
         state = ctx.state
 
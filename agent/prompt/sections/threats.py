@@ -2,13 +2,15 @@
 threats.py — Threats warning section.
 """
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import Priority, PromptSection
 from prompt.sections.context import PromptContext
 
 
 class ThreatsSection(PromptSection):
     """Renders active threats."""
 
+    priority = Priority.HIGH
+
     def should_render(self, ctx: PromptContext) -> bool:
         return super().should_render(ctx) and len(ctx.state.threats) > 0
 
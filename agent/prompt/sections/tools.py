@@ -2,7 +2,7 @@
 tools.py — Tool prerequisites and craftability section.
 """
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import PromptSection, Stability
 from prompt.sections.context import PromptContext
 
 # Crafting recipes
@@ -17,8 +17,10 @@ RECIPES: dict[str, dict[str, int]] = {
 class ToolsSection(PromptSection):
     """Renders tool status and craftability info."""
 
+    stability = Stability.SLOW
+
     def render(self, ctx: PromptContext) -> str:
-        inv = ctx.state.get_inventory_dict()
+        inv = ctx.state.inventory_view  # alias-aware: "twig" finds "twigs"
 
         lines = []
 
@@ -2,13 +2,15 @@
 world_history.py — Recently seen entities section.
 """
 
-from prompt.sections.base import PromptSection
+from prompt.sections.base import Priority, PromptSection
 from prompt.sections.context import PromptContext
 
 
 class WorldHistorySection(PromptSection):
     """Renders recently seen but now out-of-view entities."""
 
+    priority = Priority.LOW
+
     def should_render(self, ctx: PromptContext) -> bool:
         return super().should_render(ctx) and bool(ctx.world_history)
 
@@ -0,0 +1,190 @@
+"""
+reflexes.py — Fast reflex rules and the arbitration between reflexes and the LLM.
+
+Two loops write actions:
+
+    reflex        ReflexLoop polls the state file every ~0.25s on its own
+                  thread and answers threats, critical health and darkness
+                  with a hardcoded action right away
+    deliberation  DSAIAgent.decide(): overrides, planner, LLM (seconds)
+
+ActionArbiter owns the ActionWriter and decides who gets to write:
+
+    1. A reflex action is always written at once.
+    2. A deliberation action is dropped if a reflex fired after the state it
+       was based on was read: the LLM answered a situation that no longer
+       holds (the spider showed up mid-inference).
+    3. A reflex repeats the same action at most every ``repeat_after``
+       seconds, so a lingering threat does not flood the writer.
+    4. A written reflex calls ``on_reflex``: DSAIAgent uses it to cancel
+       the LLM call in flight, whose answer rule 2 would drop anyway.
+
+The rules in reflex_action() are the same ones DSAIAgent applies at the top
+of every tick (_emergency_override), so both loops agree on what to do.
+"""
+
+import threading
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from action_specs import ACTION_SPECS, has_prereqs
+from action_writer import ActionWriter
+from clock import SYSTEM_CLOCK, Clock
+from goal_manager import _FIRE_PREFABS, _require_field
+from models import GameState
+from state_reader import StateReader
+
+_TORCH = "craft_item:torch"
+
+
+def reflex_action(state: GameState) -> dict | None:
+    """The hardcoded action for a critical situation in *state*, or None.
+
+    Raises StateFieldError if health is missing.
+    """
+    health = _require_field(state, "health", float)
+    threats = state.threats or []  # None → no threats (safe)
+
+    if health < 20:
+        return {"action": "eat_food", "reason": "Health critically low"}
+
+    if threats:
+        t = threats[0]
+        tname = (t.name or "unknown").lower()
+        tdist = t.distance or "?"
+        return {
+            "action": "run_from_enemy",
+            "reason": f"Hostile {tname} at {tdist}m",
+        }
+
+    return None
+
+
+def darkness_action(state: GameState) -> dict | None:
+    """Craft a torch at night with no light around, if the materials are there."""
+    if (state.phase or "").lower() != "night":
+        return None
+    if any(e.name in _FIRE_PREFABS for e in state.nearby_entities or []):
+        return None
+    inv = state.inventory_view
+    if inv.get("torch", 0) or not has_prereqs(inv, ACTION_SPECS[_TORCH].requires):
+        return None
+    return {"action": _TORCH, "reason": "Darkness — light a torch now"}
+
+
+@dataclass
+class ArbiterStats:
+    reflexes: Counter = field(default_factory=Counter)  # written, by action
+    repeats_skipped: int = 0  # same reflex again within repeat_after
+    deliberations: int = 0  # written
+    superseded: int = 0  # dropped: a reflex fired after their state was read
+
+
+class ActionArbiter:
+    """Serializes reflex and deliberation writes to one ActionWriter."""
+
+    def __init__(
+        self,
+        writer: ActionWriter,
+        repeat_after: float = 2.0,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        self.writer = writer
+        self.repeat_after = repeat_after
+        self.clock = clock
+        self.stats = ArbiterStats()
+        self._lock = threading.Lock()
+        self._last_reflex: dict | None = None
+        self._last_reflex_at = float("-inf")
+        self.on_reflex: Callable[[dict], None] | None = None  # after each write
+
+    def reflex(self, action: dict) -> bool:
+        """Write *action* now unless it repeats the last reflex too soon."""
+        with self._lock:
+            now = self.clock.time()
+            if (
+                self._last_reflex is not None
+                and action["action"] == self._last_reflex["action"]
+                and now - self._last_reflex_at < self.repeat_after
+            ):
+                self.stats.repeats_skipped += 1
+                return False
+            self._last_reflex = action
+            self._last_reflex_at = now
+            self.stats.reflexes[action["action"]] += 1
+            self.writer.write(action)
+            print(f"[ReflexLoop] {action['action']}: {action['reason']}")
+        if self.on_reflex is not None:
+            self.on_reflex(action)
+        return True
+
+    def deliberate(self, action: dict, read_at: float) -> bool:
+        """Write *action*, decided on a state read at *read_at*, unless superseded."""
+        with self._lock:
+            if self._last_reflex_at > read_at:
+                self.stats.superseded += 1
+                print(
+                    f"[ActionArbiter] Dropping {action['action']}: reflex "
+                    f"{self._last_reflex['action']} fired after its state was read"
+                )
+                return False
+            self.stats.deliberations += 1
+            self.writer.write(action)
+            return True
+
+
+class ReflexLoop:
+    """Background thread applying reflex rules to every new snapshot."""
+
+    def __init__(
+        self,
+        state_file,
+        arbiter: ActionArbiter,
+        interval: float = 0.25,
+        darkness: bool = True,
+    ):
+        """
+        Args:
+            state_file: The exporter's game_state.json (read with a private
+                        StateReader; the agent's change tracking is untouched).
+            interval:   Seconds between polls.
+            darkness:   Also craft a torch at night when nothing gives light.
+        """
+        self.reader = StateReader(state_file)
+        self.arbiter = arbiter
+        self.interval = interval
+        self.darkness = darkness
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "ReflexLoop":
+        self._thread = threading.Thread(target=self._run, name="reflex", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def check(self) -> dict | None:
+        """One poll: the reflex action written for a new snapshot, if any."""
+        if not self.reader.is_modified():
+            return None
+        state = self.reader.read()
+        if state is None or state.health <= 0:
+            return None
+        try:
+            action = reflex_action(state)
+        except ValueError:  # StateFieldError: the agent reports it
+            return None
+        if action is None and self.darkness:
+            action = darkness_action(state)
+        if action is not None and self.arbiter.reflex(action):
+            return action
+        return None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
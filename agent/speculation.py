@@ -0,0 +1,209 @@
+"""
+speculation.py — Start the next LLM call before the next state arrives.
+
+Between emitting an action and reading the next snapshot the model sits
+idle, yet the next state is often predictable: after
+``pick_up_item twigs (3m)`` the twigs are in the inventory and gone from
+the ground. With speculation on, DSAIAgent applies the expected effect of
+each emitted action to the current state (predict_state), builds the
+prompt for the predicted state and hands it to a background worker. When
+the real next state arrives:
+
+    hit     its situation key matches the prediction's: the speculative
+            answer is used (waiting for it if it is still running),
+            retargeted to the real state's options
+    miss    the key differs: the speculative call is cancelled and the
+            normal path runs
+    stale   the key matches but the chosen action/target is not offered
+            in the real state (the key only keeps target base names):
+            the normal path runs
+    late    the key matches but the call outlives the tick's deadline:
+            DSAIAgent adopts it as its pending late call instead of
+            starting the same prompt again
+
+Speculative calls go through their own client, so they never race the
+decision path on a connection, last_timing or metrics.
+
+Effects come from ACTION_SPECS (craft_item consumes ``requires`` and adds
+``provides``, chop_tree / mine_rock add ``provides``) and from the target
+itself (pick_up_item and gather_resource add one of it; a picked-up item
+also leaves nearby_entities). Anything else (explore, fleeing, fallbacks)
+is not predicted.
+
+The situation key is DecisionCache's decision_key plus the goals, but
+with inventory item names instead of counts: how many logs a tree drops
+is not known in advance.
+"""
+
+import time
+from dataclasses import dataclass
+
+from action_specs import ACTION_SPECS, canonical_prefab
+from decision_cache import decision_key, reuse_answer, target_base
+from inference_backend import InferenceBackend
+from inference_worker import InferenceWorker
+from models import ActionOption, GameState
+
+# Actions whose effect on inventory (and the ground) can be predicted
+PREDICTABLE_ACTIONS = frozenset(
+    {"pick_up_item", "gather_resource", "craft_item", "chop_tree", "mine_rock"}
+)
+
+
+def predict_state(state: GameState, action: dict) -> GameState | None:
+    """*state* after *action* succeeds, or None if its effect is not predictable.
+
+    Builds a new GameState (snapshots are immutable, see inventory_view);
+    the per-export logs are left empty.
+    """
+    name, base = action["action"], target_base(action.get("target"))
+    if name not in PREDICTABLE_ACTIONS:
+        return None
+    counts = dict(state.inventory_view)
+    entities = list(state.nearby_entities)
+    if name in ("pick_up_item", "gather_resource"):
+        if not base or base.startswith("find "):
+            return None  # "find something to harvest": nothing specific
+        item = canonical_prefab(base)
+        counts[item] = counts.get(item, 0) + 1
+        if name == "pick_up_item":
+            nearest = min(
+                (e for e in entities if e.name == base),
+                key=lambda e: e.distance,
+                default=None,
+            )
+            if nearest is not None:
+                entities.remove(nearest)
+    else:
+        spec = ACTION_SPECS.get(f"{name}:{base}" if base else name)
+        if spec is None:
+            return None
+        for item, needed in spec.requires.items():
+            if name == "craft_item":  # tools are kept, ingredients consumed
+                counts[item] = counts.get(item, 0) - needed
+        for item in spec.provides:
+            counts[item] = counts.get(item, 0) + 1
+
+    data = state.model_dump()
+    data.update(
+        inventory=[
+            f"{item} x{count}" if count > 1 else item
+            for item, count in counts.items()
+            if count > 0
+        ],
+        nearby_entities=[e.model_dump() for e in entities],
+        speech_log=[],
+        action_log=[],
+        memory_log=[],
+    )
+    return GameState.model_validate(data)
+
+
+def situation_key(
+    state: GameState,
+    options: list[ActionOption],
+    goals: str,
+    vital_quantum: float = 10.0,
+) -> tuple:
+    """What a prediction must get right for its answer to be reused."""
+    return (
+        decision_key(state, options, vital_quantum, item_counts=False),
+        goals,
+    )
+
+
+@dataclass
+class SpeculationStats:
+    started: int = 0  # speculative calls submitted
+    unpredictable: int = 0  # emitted actions with no predictable effect
+    hits: int = 0  # real state matched, speculative answer used
+    misses: int = 0  # real state differed, call cancelled
+    late: int = 0  # matched, but not answered within the deadline (left running)
+    stale: int = 0  # matched, but the answer is not offered in the real state
+    saved: float = 0.0  # summed seconds of inference done before it was needed
+
+    @property
+    def hit_rate(self) -> float:
+        checked = self.hits + self.misses + self.late + self.stale
+        return self.hits / checked if checked else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.started} started, {self.hits} hits / "
+            f"{self.hits + self.misses + self.late + self.stale} checked "
+            f"({self.hit_rate:.0%}), {self.late} late, {self.stale} stale, "
+            f"{self.unpredictable} unpredictable, "
+            f"{self.saved:.1f}s latency saved"
+        )
+
+
+class Speculator:
+    """One speculative LLM call at a time, keyed by its predicted situation."""
+
+    def __init__(self, llm: InferenceBackend, vital_quantum: float = 10.0):
+        self.vital_quantum = vital_quantum
+        self.llm = llm
+        self.stats = SpeculationStats()
+        self.worker = InferenceWorker(llm)
+        self._key: tuple | None = None
+        self._prompt = ""
+        self._started = 0.0
+
+    @property
+    def pending(self) -> bool:
+        return self.worker.pending
+
+    def start(
+        self,
+        state: GameState,
+        options: list[ActionOption],
+        goals: str,
+        prompt: str,
+        schema: dict | None = None,
+    ) -> None:
+        """Submit *prompt*, built for the predicted *state*, in the background."""
+        self.cancel("superseded")
+        self._key = situation_key(state, options, goals, self.vital_quantum)
+        self._prompt = prompt
+        self._started = time.perf_counter()
+        self.worker.submit(prompt, schema=schema, options=options)
+        self.stats.started += 1
+
+    def take(
+        self,
+        state: GameState,
+        options: list[ActionOption],
+        goals: str,
+        timeout: float | None = None,
+    ) -> tuple[str, dict] | None:
+        """(prompt, action) of the speculative call if it applies to this situation.
+
+        The action is retargeted to *options*. Waits up to *timeout* seconds
+        (None: until it answers) on a matching key; a matching call still
+        running after that is left pending (see ``pending``) for the caller
+        to adopt or cancel. A mismatch cancels the call and returns None.
+        """
+        if not self.pending:
+            return None
+        if situation_key(state, options, goals, self.vital_quantum) != self._key:
+            self.stats.misses += 1
+            self.worker.cancel("mismatch")
+            return None
+        needed = time.perf_counter()
+        finished, raw = self.worker.wait(timeout)
+        if not finished:
+            self.stats.late += 1
+            return None
+        action = reuse_answer(raw, options)
+        if action is None:
+            self.stats.stale += 1
+            return None
+        self.stats.hits += 1
+        self.stats.saved += min(needed - self._started, self.worker.last_duration)
+        return self._prompt, action
+
+    def cancel(self, reason: str) -> None:
+        self.worker.cancel(reason)
+
+    def close(self) -> None:
+        self.worker.close()
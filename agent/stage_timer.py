@@ -0,0 +1,58 @@
+"""
+stage_timer.py — Cumulative per-stage wall time for the decision pipeline.
+
+DSAIAgent.decide() calls start() once per tick and lap("<stage>") after each
+stage; each lap charges the time since the previous mark to that stage.
+Costs two perf_counter() calls per stage, so it is always on.
+"""
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages: dict[str, StageStats] = {}
+        self._mark = time.perf_counter()
+
+    def start(self) -> None:
+        """Begin a tick: the next lap() measures from here."""
+        self._mark = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Charge the time since the last start()/lap() to *stage*."""
+        now = time.perf_counter()
+        elapsed = now - self._mark
+        self._mark = now
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        stats.calls += 1
+        stats.total += elapsed
+        stats.max = max(stats.max, elapsed)
+
+    def reset(self) -> None:
+        self.stages = {}
+
+    def report(self) -> str:
+        """Table of stages in pipeline order: calls, mean, max and total."""
+        lines = [
+            f"{'stage':<12} {'calls':>7} {'mean ms':>9} {'max ms':>9} {'total s':>9}"
+        ]
+        for name, s in self.stages.items():
+            lines.append(
+                f"{name:<12} {s.calls:>7} {s.mean * 1e3:>9.3f} "
+                f"{s.max * 1e3:>9.3f} {s.total:>9.3f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,86 @@
+"""
+state_delta.py — Delta-encoded state export: patch format and applier.
+
+With ``delta_export`` enabled the Lua exporter writes a full keyframe every
+``keyframe_every`` exports and, in between, a patch against that keyframe:
+
+    {
+      "set":   {"health": 97, "speech_log": [...]},  # changed top-level fields
+      "unset": ["equipped"],                         # fields that became nil
+      "entities_added":   [{"name": ..., "type": ..., "distance": ...}],
+      "entities_removed": [{...}]                    # exact keyframe entries
+    }
+
+Patches are cumulative against the keyframe (not the previous patch), so a
+reader that misses exports still reconstructs the current state exactly.
+The log buffers are always sent because they are per-export events.
+make_delta() mirrors the Lua encoder for tests and benchmarks.
+"""
+
+import json
+
+# Per-export event buffers: always included in a patch when present
+ALWAYS_SEND = frozenset({"speech_log", "action_log", "memory_log"})
+
+_MISSING = object()
+
+
+class DeltaError(ValueError):
+    """Raised when a patch does not apply to the given keyframe."""
+
+
+def apply_delta(keyframe: dict, patch: dict) -> dict:
+    """Return the full state document described by *patch* on *keyframe*."""
+    doc = dict(keyframe)
+    for key in patch.get("unset", []):
+        doc.pop(key, None)
+    doc.update(patch.get("set", {}))
+
+    if "nearby_entities" not in patch.get("set", {}) and (
+        "entities_added" in patch or "entities_removed" in patch
+    ):
+        entities = list(keyframe.get("nearby_entities", []))
+        for ent in patch.get("entities_removed", []):
+            try:
+                entities.remove(ent)
+            except ValueError as exc:
+                raise DeltaError(f"removed entity not in keyframe: {ent}") from exc
+        entities.extend(patch.get("entities_added", []))
+        # The exporter lists entities nearest-first; keep that order
+        entities.sort(key=lambda e: e.get("distance", 0))
+        doc["nearby_entities"] = entities
+    return doc
+
+
+def make_delta(keyframe: dict, current: dict) -> dict:
+    """Build the patch that turns *keyframe* into *current* (Lua encoder mirror)."""
+    set_fields = {
+        key: value
+        for key, value in current.items()
+        if key != "nearby_entities"
+        and (key in ALWAYS_SEND or keyframe.get(key, _MISSING) != value)
+    }
+    patch: dict = {
+        "set": set_fields,
+        "unset": [key for key in keyframe if key not in current],
+    }
+
+    remaining = list(keyframe.get("nearby_entities", []))
+    added = []
+    for ent in current.get("nearby_entities", []):
+        if ent in remaining:
+            remaining.remove(ent)
+        else:
+            added.append(ent)
+    # High churn (e.g. Wilson walking): resending the list is smaller
+    if len(added) + len(remaining) >= len(current.get("nearby_entities", [])):
+        set_fields["nearby_entities"] = current.get("nearby_entities", [])
+    else:
+        patch["entities_added"] = added
+        patch["entities_removed"] = remaining
+    return patch
+
+
+def encode(doc: dict) -> bytes:
+    """Compact JSON encoding matching the exporter's output."""
+    return json.dumps(doc, separators=(",", ":")).encode()
@@ -0,0 +1,149 @@
+"""
+state_fingerprint.py — Raw-byte and semantic fingerprints of game state snapshots.
+
+Two questions get asked every tick:
+  - did the exporter write different bytes?         (cheap, exact)
+  - did anything change that should trigger a new decision?  (semantic)
+
+The semantic key quantizes noisy fields (entity distances, time_of_day) and
+ignores the per-export log buffers, so jitter doesn't cost a full LLM call.
+Failed actions are the exception: the exporter clears its buffers after
+every export, so a snapshot whose only news is a failure would otherwise
+be skipped and the failure never seen (PlanExecutor relies on it).
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+
+from models import GameState
+
+
+@dataclass(frozen=True)
+class FingerprintConfig:
+    """Knobs controlling what counts as a decision-relevant change."""
+
+    distance_quantum: float = 4.0  # metres per distance bucket
+    time_buckets: int = 8  # time_of_day slices; 8 keeps the 0.75 dusk edge
+    # health/hunger/sanity bucket width; as coarse as DecisionCache's key,
+    # since hunger and health drain a little on every export
+    vital_quantum: float = 10.0
+    max_entities: int = 30  # only the entities the planner actually scans
+    ignored_fields: frozenset[str] = field(
+        default_factory=lambda: frozenset({"speech_log", "action_log", "memory_log"})
+    )
+
+
+@dataclass(frozen=True)
+class FingerprintChange:
+    """Result of comparing a snapshot against the previous one."""
+
+    bytes_changed: bool
+    decision_changed: bool
+
+
+def raw_fingerprint(data: bytes) -> str:
+    """Hash the raw state file bytes once (exact change detection)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _bucket(value: float | None, quantum: float) -> float | None:
+    """Quantize *value* into buckets of width *quantum* (<= 0 keeps it exact)."""
+    if value is None:
+        return None
+    if quantum <= 0:
+        return float(value)
+    return float(math.floor(float(value) / quantum))
+
+
+def semantic_key(state: GameState, config: FingerprintConfig | None = None) -> tuple:
+    """Return a hashable key of the decision-relevant parts of *state*."""
+    cfg = config or FingerprintConfig()
+    ignored = cfg.ignored_fields
+
+    entities = tuple(
+        sorted(
+            (e.name, e.type, _bucket(e.distance, cfg.distance_quantum))
+            for e in state.nearby_entities[: cfg.max_entities]
+        )
+    )
+    threats = tuple(
+        sorted(
+            (t.name, _bucket(t.distance, cfg.distance_quantum)) for t in state.threats
+        )
+    )
+    time_bucket = min(
+        int((state.time_of_day or 0.0) * cfg.time_buckets), cfg.time_buckets - 1
+    )
+
+    key: list = [
+        state.day,
+        state.phase,
+        state.season,
+        time_bucket,
+        state.is_raining,
+        _bucket(state.temperature, cfg.vital_quantum),
+        _bucket(state.health, cfg.vital_quantum),
+        _bucket(state.hunger, cfg.vital_quantum),
+        _bucket(state.sanity, cfg.vital_quantum),
+        tuple(sorted(state.inventory)),
+        state.equipped,
+        state.current_action,
+        state.action_target,
+        entities,
+        threats,
+    ]
+    # Log buffers are per-export events; include them only when asked to
+    if "speech_log" not in ignored:
+        key.append(tuple(state.speech_log))
+    if "action_log" not in ignored:
+        key.append(tuple((a.result, a.action, a.reason) for a in state.action_log))
+    else:
+        key.append(
+            tuple(
+                (a.result, a.action) for a in state.action_log if a.result != "success"
+            )
+        )
+    if "memory_log" not in ignored:
+        key.append(tuple((m.source, m.text) for m in state.memory_log))
+    return tuple(key)
+
+
+def semantic_fingerprint(
+    state: GameState, config: FingerprintConfig | None = None
+) -> str:
+    """Stable hex digest of semantic_key()."""
+    return hashlib.blake2b(
+        repr(semantic_key(state, config)).encode(), digest_size=16
+    ).hexdigest()
+
+
+class FingerprintEngine:
+    """Remembers the last raw + semantic fingerprint and reports what changed."""
+
+    def __init__(self, config: FingerprintConfig | None = None):
+        self.config = config or FingerprintConfig()
+        self._last_raw: str | None = None
+        self._last_semantic: str | None = None
+
+    def observe(self, state: GameState, raw: str | None = None) -> FingerprintChange:
+        """Compare *state* (and its raw-byte fingerprint, if known) to the last one.
+
+        When the raw bytes are identical the semantic key is not recomputed.
+        """
+        if raw is not None and raw == self._last_raw:
+            return FingerprintChange(bytes_changed=False, decision_changed=False)
+
+        semantic = semantic_fingerprint(state, self.config)
+        change = FingerprintChange(
+            bytes_changed=raw is None or raw != self._last_raw,
+            decision_changed=semantic != self._last_semantic,
+        )
+        self._last_raw = raw
+        self._last_semantic = semantic
+        return change
+
+    def reset(self) -> None:
+        """Forget the last snapshot so the next one always counts as changed."""
+        self._last_raw = None
+        self._last_semantic = None
@@ -0,0 +1,83 @@
+"""
+state_handoff.py — Versioned envelope for game_state.json (Lua writer → Python reader).
+
+The exporter writes ``<header>\\n<payload>`` to a temp file and renames it
+over game_state.json, so the reader sees either the old or the new file —
+never a half-written one. The header carries a monotonically increasing
+sequence number and the payload length so the reader can still detect a
+torn read (e.g. on filesystems where rename isn't atomic) and retry:
+
+    #DSLLM1 <seq> <payload_len>[ <kind>]\\n{...json...}
+
+<kind> is absent for a plain full snapshot, ``K`` for a full snapshot that
+later deltas are based on (keyframe), or ``D<base_seq>`` for a delta patch
+against keyframe <base_seq> (see state_delta).
+
+Files without the header are accepted as legacy whole-file JSON.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+MAGIC = b"#DSLLM1 "
+
+
+class TornReadError(ValueError):
+    """Raised when the bytes read do not form a complete envelope."""
+
+
+@dataclass(frozen=True)
+class HandoffEnvelope:
+    seq: int | None  # None for legacy files without a header
+    payload: bytes
+    keyframe: bool = False  # full snapshot that later deltas patch
+    base: int | None = None  # keyframe seq this delta applies to
+
+
+def pack(
+    payload: bytes, seq: int, keyframe: bool = False, base: int | None = None
+) -> bytes:
+    """Prefix *payload* with a handoff header."""
+    kind = f" D{base}" if base is not None else " K" if keyframe else ""
+    return MAGIC + f"{seq} {len(payload)}{kind}\n".encode() + payload
+
+
+def unpack(data: bytes) -> HandoffEnvelope:
+    """Split raw file bytes into header fields + payload.
+
+    Raises TornReadError if the header is malformed or the payload length
+    does not match (the writer was caught mid-write).
+    """
+    if not data.startswith(MAGIC):
+        return HandoffEnvelope(seq=None, payload=data)
+
+    newline = data.find(b"\n", len(MAGIC))
+    if newline == -1:
+        raise TornReadError("handoff header incomplete")
+    try:
+        seq_text, length_text, *kind = data[len(MAGIC) : newline].split()
+        seq, length = int(seq_text), int(length_text)
+        keyframe = kind == [b"K"]
+        base = int(kind[0][1:]) if kind and kind[0].startswith(b"D") else None
+    except ValueError as exc:
+        raise TornReadError(f"bad handoff header: {data[:newline]!r}") from exc
+
+    payload = data[newline + 1 :]
+    if len(payload) != length:
+        raise TornReadError(f"payload is {len(payload)} bytes, header says {length}")
+    return HandoffEnvelope(seq=seq, payload=payload, keyframe=keyframe, base=base)
+
+
+def write_atomic(
+    path: Path,
+    payload: bytes,
+    seq: int,
+    keyframe: bool = False,
+    base: int | None = None,
+) -> None:
+    """Python equivalent of the exporter's write: temp file + rename."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(pack(payload, seq, keyframe=keyframe, base=base))
+    os.replace(tmp, path)
@@ -2,45 +2,285 @@
 state_reader.py — Reads game_state.json and detects state changes / world resets.
 """
 
-import hashlib
+import bisect
 import json
+import os
+import time
+from dataclasses import dataclass
+from enum import Enum
+from operator import attrgetter
 from pathlib import Path
 
-from models import GameState
+from pydantic import TypeAdapter, ValidationError
+
+from models import GameState, NearbyEntity
+from state_delta import DeltaError, apply_delta, encode
+from state_fingerprint import (
+    FingerprintChange,
+    FingerprintConfig,
+    FingerprintEngine,
+    raw_fingerprint,
+)
+from state_handoff import HandoffEnvelope, TornReadError, unpack
+
+
+@dataclass
+class ReadStats:
+    """Counters for how StateReader polls were resolved."""
+
+    skipped: int = 0  # stat (or byte hash) matched the last parse — no work done
+    parsed: int = 0  # file was read and validated into a GameState
+    failed: int = 0  # file was read but could not be parsed
+    retried: int = 0  # torn/partial reads that were retried within the budget
+    deltas: int = 0  # snapshots rebuilt from a delta patch + keyframe
+
+
+class ParseMode(Enum):
+    """How raw state bytes are turned into a GameState.
+
+    Delta snapshots are rebuilt as documents first, so both modes validate
+    them the same way.
+    """
+
+    DICT = "dict"  # json.loads + GameState(**d) — the original path
+    JSON = "json"  # GameState.model_validate_json straight from bytes
+
+
+# Deltas re-validate only the fields a patch touches
+_FIELD_ADAPTERS = {
+    name: TypeAdapter(info.annotation) for name, info in GameState.model_fields.items()
+}
+_ENTITIES: TypeAdapter[list[NearbyEntity]] = TypeAdapter(list[NearbyEntity])
+_distance = attrgetter("distance")
+
+
+def entity_positions(state: GameState) -> dict[tuple, list[int]]:
+    """Indices of *state*'s nearby entities by (name, type, distance)."""
+    positions: dict[tuple, list[int]] = {}
+    for i, e in enumerate(state.nearby_entities):
+        positions.setdefault((e.name, e.type, e.distance), []).append(i)
+    return positions
+
+
+def patch_state(
+    keyframe: GameState, patch: dict, positions: dict[tuple, list[int]] | None = None
+) -> GameState:
+    """*keyframe* with a delta patch applied (see state_delta.apply_delta).
+
+    Untouched fields (including keyframe entities a patch keeps) are reused
+    as already validated; only set fields and added entities are validated.
+    *positions* is entity_positions(keyframe), computed once per keyframe.
+    Raises DeltaError if the patch unsets a required field or removes an
+    entity the keyframe does not have.
+    """
+    fields = {}
+    for key in patch.get("unset", []):
+        info = GameState.model_fields.get(key)
+        if info is None:
+            continue
+        if info.is_required():
+            raise DeltaError(f"required field unset: {key}")
+        fields[key] = info.get_default(call_default_factory=True)
+    changed = patch.get("set", {})
+    for key, value in changed.items():
+        if key in _FIELD_ADAPTERS:
+            fields[key] = _FIELD_ADAPTERS[key].validate_python(value)
+
+    if "nearby_entities" not in changed and (
+        "entities_added" in patch or "entities_removed" in patch
+    ):
+        entities = keyframe.nearby_entities
+        removed = patch.get("entities_removed")
+        if removed:
+            # Matched on plain tuples: model __eq__ would dominate the patch cost
+            if positions is None:
+                positions = entity_positions(keyframe)
+            drop: set[int] = set()
+            for ent in removed:
+                key = (ent.get("name"), ent.get("type"), ent.get("distance"))
+                free = [i for i in positions.get(key, ()) if i not in drop]
+                if not free:
+                    raise DeltaError(f"removed entity not in keyframe: {ent}")
+                drop.add(free[0])
+            entities = [e for i, e in enumerate(entities) if i not in drop]
+        else:
+            entities = list(entities)
+        # Keyframe entities are nearest-first already; insert the few new ones
+        for ent in _ENTITIES.validate_python(patch.get("entities_added", [])):
+            bisect.insort(entities, ent, key=_distance)
+        fields["nearby_entities"] = entities
+
+    state = keyframe.model_copy(update=fields)
+    # model_copy carries the keyframe's cached inventory_view along
+    state.__dict__.pop("inventory_view", None)
+    return state
+
+
+def keyframe_path(state_file: Path) -> Path:
+    """Where the exporter mirrors its latest keyframe next to *state_file*."""
+    return state_file.with_name(f"{state_file.stem}.keyframe{state_file.suffix}")
+
+
+def _is_torn_read(exc: Exception) -> bool:
+    """True for errors that a re-read moments later may not hit again."""
+    if isinstance(exc, (TornReadError, json.JSONDecodeError, FileNotFoundError)):
+        return True
+    if isinstance(exc, ValidationError):
+        return any(err["type"] == "json_invalid" for err in exc.errors())
+    return False
+
+
+def _stat_signature(st: os.stat_result) -> tuple[int, int, int]:
+    """Identity of a file version: (mtime_ns, size, inode)."""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
 
 
 class StateReader:
-    def __init__(self, state_file: Path):
+    def __init__(
+        self,
+        state_file: Path,
+        hash_bytes: bool = False,
+        fingerprint: FingerprintConfig | None = None,
+        mode: ParseMode = ParseMode.JSON,
+        retry_budget: float = 0.1,
+        retry_interval: float = 0.01,
+        keyframe_file: Path | None = None,
+    ):
+        """
+        Args:
+            state_file:   Path to game_state.json written by the Lua exporter.
+            hash_bytes:   When the stat signature changes, also compare a hash
+                          of the file bytes before declaring it modified. Catches
+                          rewrites with identical content (exporter idle) at the
+                          cost of one read, but still skips the JSON parse.
+            fingerprint:  What counts as a decision-relevant change (see
+                          state_fingerprint.FingerprintConfig).
+            mode:         Parse strategy (see ParseMode).
+            retry_budget:   Seconds to keep re-reading after a torn/partial read
+                            (bad handoff length, truncated JSON, the file caught
+                            mid-write by the exporter's Windows fallback).
+            retry_interval: Pause between those re-reads.
+            keyframe_file:  Where the exporter mirrors its latest keyframe when
+                            delta export is on (default:
+                            game_state.keyframe.json next to state_file).
+        """
         self.state_file = state_file
-        self._last_hash: str | None = None
+        self.hash_bytes = hash_bytes
+        self.mode = mode
+        self.retry_budget = retry_budget
+        self.retry_interval = retry_interval
+        self.last_seq: int | None = None  # handoff sequence of the last parse
+        self._payload: bytes | None = None  # see last_payload
+        self._delta: tuple[dict, dict] | None = None  # (keyframe doc, patch)
+        self.keyframe_file = keyframe_file or keyframe_path(state_file)
+        # (seq, document, state, entity_positions(state)) of the current keyframe
+        self._keyframe: tuple[int, dict, GameState, dict] | None = None
+        self.stats = ReadStats()
+        self.fingerprints = FingerprintEngine(fingerprint)
+        self.last_change = FingerprintChange(bytes_changed=True, decision_changed=True)
         self._last_day: int = -1
         self._last_health: float = 100.0
+        self._last_stat: tuple[int, int, int] | None = None
+        self._last_digest: str | None = None  # raw fingerprint of the last parse
+        # Bytes read by is_modified() in hash mode, reused by the next read()
+        self._pending: tuple[tuple[int, int, int], bytes] | None = None
 
-    def read(self) -> GameState | None:
-        """Read and return the current game state, or None on failure."""
-        if not self.state_file.exists():
-            print(f"[StateReader] State file not found: {self.state_file}")
-            return
+    @property
+    def last_payload(self) -> bytes | None:
+        """Full state document (JSON bytes) of the last parse.
+
+        A delta is only re-encoded into a full document when this is asked
+        for (by the trace recorder), not on every read.
+        """
+        if self._delta is not None:
+            keyframe, patch = self._delta
+            self._payload = encode(apply_delta(keyframe, patch))
+            self._delta = None
+        return self._payload
+
+    def is_modified(self) -> bool:
+        """Return False if the file is unchanged since the last successful read().
+
+        Only stats the file (plus one raw read in ``hash_bytes`` mode) — never
+        parses or validates. A missing file counts as modified so that read()
+        gets to report it.
+        """
         try:
-            with open(self.state_file, "r") as f:
-                state_dict = json.load(f)
-                
-                return GameState(**state_dict)
-
-        except json.JSONDecodeError as e:
-            print(f"[StateReader] Invalid JSON: {e}")
-            return None
-        except Exception as e:
-            print(f"[StateReader] Read error: {e}")
-            return None
+            sig = _stat_signature(os.stat(self.state_file))
+        except OSError:
+            return True
+
+        if sig == self._last_stat:
+            self.stats.skipped += 1
+            return False
+
+        if self.hash_bytes and self._last_digest is not None:
+            try:
+                data = self.state_file.read_bytes()
+            except OSError:
+                return True
+            try:
+                payload = unpack(data).payload
+            except TornReadError:
+                return True
+            if raw_fingerprint(payload) == self._last_digest:
+                self._last_stat = sig  # same content, new stat — remember it
+                self.stats.skipped += 1
+                return False
+            self._pending = (sig, data)
+
+        return True
+
+    def read(self) -> GameState | None:
+        """Read and return the current game state, or None on failure.
+
+        Torn reads (see state_handoff) are retried every ``retry_interval``
+        seconds until ``retry_budget`` is spent.
+        """
+        deadline = time.monotonic() + self.retry_budget
+        while True:
+            try:
+                sig, data = self._read_bytes()
+                envelope = unpack(data)
+                state = self._decode(envelope)
+                break
+            except Exception as e:
+                if _is_torn_read(e) and time.monotonic() < deadline:
+                    self.stats.retried += 1
+                    time.sleep(self.retry_interval)
+                    continue
+                if isinstance(e, FileNotFoundError):
+                    print(f"[StateReader] State file not found: {self.state_file}")
+                elif isinstance(e, json.JSONDecodeError):
+                    print(f"[StateReader] Invalid JSON: {e}")
+                else:
+                    print(f"[StateReader] Read error: {e}")
+                self.stats.failed += 1
+                return None
+
+        if envelope.seq is not None:
+            if self.last_seq is not None and envelope.seq < self.last_seq:
+                print(
+                    f"[StateReader] Sequence went back {self.last_seq} -> "
+                    f"{envelope.seq} (exporter restarted?)"
+                )
+            self.last_seq = envelope.seq
+        self._last_stat = sig
+        self._last_digest = raw_fingerprint(envelope.payload)
+        self.stats.parsed += 1
+        return state
 
     def has_changed(self, state: GameState) -> bool:
-        """Return True if state differs from the last seen snapshot."""
-        h = hashlib.md5(json.dumps(state, sort_keys=True).encode()).hexdigest()
-        if h != self._last_hash:
-            self._last_hash = h
-            return True
-        return False
+        """Return True if state differs from the last seen snapshot in a way
+        that matters for the next decision.
+
+        The raw bytes hashed in read() are reused, so byte-identical snapshots
+        short-circuit; otherwise only the semantic key is compared (distance and
+        time_of_day jitter, log buffers are ignored). The full result is kept
+        in ``last_change``.
+        """
+        self.last_change = self.fingerprints.observe(state, self._last_digest)
+        return self.last_change.decision_changed
 
     def is_world_reset(self, state: GameState) -> bool:
         """Return True if the day counter went back to 1 (new world)."""
@@ -59,3 +299,67 @@ class StateReader:
             print("[StateReader] Game over detected — Wilson died!")
         self._last_health = health
         return dead
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _decode(self, envelope: HandoffEnvelope) -> GameState:
+        """Build the GameState for a full snapshot, keyframe or delta patch."""
+        if envelope.keyframe:
+            doc = json.loads(envelope.payload)
+            state = self._parse_document(doc)
+            self._keyframe = (envelope.seq, doc, state, entity_positions(state))
+            self._payload, self._delta = envelope.payload, None
+            return state
+        if envelope.base is not None:
+            patch = json.loads(envelope.payload)
+            _, doc, keyframe, positions = self._keyframe_for(envelope.base)
+            state = patch_state(keyframe, patch, positions)
+            self.stats.deltas += 1
+            self._payload, self._delta = None, (doc, patch)
+            return state
+        self._payload, self._delta = envelope.payload, None
+        return self._parse(envelope.payload)
+
+    def _keyframe_for(self, base: int) -> tuple[int, dict, GameState, dict]:
+        """Return keyframe *base*, fetching it from keyframe_file if needed.
+
+        Raises TornReadError (retried by read()) when the mirrored keyframe
+        is not the one the delta was built against yet.
+        """
+        if self._keyframe is None or self._keyframe[0] != base:
+            envelope = unpack(self.keyframe_file.read_bytes())
+            if envelope.seq != base:
+                raise TornReadError(
+                    f"keyframe {base} not available (found {envelope.seq})"
+                )
+            doc = json.loads(envelope.payload)
+            state = self._parse_document(doc)
+            self._keyframe = (base, doc, state, entity_positions(state))
+        return self._keyframe
+
+    def _parse_document(self, doc: dict) -> GameState:
+        """Validate an already-decoded state document."""
+        if self.mode is ParseMode.DICT:
+            return GameState(**doc)
+        return GameState.model_validate(doc)
+
+    def _parse(self, data: bytes) -> GameState:
+        """Turn raw bytes into a GameState according to ``self.mode``."""
+        if self.mode is ParseMode.DICT:
+            return GameState(**json.loads(data))
+        return GameState.model_validate_json(data)
+
+    def _read_bytes(self) -> tuple[tuple[int, int, int], bytes]:
+        """Return (stat signature, raw bytes) for the current file version.
+
+        The signature comes from fstat on the open handle so it always
+        describes the bytes that were actually read.
+        """
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            return pending
+        with open(self.state_file, "rb") as f:
+            sig = _stat_signature(os.fstat(f.fileno()))
+            return sig, f.read()
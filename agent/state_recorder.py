@@ -0,0 +1,260 @@
+"""
+state_recorder.py — Compressed trace of every distinct state snapshot the agent saw.
+
+The trace is the input for offline replay, benchmarking and regression
+analysis. It is written as a sequence of independent gzip members
+("chunks") plus a JSONL index next to it:
+
+    session.trace.gz       gzip member per chunk; each member holds records
+                           ``{"t": <unix time>, "seq": <handoff seq>, "len": N}\\n<N payload bytes>\\n``
+    session.trace.gz.idx   one line per chunk:
+                           {"offset", "length", "records", "t0", "t1"}
+
+Because every chunk is a complete gzip member, ``gzip.open`` reads the whole
+file as one stream, and the index allows seeking straight to a time range.
+A crash can only lose the chunk that was being built.
+
+record() never blocks the tick: snapshots go into a bounded queue that a
+background thread drains, dedupes and compresses. If the queue is full the
+snapshot is dropped and counted rather than stalling the agent.
+"""
+
+import gzip
+import json
+import queue
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from clock import SYSTEM_CLOCK, Clock
+from state_fingerprint import raw_fingerprint
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    timestamp: float  # unix time when the agent read the snapshot
+    seq: int | None  # handoff sequence number (None for legacy files)
+    payload: bytes  # full state document as JSON bytes
+
+
+@dataclass(frozen=True)
+class TraceChunk:
+    offset: int  # byte offset of the gzip member in the trace file
+    length: int  # compressed size of the member
+    records: int
+    t0: float  # timestamp of the first record
+    t1: float  # timestamp of the last record
+
+
+@dataclass
+class RecorderStats:
+    recorded: int = 0  # records written to the trace
+    duplicates: int = 0  # identical to the previous snapshot — not written
+    dropped: int = 0  # queue full — not written
+    chunks: int = 0
+    bytes_in: int = 0  # uncompressed payload bytes written
+    bytes_out: int = 0  # compressed bytes written
+
+
+class StateRecorder:
+    def __init__(
+        self,
+        trace_file: Path,
+        chunk_records: int = 256,
+        chunk_bytes: int = 1 << 20,
+        flush_interval: float = 10.0,
+        max_pending: int = 64,
+        compresslevel: int = 6,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        """
+        Args:
+            trace_file:     Where to append chunks; the index goes to
+                            ``<trace_file>.idx``.
+            chunk_records:  Close a chunk after this many records...
+            chunk_bytes:    ...or this many uncompressed bytes...
+            flush_interval: ...or when its first record is this many seconds
+                            old, so a quiet session still reaches disk.
+            max_pending:    Bound on snapshots queued for the writer thread.
+            compresslevel:  gzip level for each chunk.
+            clock:          Source of record timestamps and chunk age (a
+                            VirtualClock when recording during a replay).
+        """
+        self.trace_file = trace_file
+        self.index_file = trace_file.with_name(trace_file.name + ".idx")
+        self.chunk_records = chunk_records
+        self.chunk_bytes = chunk_bytes
+        self.flush_interval = flush_interval
+        self.compresslevel = compresslevel
+        self.clock = clock
+        self.stats = RecorderStats()
+        self.trace_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._chunk: list[bytes] = []
+        self._chunk_size = 0
+        self._chunk_t0 = 0.0
+        self._chunk_t1 = 0.0
+        self._last_digest: str | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="StateRecorder", daemon=True
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Public interface
+    # ------------------------------------------------------------------
+
+    def record(
+        self, payload: bytes, seq: int | None = None, timestamp: float | None = None
+    ) -> None:
+        """Queue one snapshot for the trace. Never blocks."""
+        stamp = self.clock.time() if timestamp is None else timestamp
+        try:
+            self._queue.put_nowait((stamp, seq, payload))
+        except queue.Full:
+            self.stats.dropped += 1
+
+    def close(self) -> None:
+        """Flush everything queued and stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._chunk:
+                age = self.clock.time() - self._chunk_t0
+                timeout = max(0.0, self.flush_interval - age)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush()
+                continue
+            if item is _STOP:
+                self._flush()
+                return
+            self._add(*item)
+
+    def _add(self, stamp: float, seq: int | None, payload: bytes) -> None:
+        digest = raw_fingerprint(payload)
+        if digest == self._last_digest:
+            self.stats.duplicates += 1
+            return
+        self._last_digest = digest
+
+        header = json.dumps({"t": stamp, "seq": seq, "len": len(payload)})
+        if not self._chunk:
+            self._chunk_t0 = stamp
+        self._chunk_t1 = stamp
+        self._chunk.append(header.encode() + b"\n" + payload + b"\n")
+        self._chunk_size += len(payload)
+        self.stats.bytes_in += len(payload)
+
+        if (
+            len(self._chunk) >= self.chunk_records
+            or self._chunk_size >= self.chunk_bytes
+        ):
+            self._flush()
+
+    def _flush(self) -> None:
+        """Compress the current chunk as one gzip member and index it."""
+        if not self._chunk:
+            return
+        data = gzip.compress(b"".join(self._chunk), compresslevel=self.compresslevel)
+        try:
+            with open(self.trace_file, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+            entry = TraceChunk(
+                offset=offset,
+                length=len(data),
+                records=len(self._chunk),
+                t0=self._chunk_t0,
+                t1=self._chunk_t1,
+            )
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry.__dict__) + "\n")
+        except OSError as e:
+            print(f"[StateRecorder] Warning: Failed to write chunk: {e}")
+        else:
+            self.stats.recorded += len(self._chunk)
+            self.stats.chunks += 1
+            self.stats.bytes_out += len(data)
+        self._chunk = []
+        self._chunk_size = 0
+
+
+# ------------------------------------------------------------------
+# Reading traces
+# ------------------------------------------------------------------
+
+
+def read_index(trace_file: Path) -> list[TraceChunk]:
+    """Return the chunk index of *trace_file* (empty if it has none)."""
+    index_file = trace_file.with_name(trace_file.name + ".idx")
+    if not index_file.exists():
+        return []
+    chunks = []
+    with open(index_file, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                chunks.append(TraceChunk(**json.loads(line)))
+    return chunks
+
+
+def _parse_records(data: bytes) -> Iterator[TraceRecord]:
+    pos = 0
+    while pos < len(data):
+        newline = data.index(b"\n", pos)
+        header = json.loads(data[pos:newline])
+        start = newline + 1
+        end = start + header["len"]
+        yield TraceRecord(
+            timestamp=header["t"], seq=header["seq"], payload=data[start:end]
+        )
+        pos = end + 1
+
+
+def iter_trace(
+    trace_file: Path, start: float | None = None, end: float | None = None
+) -> Iterator[TraceRecord]:
+    """Yield the records of *trace_file* in order.
+
+    With an index, only chunks overlapping [start, end] are decompressed.
+    Without one, the file is read as a single multi-member gzip stream.
+    """
+    chunks = read_index(trace_file)
+    if chunks:
+        with open(trace_file, "rb") as f:
+            for chunk in chunks:
+                if start is not None and chunk.t1 < start:
+                    continue
+                if end is not None and chunk.t0 > end:
+                    break
+                f.seek(chunk.offset)
+                data = gzip.decompress(f.read(chunk.length))
+                for rec in _parse_records(data):
+                    if (start is None or rec.timestamp >= start) and (
+                        end is None or rec.timestamp <= end
+                    ):
+                        yield rec
+        return
+
+    with gzip.open(trace_file, "rb") as f:
+        data = f.read()
+    for rec in _parse_records(data):
+        if (start is None or rec.timestamp >= start) and (
+            end is None or rec.timestamp <= end
+        ):
+            yield rec
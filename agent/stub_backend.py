@@ -0,0 +1,130 @@
+"""
+stub_backend.py — In-process deterministic inference backend.
+
+Answers instantly from a policy function instead of a model: by default the
+first action+target offered in the prompt's [VALID_ACTIONS] block. Used by
+replay and the benchmarks, and selectable with ``--backend stub`` to run the
+whole agent loop without a server.
+
+Token counts are estimated at ~4 characters per token so the metrics line
+up with the HTTP adapters.
+"""
+
+import json
+import time
+from collections.abc import Callable
+
+from inference_backend import CallTiming, InferenceMetrics
+from models import ActionOption
+from preemption import CancelToken
+
+_CHARS_PER_TOKEN = 4
+_NOTHING_OFFERED = '{"action":"explore","target":"N","reason":"stub: nothing offered"}'
+
+
+def offered_options(prompt: str) -> list[ActionOption]:
+    """The ActionOptions listed in a prompt's [VALID_ACTIONS] block, in order."""
+    block = prompt.partition("[VALID_ACTIONS]")[2].partition("[/VALID_ACTIONS]")[0]
+    options = []
+    for line in block.splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        for target in entry.get("targets") or [None]:
+            options.append(ActionOption(action=entry["action"], target=target))
+    return options
+
+
+def first_valid_action(prompt: str) -> str:
+    """Deterministic policy: the first action+target offered in [VALID_ACTIONS]."""
+    options = offered_options(prompt)
+    if not options:
+        return _NOTHING_OFFERED
+    return json.dumps(
+        {"action": options[0].action, "target": options[0].target, "reason": "stub"}
+    )
+
+
+def planning_policy(steps: int) -> Callable[[str], str]:
+    """first_valid_action plus the next *steps* offered options as a "then" plan."""
+
+    def policy(prompt: str) -> str:
+        options = offered_options(prompt)
+        if not options:
+            return _NOTHING_OFFERED
+        first, *rest = options
+        return json.dumps(
+            {
+                "action": first.action,
+                "target": first.target,
+                "reason": "stub plan",
+                "then": [
+                    {"action": o.action, "target": o.target} for o in rest[:steps]
+                ],
+            }
+        )
+
+    return policy
+
+
+class StubBackend:
+    """InferenceBackend that answers via *policy* without any I/O."""
+
+    def __init__(
+        self,
+        policy: Callable[[str], str] = first_valid_action,
+        model: str = "stub",
+    ):
+        self.model = model
+        self.policy = policy
+        self.metrics = InferenceMetrics()
+        self.last_timing: CallTiming | None = None
+
+    @property
+    def calls(self) -> int:
+        return self.metrics.calls
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        cancel: CancelToken | None = None,
+        options: list[ActionOption] | None = None,  # the policy reads the prompt
+    ) -> str | None:
+        start = time.perf_counter()
+        raw = self.policy(prompt)
+        if cancel is not None and cancel.cancelled:
+            raw = None  # the policy cannot be interrupted, its answer can
+        elapsed = time.perf_counter() - start
+        self.last_timing = CallTiming(total=elapsed, decision=elapsed)
+        self.metrics.record_call(self.last_timing)
+        self.metrics.record_usage(
+            prompt_tokens=len(prompt) // _CHARS_PER_TOKEN,
+            completion_tokens=len(raw or "") // _CHARS_PER_TOKEN,
+        )
+        return raw
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncStubBackend(StubBackend):
+    """StubBackend for the asyncio runner."""
+
+    async def is_available(self) -> bool:
+        return True
+
+    async def generate(
+        self,
+        prompt: str,
+        schema: dict | None = None,
+        options: list[ActionOption] | None = None,
+    ) -> str | None:
+        return StubBackend.generate(self, prompt, schema)
+
+    async def aclose(self) -> None:
+        pass
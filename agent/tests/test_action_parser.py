@@ -2,6 +2,7 @@
 
 import pytest
 from action_parser import ActionParser
+from models import ActionOption, ParsedAction
 
 
 @pytest.fixture
@@ -23,7 +24,6 @@ def test_missing_reason_defaults(parser):
     assert result["reason"] == "no reason given"
 
 
-
 # ── Junk characters emitted by small LLMs ────────────────────────────────────
 
 
@@ -107,3 +107,84 @@ def test_only_action_and_reason_not_duplicated(parser):
     raw = '{"action":"idle","reason":"nothing to do"}'
     result = parser.parse(raw)
     assert set(result.keys()) == {"action", "reason"}
+
+
+# ── Stats and output schema ──────────────────────────────────────────────────
+
+
+def test_stats_count_each_path(parser):
+    parser.parse('{"action":"idle"}')
+    parser.parse('{"action":"idle").}')
+    parser.parse('Sure: {"action":"idle"} done')
+    parser.parse("no json here")
+    parser.parse(None)
+    s = parser.stats
+    assert (s.clean, s.repaired, s.extracted, s.failed, s.empty) == (1, 1, 1, 1, 1)
+    assert s.failure_rate == 0.4
+
+
+def test_output_schema_restricts_to_options():
+    options = [
+        ActionOption(action="pick_up_item", target="flint (5.1m)"),
+        ActionOption(action="explore", target="N"),
+        ActionOption(action="explore", target="S"),
+    ]
+    schema = ParsedAction.output_schema(options)
+    assert schema["properties"]["action"]["enum"] == ["explore", "pick_up_item"]
+    branches = {b["properties"]["action"]["const"]: b for b in schema["anyOf"]}
+    assert branches["explore"]["properties"]["target"]["enum"] == ["N", "S"]
+    assert branches["pick_up_item"]["properties"]["target"]["enum"] == ["flint (5.1m)"]
+    assert branches["pick_up_item"]["required"] == ["action", "reason", "target"]
+
+
+def test_output_schema_targetless_action_needs_no_target():
+    options = [
+        ActionOption(action="chop_tree"),
+        ActionOption(action="pick_up_item", target="twigs (3m)"),
+    ]
+    schema = ParsedAction.output_schema(options)
+    assert schema["required"] == ["action", "reason"]
+    assert "null" in schema["properties"]["target"]["type"]
+    chop = next(
+        b for b in schema["anyOf"] if b["properties"]["action"]["const"] == "chop_tree"
+    )
+    # {"action": "chop_tree", "reason": ...} satisfies the branch; a target cannot
+    assert "target" not in chop.get("required", [])
+    assert chop["properties"]["target"] == {"type": "null"}
+
+
+@pytest.mark.parametrize("plan_steps", [0, 2])
+def test_output_schema_branches_validate_replies(plan_steps):
+    jsonschema = pytest.importorskip("jsonschema")
+    options = [
+        ActionOption(action="chop_tree"),
+        ActionOption(action="explore", target="N"),
+        ActionOption(action="pick_up_item", target="twigs (3m)"),
+    ]
+    schema = ParsedAction.output_schema(options, plan_steps)
+    # the grammar only sees one branch, so each must accept a full reply alone
+    for branch in schema["anyOf"]:
+        assert branch["type"] == "object"
+        assert {"action", "reason"} <= set(branch["required"])
+    valid = [
+        {"action": "chop_tree", "reason": "logs"},
+        {"action": "explore", "target": "N", "reason": "scout"},
+    ]
+    invalid = [
+        {},
+        {"action": "explore", "target": "N"},
+        {"action": "explore", "target": "S", "reason": "scout"},
+        {"action": "pick_up_item", "reason": "sticks"},
+        {"action": "chop_tree", "target": "N", "reason": "logs"},
+    ]
+    if plan_steps:
+        then = [{"action": "explore", "target": "S"}]
+        valid.append({"action": "chop_tree", "reason": "logs", "then": then})
+        invalid.append({"action": "chop_tree", "reason": "logs", "then": [{}]})
+    branches = {b["properties"]["action"]["const"]: b for b in schema["anyOf"]}
+    for reply in valid:
+        jsonschema.validate(reply, schema)
+        jsonschema.validate(reply, branches[reply["action"]])
+    for reply in invalid:
+        with pytest.raises(jsonschema.ValidationError):
+            jsonschema.validate(reply, schema)
@@ -0,0 +1,79 @@
+"""Tests for async_runner — inference overlapped with state polling."""
+
+import asyncio
+import contextlib
+import io
+import time
+from pathlib import Path
+
+from async_runner import AsyncAgentRunner
+from stub_backend import first_valid_action
+from tools.replay import fixture_state, publish_state, wire_agent
+
+
+class SlowLlm:
+    """Async LLM stand-in that takes *latency* seconds per call."""
+
+    def __init__(self, latency: float):
+        self.model = "slow"
+        self.latency = latency
+        self.started: list[float] = []
+
+    async def generate(
+        self, prompt: str, schema: dict | None = None, options: list | None = None
+    ) -> str:
+        self.started.append(time.perf_counter())
+        await asyncio.sleep(self.latency)
+        return first_valid_action(prompt)
+
+
+async def _scenario(workdir: Path, llm: SlowLlm, second: str, runtime: float):
+    agent, writer = wire_agent(workdir, llm)
+    runner = AsyncAgentRunner(agent, llm, poll_interval=0.01)
+    publish_state(workdir, fixture_state("day1_fresh.json"), 1)
+    task = asyncio.create_task(runner.run(max_decisions=2))
+    await asyncio.sleep(0.05)  # first inference in flight
+    publish_state(workdir, fixture_state(second), 2)
+    with contextlib.suppress(TimeoutError):
+        await asyncio.wait_for(task, runtime)
+    return runner, writer
+
+
+def test_next_state_dispatched_as_soon_as_inference_returns(tmp_path):
+    llm = SlowLlm(latency=0.2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner, writer = asyncio.run(
+            _scenario(tmp_path, llm, "day2_spring_inventory.json", 2.0)
+        )
+    assert runner.stats.decisions == 2
+    assert len(writer.actions) == 2
+    # Second call started right after the first returned, not a poll later
+    assert llm.started[1] - llm.started[0] < 0.2 + 0.05
+
+
+def test_direct_action_cancels_inflight_inference(tmp_path):
+    llm = SlowLlm(latency=5.0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner, writer = asyncio.run(
+            _scenario(tmp_path, llm, "low_health_hostile.json", 0.2)
+        )
+    assert runner.stats.cancelled == 1
+    assert runner.stats.decisions == 0
+    assert writer.actions[-1]["action"] in {"run_from_enemy", "eat_food"}
+
+
+def test_idle_polls_logged_once_per_run(tmp_path):
+    agent, _ = wire_agent(tmp_path, SlowLlm(latency=0.0))
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        publish_state(tmp_path, fixture_state("day1_fresh.json"), 1)
+        agent.observe()
+        for seq in range(2, 6):  # untouched file, then identical rewrites
+            agent.observe()
+            publish_state(tmp_path, fixture_state("day1_fresh.json"), seq)
+        publish_state(tmp_path, fixture_state("day2_spring_inventory.json"), 6)
+        agent.observe()
+    log = out.getvalue()
+    assert log.count("State unchanged") == 1
+    assert "State changed after 4 skipped polls" in log
+    assert agent.idle_polls == 4
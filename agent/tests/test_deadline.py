@@ -0,0 +1,73 @@
+"""Tests for the per-tick inference deadline and its rule-based fallback."""
+
+import json
+import time
+
+import pytest
+
+from stub_backend import StubBackend
+from tools.replay import decide_on, fixture_state, wire_agent
+
+_FLINT = json.dumps(
+    {"action": "pick_up_item", "target": "flint (15.8m)", "reason": "sharp"}
+)
+
+
+class DelayedPolicy:
+    """Answers _FLINT after the next delay in *delays* (0 once they run out)."""
+
+    def __init__(self, *delays: float):
+        self.delays = list(delays)
+
+    def __call__(self, prompt: str) -> str:
+        if self.delays:
+            time.sleep(self.delays.pop(0))
+        return _FLINT
+
+
+def test_answer_within_deadline_is_used(tmp_path):
+    agent, _ = wire_agent(tmp_path, StubBackend(DelayedPolicy()), deadline=1.0)
+    action = decide_on(agent, tmp_path, fixture_state("day1_fresh.json"), 1)
+    assert action["target"] == "flint (15.8m)"
+    assert agent.deadline_stats.met == 1
+    assert agent.deadline_stats.missed == 0
+
+
+def test_missed_deadline_emits_top_ranked_option(tmp_path):
+    agent, writer = wire_agent(tmp_path, StubBackend(DelayedPolicy(0.5)), deadline=0.05)
+    start = time.perf_counter()
+    action = decide_on(agent, tmp_path, fixture_state("day1_fresh.json"), 1)
+    assert time.perf_counter() - start < 0.4
+    assert agent.deadline_stats.missed == 1
+    assert action["reason"].startswith("Deadline fallback")
+    assert writer.actions == [action]
+    assert agent.decision_count == 1
+
+
+def test_late_answer_used_next_tick_retargeted(tmp_path):
+    agent, _ = wire_agent(tmp_path, StubBackend(DelayedPolicy(0.2)), deadline=0.05)
+    decide_on(agent, tmp_path, fixture_state("day1_fresh.json"), 1)
+    time.sleep(0.3)
+    action = decide_on(agent, tmp_path, fixture_state("day2_spring_inventory.json"), 2)
+    # Still offered on the new tick, at its new distance
+    assert action == {**json.loads(_FLINT), "target": "flint (3.2m)"}
+    assert agent.deadline_stats.late_used == 1
+    assert agent.llm_client.calls == 1
+
+
+def test_late_answer_discarded_by_policy(tmp_path):
+    llm = StubBackend(DelayedPolicy(0.2))
+    agent, _ = wire_agent(tmp_path, llm, deadline=0.5, late_policy="discard")
+    agent.deadline = 0.05
+    decide_on(agent, tmp_path, fixture_state("day1_fresh.json"), 1)
+    agent.deadline = 0.5
+    action = decide_on(agent, tmp_path, fixture_state("day2_spring_inventory.json"), 2)
+    assert agent.deadline_stats.late_dropped == 1
+    assert agent.deadline_stats.met == 1
+    assert not action["reason"].startswith("Deadline fallback")
+    assert llm.calls == 2
+
+
+def test_unknown_late_policy_rejected(tmp_path):
+    with pytest.raises(ValueError, match="late_policy"):
+        wire_agent(tmp_path, StubBackend(), deadline=1.0, late_policy="queue")
@@ -0,0 +1,121 @@
+"""Tests for decision_cache — situation-keyed LRU + TTL with a valid-action guard."""
+
+import json
+from pathlib import Path
+
+from clock import VirtualClock
+from decision_cache import DecisionCache, target_base
+from models import ActionOption, GameState
+from state_recorder import TraceRecord
+from stub_backend import StubBackend
+from tools.replay import replay
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+def _state(**fields) -> GameState:
+    base = {"health": 100, "hunger": 100, "sanity": 150, "inventory": ["log x2"]}
+    base.update(fields)
+    return GameState(**base)
+
+
+def _options(dist: float) -> list[ActionOption]:
+    return [
+        ActionOption(action="pick_up_item", target=f"flint ({dist}m)"),
+        ActionOption(action="explore", target="N"),
+    ]
+
+
+_ACTION = {"action": "pick_up_item", "target": "flint (5.1m)", "reason": "need flint"}
+
+
+def test_target_base():
+    assert target_base("log (12.3m)") == "log"
+    assert target_base("boards (logx4)") == "boards"
+    assert target_base("N") == "N"
+    assert target_base(None) is None
+
+
+def test_hit_is_retargeted_to_current_option():
+    cache = DecisionCache()
+    cache.store(_state(), _options(5.1), _ACTION)
+    action = cache.lookup(_state(), _options(4.2))
+    assert action == {**_ACTION, "target": "flint (4.2m)"}
+    assert cache.stats.hits == 1
+
+
+def test_hit_after_small_drift():
+    cache = DecisionCache()
+    cache.store(_state(day=3, temperature=30.0), _options(5.1), _ACTION)
+    drifted = _state(
+        day=4,
+        temperature=24.0,
+        health=103,
+        hunger=106.5,
+        sanity=152,
+        time_of_day=0.41,
+        nearby_entities=[{"name": "flint", "type": "item", "distance": 11.0}],
+    )
+    assert cache.lookup(drifted, _options(11.0)) == {
+        **_ACTION,
+        "target": "flint (11.0m)",
+    }
+
+
+def test_different_situation_misses():
+    cache = DecisionCache()
+    cache.store(_state(), _options(5.1), _ACTION)
+    assert cache.lookup(_state(inventory=["log x3"]), _options(5.1)) is None
+    assert cache.stats.misses == 1
+
+
+def test_guard_rejects_action_no_longer_offered():
+    cache = DecisionCache()
+    options = _options(5.1)
+    cache.store(_state(), options, _ACTION)
+    # Same key, but pretend the offered flint has gone: entry must not be served
+    cache._entries[cache.key(_state(), options)]["action"]["target"] = "rocks (3m)"
+    assert cache.lookup(_state(), options) is None
+    assert cache.stats.guarded == 1
+
+
+def test_ttl_expiry():
+    clock = VirtualClock(1000.0)
+    cache = DecisionCache(ttl=60.0, clock=clock)
+    cache.store(_state(), _options(5.1), _ACTION)
+    clock.sleep(61.0)
+    assert cache.lookup(_state(), _options(5.1)) is None
+    assert cache.stats.expired == 1
+
+
+def test_lru_eviction():
+    cache = DecisionCache(max_entries=2)
+    for n in (1, 2, 3):
+        cache.store(_state(inventory=[f"log x{n}"]), _options(5.0), _ACTION)
+    assert len(cache) == 2
+    assert cache.lookup(_state(inventory=["log x1"]), _options(5.0)) is None
+
+
+def test_persisted_across_instances(tmp_path):
+    path = tmp_path / "decision_cache.json"
+    cache = DecisionCache(path, save_every=100)
+    cache.store(_state(), _options(5.1), _ACTION)
+    cache.close()
+    assert DecisionCache(path).lookup(_state(), _options(7.0)) is not None
+
+
+def test_agent_serves_returning_situation_from_cache():
+    # A -> B -> A' (A' = A with distance jitter): the second A is a cache hit
+    doc = json.loads((FIXTURES / "day2_spring_inventory.json").read_bytes())
+    jittered = [dict(e, distance=e["distance"] + 0.3) for e in doc["nearby_entities"]]
+    docs = [doc, dict(doc, hunger=60), dict(doc, nearby_entities=jittered)]
+    records = [
+        TraceRecord(float(i), i, json.dumps(d).encode()) for i, d in enumerate(docs)
+    ]
+
+    llm = StubBackend()
+    cache = DecisionCache()
+    result = replay(records, llm=llm, decision_cache=cache)
+    assert result.decisions == 3
+    assert cache.stats.hits == 1
+    assert llm.calls == 2
@@ -0,0 +1,48 @@
+"""Tests for decision_context — per-tick memo of goals and valid actions."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from action_planner import ActionPlanner
+from benchmarks.bench_decision_context import CountingGoalManager, CountingPlanner
+from decision_context import DecisionContext
+from goal_manager import GoalManager, StateFieldError
+from models import GameState
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+def _state(fixture: str) -> GameState:
+    return GameState.model_validate(json.loads((FIXTURES / fixture).read_text()))
+
+
+def test_each_value_computed_once():
+    state = _state("night_no_fire.json")
+    goals, planner = CountingGoalManager(), CountingPlanner()
+    ctx = DecisionContext(state, state.inventory_view, goals, planner)
+    for _ in range(3):
+        _ = ctx.short_term_goal, ctx.valid_actions, ctx.concrete_actions
+        _ = ctx.goals_text
+    assert goals.goal_calls == 1
+    assert planner.valid_calls == 1
+
+
+def test_matches_direct_calls():
+    state = _state("day2_spring_inventory.json")
+    inv = state.inventory_view
+    goals, planner = GoalManager(), ActionPlanner()
+    ctx = DecisionContext(state, inv, goals, planner)
+    assert ctx.goals_text == goals.format_for_prompt(state, inv)
+    assert ctx.short_term_goal == goals.get_short_term_goal(state, inv)
+    assert ctx.valid_actions == planner.get_valid_actions(inv)
+    assert ctx.concrete_actions == planner.get_concrete_actions(inv, state)
+
+
+def test_state_field_error_raised_on_access():
+    state = _state("day1_fresh.json").model_copy(update={"phase": None})
+    ctx = DecisionContext(state, state.inventory_view, GoalManager(), ActionPlanner())
+    assert ctx.concrete_actions  # does not need the goal rules
+    with pytest.raises(StateFieldError):
+        _ = ctx.goals_text
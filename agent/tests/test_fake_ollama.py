@@ -0,0 +1,101 @@
+"""Tests for tools.fake_ollama — latency models, injection and both endpoints."""
+
+import json
+import random
+import statistics
+
+import httpx
+import pytest
+
+from ollama_client import OllamaClient
+from stub_backend import offered_options
+from tools.fake_ollama import FakeConfig, FakeOllama, LatencyModel
+
+PROMPT = (
+    "[VALID_ACTIONS]\n"
+    '  {"action":"pick_up_item", "targets":["flint (5.1m)"]}\n'
+    '  {"action":"explore", "targets":["N", "S"]}\n'
+    "[/VALID_ACTIONS]"
+)
+
+
+def _instant(**kwargs) -> FakeConfig:
+    return FakeConfig(latency=LatencyModel(median=0.0), **kwargs)
+
+
+@pytest.mark.parametrize("kind", ["fixed", "lognormal", "heavy-tail"])
+def test_latency_models_hit_their_median(kind):
+    model = LatencyModel(kind=kind, median=0.2)
+    rng = random.Random(1)
+    samples = [model.sample(rng) for _ in range(4000)]
+    assert statistics.median(samples) == pytest.approx(0.2, rel=0.1)
+
+
+def test_heavy_tail_has_heavier_tail_than_lognormal():
+    rng = random.Random(1)
+    heavy = LatencyModel(kind="heavy-tail", median=0.2, alpha=1.2)
+    normal = LatencyModel(kind="lognormal", median=0.2, sigma=0.5)
+
+    def p99(model: LatencyModel) -> float:
+        samples = [model.sample(rng) for _ in range(4000)]
+        return statistics.quantiles(samples, n=100)[98]
+
+    assert p99(heavy) > 2 * p99(normal)
+
+
+def test_plans_are_reproducible_per_seed():
+    def plans(seed: int) -> list:
+        fake = FakeOllama(
+            FakeConfig(
+                latency=LatencyModel(kind="lognormal"),
+                error_rate=0.3,
+                policy="random",
+                seed=seed,
+            )
+        )
+        try:
+            return [fake.plan(PROMPT) for _ in range(20)]
+        finally:
+            fake.stop()
+
+    assert plans(7) == plans(7)
+    assert plans(7) != plans(8)
+
+
+def test_random_policy_answers_with_offered_options():
+    fake = FakeOllama(_instant(policy="random"))
+    offered = {(o.action, o.target) for o in offered_options(PROMPT)}
+    for _ in range(10):
+        _, _, tokens = fake.plan(PROMPT)
+        answer = json.loads("".join(tokens))
+        assert (answer["action"], answer["target"]) in offered
+    fake.stop()
+
+
+def test_generate_and_error_injection():
+    with FakeOllama(_instant(error_rate=0.5, seed=3)) as fake:
+        client = OllamaClient(url=fake.url, backoff_initial=0.0)
+        results = [client.generate(PROMPT) for _ in range(10)]
+        client.close()
+    assert results.count(None) == fake.stats.errors > 0
+    ok = [r for r in results if r is not None]
+    assert all(json.loads(r)["action"] == "pick_up_item" for r in ok)
+    assert client.metrics.usage_calls == len(ok)
+
+
+def test_injected_timeout_trips_client_timeout():
+    with FakeOllama(_instant(timeout_rate=1.0, hang=1.0)) as fake:
+        client = OllamaClient(url=fake.url, timeout=0.1)
+        assert client.generate(PROMPT) is None
+        client.close()
+    assert fake.stats.timeouts == 1
+
+
+def test_chat_endpoint_streams():
+    with FakeOllama(_instant(ramble=5)) as fake:
+        body = {"messages": [{"role": "user", "content": PROMPT}], "stream": True}
+        with httpx.stream("POST", fake.url + "/api/chat", json=body) as response:
+            chunks = [json.loads(line) for line in response.iter_lines() if line]
+    text = "".join(c["message"]["content"] for c in chunks)
+    assert text.startswith('{"action": "pick_up_item"')
+    assert chunks[-1]["done"] and chunks[-1]["eval_count"] == len(chunks) - 1
@@ -0,0 +1,104 @@
+"""Tests for the inference backends — OpenAI-compatible adapter, stub, factory."""
+
+import json
+
+import httpx
+import pytest
+
+from inference_backend import create_backend
+from ollama_client import OllamaClient
+from openai_client import AsyncOpenAIClient, OpenAIClient
+from stub_backend import AsyncStubBackend, StubBackend
+
+_ACTION = '{"action":"chop_tree","target":"evergreen"}'
+
+
+def _openai(handler, **kwargs) -> OpenAIClient:
+    return OpenAIClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_openai_body_and_response():
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/chat/completions"
+        assert request.headers["Authorization"] == "Bearer k"
+        bodies.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"role": "assistant", "content": _ACTION}}],
+                "usage": {"prompt_tokens": 500, "completion_tokens": 20},
+                "timings": {"prompt_ms": 150.0, "predicted_ms": 400.0},
+            },
+        )
+
+    client = _openai(handler, model="m", api_key="k", num_predict=64)
+    assert client.generate("p", schema={"type": "object"}) == _ACTION
+    body = bodies[0]
+    assert body["messages"] == [{"role": "user", "content": "p"}]
+    assert body["max_tokens"] == 64
+    assert body["response_format"]["json_schema"]["schema"] == {"type": "object"}
+    metrics = client.metrics
+    assert metrics.calls == 1
+    assert metrics.prompt_tokens == 500 and metrics.completion_tokens == 20
+    assert metrics.prompt_seconds == 0.15
+
+
+def _sse(tokens: list[str], sent: list[str]):
+    for tok in tokens:
+        sent.append(tok)
+        chunk = {"choices": [{"delta": {"content": tok}}]}
+        yield f"data: {json.dumps(chunk)}\n\n".encode()
+    yield b'data: {"choices":[],"usage":{"prompt_tokens":9,"completion_tokens":3}}\n\n'
+    yield b"data: [DONE]\n\n"
+
+
+def test_openai_stream_stops_after_complete_action():
+    tokens = ['{"action":"chop_tree",', '"target":"evergreen"}', " because"]
+    sent: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream_options"] == {"include_usage": True}
+        return httpx.Response(200, content=_sse(tokens, sent))
+
+    client = _openai(handler, stream=True)
+    assert client.generate("p") == _ACTION
+    assert sent == tokens[:2]
+    assert client.last_timing.early_stop
+
+
+def test_openai_stream_to_done_records_usage():
+    sent: list[str] = []
+    client = _openai(
+        lambda request: httpx.Response(200, content=_sse(["I", " think"], sent)),
+        stream=True,
+    )
+    assert client.generate("p") == "I think"
+    assert client.metrics.usage_calls == 1
+    assert client.metrics.completion_tokens == 3
+
+
+def test_http_error_counts_as_failure():
+    client = _openai(lambda request: httpx.Response(404))
+    assert client.generate("p") is None
+    assert client.metrics.failures == 1
+
+
+def test_stub_is_deterministic_and_metered():
+    prompt = '[VALID_ACTIONS]\n  {"action":"explore", "targets":["S", "N"]}\n'
+    stub = StubBackend()
+    assert json.loads(stub.generate(prompt))["target"] == "S"
+    assert stub.generate(prompt) == stub.generate(prompt)
+    assert stub.calls == 3
+    assert stub.metrics.prompt_tokens == 3 * (len(prompt) // 4)
+
+
+def test_create_backend():
+    assert isinstance(create_backend("ollama", "m"), OllamaClient)
+    client = create_backend("openai", "m", use_async=True, stream=True)
+    assert isinstance(client, AsyncOpenAIClient)
+    assert client.url == "http://localhost:8080" and client.stream
+    assert isinstance(create_backend("stub", "m", use_async=True), AsyncStubBackend)
+    with pytest.raises(ValueError):
+        create_backend("tgi", "m")
@@ -0,0 +1,132 @@
+"""Tests for inference_cascade — small model first, escalate when its answer is unusable."""
+
+import asyncio
+import json
+import math
+
+import httpx
+
+from inference_backend import CallTiming
+from inference_cascade import AsyncInferenceCascade, InferenceCascade
+from models import ActionOption
+from ollama_client import OllamaClient
+from stub_backend import AsyncStubBackend, StubBackend
+
+_PROMPT = (
+    "[VALID_ACTIONS]\n"
+    '  {"action":"pick_up_item", "targets":["flint (3.2m)"]}\n'
+    '  {"action":"eat_food"}\n'
+    "[/VALID_ACTIONS]"
+)
+_OPTIONS = [
+    ActionOption(action="pick_up_item", target="flint (3.2m)"),
+    ActionOption(action="eat_food"),
+]
+_GOOD = '{"action":"pick_up_item","target":"flint (3.2m)","reason":"r"}'
+_BIG = '{"action":"eat_food","reason":"big"}'
+
+
+def _cascade(small_reply: str | None, **kwargs) -> InferenceCascade:
+    small = StubBackend(lambda prompt: small_reply, model="small")
+    big = StubBackend(lambda prompt: _BIG, model="big")
+    return InferenceCascade([small, big], **kwargs)
+
+
+def test_valid_small_answer_is_not_escalated():
+    cascade = _cascade(_GOOD)
+    assert cascade.generate(_PROMPT) == _GOOD
+    small, big = cascade.metrics.tiers
+    assert (small.answered, big.calls) == (1, 0)
+    assert cascade.metrics.calls == 1
+
+
+def test_escalation_reasons():
+    replies = {
+        "failed": None,
+        "unparseable": "I would pick up the flint",
+        "invalid": '{"action":"chop_tree","target":"evergreen"}',
+    }
+    for reason, reply in replies.items():
+        cascade = _cascade(reply)
+        assert cascade.generate(_PROMPT, options=_OPTIONS) == _BIG
+        small, big = cascade.metrics.tiers
+        assert small.escalations[reason] == 1
+        assert big.answered == 1
+
+
+def test_missing_required_target_escalates():
+    cascade = _cascade('{"action":"pick_up_item","reason":"r"}')
+    assert cascade.generate(_PROMPT, options=_OPTIONS) == _BIG
+    assert cascade.metrics.tiers[0].escalations["invalid"] == 1
+
+
+def test_validity_checked_against_passed_options_only():
+    # Offered in the prompt text but not in options: the options decide
+    cascade = _cascade(_GOOD)
+    eat_only = [ActionOption(action="eat_food")]
+    assert cascade.generate(_PROMPT, options=eat_only) == _BIG
+    # No options passed: only parseability is checked
+    chop = '{"action":"chop_tree","target":"evergreen","reason":"r"}'
+    assert _cascade(chop).generate(_PROMPT) == chop
+
+
+class _Unreachable(StubBackend):
+    def generate(self, prompt, schema=None, cancel=None, options=None):
+        return None  # gives up before timing anything, like a dead server
+
+
+def test_failed_tier_does_not_report_stale_timing():
+    small = _Unreachable(model="small")
+    small.last_timing = CallTiming(total=5.0, decision=5.0)  # an earlier call
+    cascade = InferenceCascade([small, StubBackend(lambda prompt: _BIG, model="big")])
+    assert cascade.generate(_PROMPT) == _BIG
+    assert cascade.metrics.tiers[0].latency < 1.0
+    assert cascade.last_timing.total < 1.0
+
+
+def test_self_reported_confidence_threshold():
+    unsure = _GOOD[:-1] + ',"confidence":0.3}'
+    assert _cascade(unsure, min_confidence=0.5).generate(_PROMPT) == _BIG
+    assert _cascade(unsure).generate(_PROMPT) == unsure  # threshold off
+    sure = _GOOD[:-1] + ',"confidence":0.9}'
+    assert _cascade(sure, min_confidence=0.5).generate(_PROMPT) == sure
+
+
+def test_logprob_confidence_from_ollama():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["logprobs"] is True
+        return httpx.Response(
+            200,
+            json={
+                "response": _GOOD,
+                "done": True,
+                "logprobs": [{"token": "{", "logprob": -2.0}] * 3,
+            },
+        )
+
+    small = OllamaClient(
+        model="small", transport=httpx.MockTransport(handler), logprobs=True
+    )
+    assert small.generate(_PROMPT) == _GOOD
+    assert abs(small.last_confidence - math.exp(-2.0)) < 1e-9
+    cascade = InferenceCascade(
+        [small, StubBackend(lambda prompt: _BIG, model="big")], min_confidence=0.5
+    )
+    assert cascade.generate(_PROMPT) == _BIG
+    assert cascade.metrics.tiers[0].escalations["low_confidence"] == 1
+
+
+def test_summary_reports_tier_shares():
+    cascade = _cascade(_GOOD)
+    cascade.generate(_PROMPT)
+    summary = cascade.metrics.summary()
+    assert "small: answered 1 (100%)" in summary
+    assert "big: answered 0 (0%)" in summary
+
+
+def test_async_cascade():
+    small = AsyncStubBackend(lambda prompt: "nonsense", model="small")
+    big = AsyncStubBackend(lambda prompt: _BIG, model="big")
+    cascade = AsyncInferenceCascade([small, big])
+    assert asyncio.run(cascade.generate(_PROMPT)) == _BIG
+    assert cascade.model == "small+big"
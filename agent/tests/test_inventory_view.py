@@ -0,0 +1,56 @@
+"""Tests for InventoryView — parse-once, alias-normalised inventory counts."""
+
+import pytest
+
+from action_specs import normalize_inv
+from inventory_tracker import InventoryTracker
+from models import GameState, InventoryView
+
+
+def _state(items: list[str]) -> GameState:
+    return GameState(health=100, hunger=100, sanity=100, inventory=items)
+
+
+def test_parse_counts_and_singletons():
+    view = InventoryView.parse(["log x20", "axe"])
+    assert view == {"log": 20, "axe": 1}
+
+
+def test_parse_normalises_aliases_and_case():
+    view = InventoryView.parse(["Twig x3", "rock x2"])
+    assert dict(view) == {"twigs": 3, "rocks": 2}
+
+
+def test_parse_sums_repeated_stacks():
+    assert InventoryView.parse(["log x20", "log x5"])["log"] == 25
+
+
+def test_alias_aware_lookup():
+    view = InventoryView.parse(["twigs x2"])
+    assert "twig" in view
+    assert view.get("twig", 0) == 2
+    assert view.get("flint", 0) == 0
+
+
+def test_view_is_immutable():
+    view = InventoryView.parse(["axe"])
+    with pytest.raises(TypeError):
+        view["axe"] = 2  # type: ignore[index]
+
+
+def test_state_caches_view():
+    state = _state(["log x2"])
+    assert state.inventory_view is state.inventory_view
+    assert state.get_item_count("log") == 2
+    assert state.has_item("log")
+
+
+def test_normalize_inv_passes_view_through():
+    view = InventoryView.parse(["twig x2"])
+    assert normalize_inv(view) is view
+
+
+def test_tracker_reuses_state_view():
+    state = _state(["flint x3"])
+    tracker = InventoryTracker(memory=None)  # type: ignore[arg-type]
+    assert tracker.update(state) is state.inventory_view
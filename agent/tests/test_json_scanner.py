@@ -0,0 +1,33 @@
+"""Tests for json_scanner — incremental top-level object detection."""
+
+from json_scanner import JsonObjectScanner
+
+TEXT = 'Sure! {"action":"chop_tree","reason":"a } in \\" {text"} more {"a":{"b":1}}'
+
+
+def _feed_in_chunks(text: str, size: int) -> list[str]:
+    scanner = JsonObjectScanner()
+    out = []
+    for i in range(0, len(text), size):
+        out += scanner.feed(text[i : i + size])
+    return out
+
+
+def test_whole_text():
+    assert JsonObjectScanner().feed(TEXT) == [
+        '{"action":"chop_tree","reason":"a } in \\" {text"}',
+        '{"a":{"b":1}}',
+    ]
+
+
+def test_chunk_boundaries_do_not_matter():
+    expected = JsonObjectScanner().feed(TEXT)
+    for size in (1, 2, 3, 7):
+        assert _feed_in_chunks(TEXT, size) == expected
+
+
+def test_incomplete_object_not_returned():
+    scanner = JsonObjectScanner()
+    assert scanner.feed('{"action":"explore"') == []
+    assert scanner.feed("}") == ['{"action":"explore"}']
+
@@ -0,0 +1,204 @@
+"""Tests for ollama_client — pooled client, cached health and backoff."""
+
+import asyncio
+import json
+
+import httpx
+
+from ollama_client import AsyncOllamaClient, OllamaClient
+from preemption import CancelToken
+
+
+class _Server:
+    """MockTransport handler counting requests; can be switched off."""
+
+    def __init__(self):
+        self.up = True
+        self.heads = 0
+        self.posts = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not self.up:
+            raise httpx.ConnectError("refused", request=request)
+        if request.method == "HEAD":
+            self.heads += 1
+            return httpx.Response(200)
+        self.posts += 1
+        return httpx.Response(200, json={"response": '{"action":"idle"}'})
+
+
+def _client(server: _Server, **kwargs) -> OllamaClient:
+    return OllamaClient(transport=httpx.MockTransport(server), **kwargs)
+
+
+def test_healthy_server_is_not_probed():
+    server = _Server()
+    client = _client(server)
+    assert client.generate("p") == '{"action":"idle"}'
+    assert client.generate("p") == '{"action":"idle"}'
+    assert server.heads == 0
+    assert server.posts == 2
+    assert client.last_timing is not None
+
+
+def test_failure_backs_off_before_reprobe():
+    server = _Server()
+    client = _client(server, backoff_initial=60.0)
+    server.up = False
+    assert client.generate("p") is None
+    server.up = True
+    # Still inside the backoff window: no request at all
+    assert client.generate("p") is None
+    assert server.heads == 0 and server.posts == 0
+
+
+def test_reprobe_after_backoff_recovers():
+    server = _Server()
+    client = _client(server, backoff_initial=0.0)
+    server.up = False
+    assert client.generate("p") is None
+    server.up = True
+    assert client.generate("p") == '{"action":"idle"}'
+    assert server.heads == 1
+
+
+def test_backoff_doubles_up_to_max():
+    server = _Server()
+    server.up = False
+    client = _client(server, backoff_initial=1.0, backoff_max=4.0)
+    backoffs = []
+    for _ in range(4):
+        client._mark_unhealthy()
+        backoffs.append(client._backoff)
+    assert backoffs == [1.0, 2.0, 4.0, 4.0]
+
+
+def test_keep_alive_and_usage_metrics():
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "response": '{"action":"idle"}',
+                "done": True,
+                "prompt_eval_count": 40,
+                "prompt_eval_duration": 200_000_000,
+                "eval_count": 12,
+            },
+        )
+
+    client = OllamaClient(transport=httpx.MockTransport(handler), keep_alive="30m")
+    client.generate("p")
+    client.generate("p")
+    assert bodies[0]["keep_alive"] == "30m"
+    metrics = client.metrics
+    assert metrics.calls == metrics.usage_calls == 2
+    assert metrics.prompt_tokens == 80
+    assert metrics.prompt_seconds == 0.4
+    assert "keep_alive" not in _client(_Server())._body("p")
+
+
+def test_schema_and_sampling_options_in_body():
+    body = _client(_Server(), num_predict=64, stop=["\n\n"])._body(
+        "p", {"type": "object"}
+    )
+    assert body["format"] == {"type": "object"}
+    assert body["options"] == {
+        "temperature": 0.7,
+        "top_p": 0.95,
+        "num_predict": 64,
+        "stop": ["\n\n"],
+    }
+    assert "format" not in _client(_Server())._body("p")
+
+
+# ── streaming ────────────────────────────────────────────────────────────────
+
+
+def _ndjson(tokens: list[str], sent: list[str]):
+    for tok in tokens:
+        sent.append(tok)
+        yield (json.dumps({"response": tok, "done": False}) + "\n").encode()
+    yield b'{"response":"","done":true}\n'
+
+
+def _streaming_client(tokens: list[str], sent: list[str]) -> OllamaClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=_ndjson(tokens, sent))
+
+    return OllamaClient(transport=httpx.MockTransport(handler), stream=True)
+
+
+def test_stream_stops_after_complete_action():
+    tokens = [
+        '{"action":',
+        '"chop_tree",',
+        '"target":"evergreen"}',
+        " because",
+        " trees",
+    ]
+    sent: list[str] = []
+    client = _streaming_client(tokens, sent)
+    raw = client.generate("p")
+    assert raw == '{"action":"chop_tree","target":"evergreen"}'
+    assert sent == tokens[:3]
+    assert client.last_timing.early_stop
+
+
+def test_stream_skips_objects_that_are_not_actions():
+    tokens = ['{"note":1} ', '{"action":"idle"}']
+    sent: list[str] = []
+    raw = _streaming_client(tokens, sent).generate("p")
+    assert raw == '{"note":1} {"action":"idle"}'
+
+
+def test_stream_without_action_reads_to_end():
+    tokens = ["I", " think", " so"]
+    sent: list[str] = []
+    client = _streaming_client(tokens, sent)
+    assert client.generate("p") == "I think so"
+    assert not client.last_timing.early_stop
+
+
+def test_stream_stops_when_cancelled():
+    tokens = ['{"action":', '"chop_tree",', '"target":"evergreen"}']
+    sent: list[str] = []
+    cancel = CancelToken()
+
+    def body():
+        for i, line in enumerate(_ndjson(tokens, sent)):
+            if i == 1:
+                cancel.cancel("threat")  # the agent saw a spider mid-stream
+            yield line
+
+    client = OllamaClient(
+        transport=httpx.MockTransport(lambda r: httpx.Response(200, content=body())),
+        stream=True,
+    )
+    assert client.generate("p", cancel=cancel) is None
+    assert sent == tokens[:2]
+
+
+# ── AsyncOllamaClient ────────────────────────────────────────────────────────
+
+
+def test_async_client_shares_health_and_backoff():
+    server = _Server()
+
+    async def scenario() -> list[str | None]:
+        client = AsyncOllamaClient(
+            transport=httpx.MockTransport(server), backoff_initial=60.0
+        )
+        results = [await client.generate("p")]
+        server.up = False
+        results.append(await client.generate("p"))
+        server.up = True
+        results.append(await client.generate("p"))  # still backing off
+        await client.aclose()
+        return results
+
+    assert asyncio.run(scenario()) == ['{"action":"idle"}', None, None]
+    assert server.heads == 0 and server.posts == 1
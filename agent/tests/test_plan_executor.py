@@ -0,0 +1,99 @@
+"""Tests for plan_executor — multi-step plans issued across ticks."""
+
+import json
+
+from models import ActionOption, GameState, ParsedAction
+from plan_executor import PlanExecutor, plan_steps
+from stub_backend import StubBackend
+from tools.replay import decide_on, fixture_state, wire_agent
+
+_OPTIONS = [
+    ActionOption(action="pick_up_item", target="cutgrass (4.1m)"),
+    ActionOption(action="craft_item", target="torch (twigsx2+cutgrassx2)"),
+]
+_PLAN = json.dumps(
+    {
+        "action": "pick_up_item",
+        "target": "twigs (3m)",
+        "reason": "torch",
+        "then": [
+            {"action": "pick_up_item", "target": "cutgrass"},
+            {"action": "craft_item", "target": "torch"},
+        ],
+    }
+)
+
+
+def _state(**fields) -> GameState:
+    return GameState(health=100, hunger=100, sanity=100, **fields)
+
+
+def _executor() -> PlanExecutor:
+    plan = PlanExecutor(max_steps=3)
+    plan.start(_PLAN, json.loads(_PLAN))
+    return plan
+
+
+def test_plan_steps_parsing():
+    assert [s["target"] for s in plan_steps(_PLAN, 3)] == ["cutgrass", "torch"]
+    assert len(plan_steps(_PLAN, 1)) == 1
+    assert plan_steps(_PLAN, 0) == []
+    assert plan_steps('{"action":"idle","reason":"r"}', 3) == []
+    assert plan_steps("not json", 3) == []
+
+
+def test_steps_issued_in_order_and_retargeted():
+    plan = _executor()
+    first = plan.next_step(_state(), _OPTIONS)
+    second = plan.next_step(_state(), _OPTIONS)
+    assert first["target"] == "cutgrass (4.1m)"
+    assert first["reason"] == "Plan step 2/3: torch"
+    assert second["target"] == "torch (twigsx2+cutgrassx2)"
+    assert plan.next_step(_state(), _OPTIONS) is None
+    assert (plan.stats.steps, plan.stats.completed) == (2, 1)
+
+
+def test_invalidation_reasons():
+    failed = _state(action_log=[{"result": "failed", "action": "pick_up_item"}])
+    threat = _state(threats=[{"name": "spider", "distance": 5.0}])
+    cases = [(failed, _OPTIONS, "failed"), (threat, _OPTIONS, "threat")]
+    cases.append((_state(), _OPTIONS[1:], "unavailable"))
+    for state, options, reason in cases:
+        plan = _executor()
+        assert plan.next_step(state, options) is None
+        assert not plan.active
+        assert plan.stats.invalidated[reason] == 1
+
+
+def test_schema_allows_then_only_when_enabled():
+    assert "then" not in ParsedAction.output_schema(_OPTIONS)["properties"]
+    schema = ParsedAction.output_schema(_OPTIONS, plan_steps=2)
+    assert schema["properties"]["then"]["maxItems"] == 2
+    assert "then" not in schema["required"]
+
+
+def test_agent_issues_plan_steps_without_llm_calls(tmp_path):
+    def policy(prompt: str) -> str:
+        assert "follow-up steps" in prompt
+        return json.dumps(
+            {
+                "action": "gather_resource",
+                "target": "twigs (6.3m)",
+                "reason": "sticks",
+                "then": [{"action": "gather_resource", "target": "cutgrass"}],
+            }
+        )
+
+    llm = StubBackend(policy)
+    agent, writer = wire_agent(tmp_path, llm, max_plan_steps=2)
+    payload = fixture_state("day1_fresh.json")
+    for seq in (1, 2, 3):
+        payload["hunger"] -= 10  # a new state each tick (one vital bucket)
+        decide_on(agent, tmp_path, payload, seq)
+    assert [a["target"] for a in writer.actions] == [
+        "twigs (6.3m)",
+        "cutgrass (7.1m)",
+        "twigs (6.3m)",
+    ]
+    assert llm.calls == 2
+    assert agent.plan.stats.steps == 1
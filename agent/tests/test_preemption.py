@@ -0,0 +1,108 @@
+"""Tests for preemption — cancelling inference a newer state makes moot."""
+
+import asyncio
+import contextlib
+import io
+import threading
+import time
+from pathlib import Path
+
+from async_runner import AsyncAgentRunner
+from models import GameState
+from preemption import PreemptionPolicy
+from stub_backend import StubBackend, first_valid_action
+from tools.replay import decide_on, fixture_state, publish_state, wire_agent
+
+
+def test_policy_reasons():
+    policy = PreemptionPolicy()
+    calm = GameState.model_validate(fixture_state("day1_fresh.json", health=100))
+
+    def reason(**fields):
+        after = GameState.model_validate(fixture_state("day1_fresh.json", **fields))
+        return policy.reason(calm, after)
+
+    assert reason(health=100) is None
+    assert reason(health=95) is None
+    assert reason(health=100, threats=[{"name": "spider", "distance": 6.0}]) == (
+        "threat"
+    )
+    assert reason(health=15) == "health"
+    assert reason(health=85) == "damage"
+    assert PreemptionPolicy(health_drop=None).reason(calm, calm) is None
+
+
+def test_worker_call_cancelled_by_threat(tmp_path):
+    def slow(prompt: str) -> str:
+        time.sleep(0.3)
+        return first_valid_action(prompt)
+
+    agent, writer = wire_agent(tmp_path, StubBackend(slow), deadline=0.05)
+    agent.preemption = PreemptionPolicy()
+    decide_on(agent, tmp_path, fixture_state("day1_fresh.json"), 1)  # deadline missed
+    decide_on(agent, tmp_path, fixture_state("low_health_hostile.json"), 2)
+    time.sleep(0.4)
+    assert writer.actions[-1]["action"] == "run_from_enemy"
+    assert not agent._worker.pending
+    stats = agent._worker.preemption
+    assert stats.cancelled == {"threat": 1}
+    assert 0.0 < stats.latency < stats.wasted
+
+
+def test_reflex_cancels_call_decide_waits_on(tmp_path):
+    def slow(prompt: str) -> str:
+        time.sleep(0.5)
+        return first_valid_action(prompt)
+
+    # No deadline: the call only runs on the worker so a reflex can cancel it
+    agent, writer = wire_agent(
+        tmp_path, StubBackend(slow), preemption=PreemptionPolicy(), reflexes=True
+    )
+    flee = {"action": "run_from_enemy", "reason": "spider"}
+    threading.Timer(0.05, agent.arbiter.reflex, args=(flee,)).start()
+    started = time.monotonic()
+    assert decide_on(agent, tmp_path, fixture_state("day1_fresh.json"), 1) is None
+    # decide() stops waiting at once; the orphaned call runs out unobserved
+    assert time.monotonic() - started < 0.3
+    time.sleep(0.6)
+    assert writer.actions == [flee]
+    assert agent._worker.preemption.cancelled == {"reflex": 1}
+
+
+def test_no_worker_without_a_way_to_cancel(tmp_path):
+    agent, _ = wire_agent(tmp_path, StubBackend(), preemption=PreemptionPolicy())
+    assert agent._worker is None  # sync loop, no deadline, no reflexes
+
+
+class _SlowLlm:
+    model = "slow"
+
+    async def generate(
+        self, prompt: str, schema: dict | None = None, options: list | None = None
+    ) -> str:
+        await asyncio.sleep(5.0)
+        return first_valid_action(prompt)
+
+
+async def _run_until_cancelled(runner: AsyncAgentRunner, workdir: Path) -> None:
+    publish_state(workdir, fixture_state("day1_fresh.json"), 1)
+    task = asyncio.create_task(runner.run())
+    await asyncio.sleep(0.05)  # first inference in flight
+    # Damaged but not critical: still a decision for the LLM
+    publish_state(workdir, fixture_state("day1_fresh.json", health=120), 2)
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+def test_async_runner_cancels_by_policy(tmp_path):
+    llm = _SlowLlm()
+    agent, _ = wire_agent(tmp_path, llm)
+    agent.preemption = PreemptionPolicy()
+    runner = AsyncAgentRunner(agent, llm, poll_interval=0.01)
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(_run_until_cancelled(runner, tmp_path))
+    assert runner.stats.cancelled == 1
+    assert runner.preemption.cancelled == {"damage": 1}
+    assert runner.preemption.wasted > 0.0
@@ -0,0 +1,91 @@
+"""Tests for the prompt token budget — section priorities and shrinking."""
+
+import json
+from pathlib import Path
+
+from models import ActionOption, GameState
+from prompt import build_prompt, create_default_builder, last_report
+from prompt.budget import estimate_tokens
+from prompt.sections.base import Priority
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+_OPTIONS = [ActionOption(action="pick_up_item", target="flint (3.2m)")]
+_MEMORY = [{"text": f"event {i} happened nearby", "source": "event"} for i in range(10)]
+
+
+def _state() -> GameState:
+    return GameState.model_validate(
+        json.loads((FIXTURES / "day2_spring_inventory.json").read_text())
+    )
+
+
+def _build(builder, max_tokens: int | None = None) -> str:
+    return builder.build(
+        _state(),
+        _OPTIONS,
+        "Gather flint",
+        _MEMORY,
+        world_history="spider (20m)",
+        max_tokens=max_tokens,
+    )
+
+
+def _tokens(builder) -> dict[str, int]:
+    return {s.name: s.tokens for s in builder.last_report.sections}
+
+
+def test_no_budget_leaves_prompt_unchanged():
+    builder = create_default_builder()
+    prompt = _build(builder)
+    report = builder.last_report
+    assert not report.shrunk()
+    assert report.total == estimate_tokens(prompt)
+
+
+def test_low_priority_sections_shrink_first():
+    builder = create_default_builder()
+    _build(builder)
+    full = _tokens(builder)
+    prompt = _build(builder, max_tokens=builder.last_report.total - 60)
+    report = builder.last_report
+    assert report.total <= report.budget
+    assert estimate_tokens(prompt) == report.total
+    shrunk = {s.name for s in report.shrunk()}
+    assert shrunk and shrunk <= {"Memory", "Nearby", "WorldHistory"}
+    assert _tokens(builder)["Status"] == full["Status"]
+    assert "[VALID_ACTIONS]" in prompt
+
+
+def test_memory_and_nearby_are_trimmed_before_dropped():
+    builder = create_default_builder()
+    _build(builder)
+    nearby = _tokens(builder)["Nearby"]
+    prompt = _build(builder, max_tokens=builder.last_report.total - nearby // 3)
+    assert "[NEARBY]" in prompt
+    assert 0 < _tokens(builder)["Nearby"] < nearby
+
+
+def test_required_sections_survive_any_budget():
+    builder = create_default_builder()
+    prompt = _build(builder, max_tokens=10)
+    report = builder.last_report
+    assert report.over_budget
+    assert "[VALID_ACTIONS]" in prompt
+    kept = {s.name for s in report.sections if s.tokens}
+    assert kept == {s.name for s in report.sections if s.priority == Priority.REQUIRED}
+
+
+def test_per_section_cap():
+    builder = create_default_builder()
+    memory = next(s for s in builder.sections if type(s).__name__ == "MemorySection")
+    memory.max_tokens = 20
+    _build(builder)
+    assert 0 < _tokens(builder)["Memory"] <= 20
+
+
+def test_build_prompt_reports_per_layout():
+    build_prompt(_state(), _MEMORY, valid_actions=_OPTIONS, max_tokens=200)
+    report = last_report()
+    assert report.budget == 200
+    assert report.total <= 200
+    assert "total" in report.format()
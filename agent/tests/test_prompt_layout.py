@@ -0,0 +1,40 @@
+"""Tests for the prefix-stable prompt layout."""
+
+import os
+
+from benchmarks.bench_prompt_prefix import capture, simulate
+from prompt import create_default_builder, create_prefix_stable_builder
+from prompt.sections.actions import RESPONSE_FORMAT
+from prompt.sections.base import Stability
+
+
+def test_sections_ordered_by_stability():
+    sections = create_prefix_stable_builder().sections
+    ranks = [s.stability for s in sections]
+    assert ranks == sorted(ranks)
+    assert ranks[0] == Stability.STATIC
+    assert len(sections) == len(create_default_builder().sections) + 1
+
+
+def test_same_content_response_format_once():
+    records = simulate(3)
+    default = capture(records, "default")
+    stable = capture(records, "prefix-stable")
+    assert len(stable) == len(default) == 3
+    for a, b in zip(default, stable):
+        assert b.count(RESPONSE_FORMAT) == 1
+        assert sorted(a.splitlines()) == sorted(b.splitlines())
+    assert stable[0].index(RESPONSE_FORMAT) < stable[0].index("[STATUS]")
+    assert stable[0].rstrip().endswith("[/VALID_ACTIONS]")
+
+
+def test_consecutive_prompts_share_longer_prefix():
+    records = simulate(10)
+
+    def mean_shared(prompts: list[str]) -> float:
+        pairs = list(zip(prompts, prompts[1:]))
+        return sum(len(os.path.commonprefix(p)) for p in pairs) / len(pairs)
+
+    assert mean_shared(capture(records, "prefix-stable")) > 1.5 * mean_shared(
+        capture(records, "default")
+    )
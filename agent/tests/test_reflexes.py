@@ -0,0 +1,83 @@
+"""Tests for reflexes — reflex rules, the reflex loop and write arbitration."""
+
+import contextlib
+import io
+import json
+
+from clock import VirtualClock
+from models import GameState
+from reflexes import ActionArbiter, ReflexLoop, darkness_action, reflex_action
+from stub_backend import StubBackend
+from tools.replay import (
+    CollectingWriter,
+    decide_on,
+    fixture_state,
+    publish_state,
+    wire_agent,
+)
+
+_SPIDER = {"name": "spider", "type": "hostile", "distance": 4.0}
+
+
+def test_rules():
+    def state(**fields):
+        return GameState.model_validate(fixture_state("day1_fresh.json", **fields))
+
+    assert reflex_action(state(health=10))["action"] == "eat_food"
+    assert reflex_action(state(threats=[_SPIDER]))["action"] == "run_from_enemy"
+    assert reflex_action(state()) is None
+    dark = fixture_state("night_no_fire.json", phase="night")
+    assert darkness_action(GameState.model_validate(dark)) == {
+        "action": "craft_item:torch",
+        "reason": "Darkness — light a torch now",
+    }
+    dark["inventory"] = []
+    assert darkness_action(GameState.model_validate(dark)) is None
+
+
+def test_arbiter_skips_repeats_and_superseded():
+    clock, writer = VirtualClock(100.0), CollectingWriter()
+    arbiter = ActionArbiter(writer, repeat_after=2.0, clock=clock)
+    run = {"action": "run_from_enemy", "reason": "spider"}
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        assert arbiter.reflex(run)
+        clock.sleep(1.0)
+        assert not arbiter.reflex(run)
+        assert not arbiter.deliberate({"action": "explore", "reason": "r"}, 99.0)
+        assert arbiter.deliberate({"action": "explore", "reason": "r"}, 100.5)
+        clock.sleep(1.5)
+        assert arbiter.reflex(run)
+    # Only written reflexes are logged, not the suppressed repeat
+    assert log.getvalue().count("[ReflexLoop] run_from_enemy: spider") == 2
+    assert [a["action"] for a in writer.actions] == [
+        "run_from_enemy",
+        "explore",
+        "run_from_enemy",
+    ]
+    stats = arbiter.stats
+    assert (stats.reflexes["run_from_enemy"], stats.repeats_skipped) == (2, 1)
+    assert (stats.deliberations, stats.superseded) == (1, 1)
+
+
+def test_reflex_preempts_deliberation(tmp_path):
+    state_file = tmp_path / "game_state.json"
+    clock = VirtualClock(1000.0)
+
+    def policy(prompt: str) -> str:
+        # A spider shows up while the model is thinking
+        clock.sleep(0.5)
+        publish_state(tmp_path, fixture_state("day1_fresh.json", threats=[_SPIDER]), 2)
+        assert loop.check()["action"] == "run_from_enemy"
+        clock.sleep(3.0)
+        return json.dumps({"action": "explore", "target": "N", "reason": "look"})
+
+    agent, writer = wire_agent(tmp_path, StubBackend(policy), clock=clock)
+    agent.arbiter = ActionArbiter(writer, clock=clock)
+    loop = ReflexLoop(state_file, agent.arbiter)
+    state = fixture_state("day1_fresh.json")
+    publish_state(tmp_path, state, 1)
+    assert loop.check() is None  # nothing critical in the first snapshot
+    decide_on(agent, tmp_path, state, 1)
+    assert [a["action"] for a in writer.actions] == ["run_from_enemy"]
+    assert agent.arbiter.stats.superseded == 1
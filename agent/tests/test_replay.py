@@ -0,0 +1,55 @@
+"""Tests for tools.replay — deterministic replay through DSAIAgent.decide()."""
+
+from pathlib import Path
+
+from clock import VirtualClock
+from state_recorder import StateRecorder
+from stub_backend import first_valid_action
+from tools.replay import load_records, replay
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+def test_first_valid_action_picks_first_offer():
+    prompt = (
+        "[VALID_ACTIONS]\n"
+        '  {"action":"chop_tree", "targets":["evergreen", "birchnut"]}\n'
+        '  {"action":"explore", "targets":["N"]}\n'
+        "[/VALID_ACTIONS]"
+    )
+    assert '"chop_tree"' in first_valid_action(prompt)
+    assert '"evergreen"' in first_valid_action(prompt)
+
+
+def test_replay_is_deterministic():
+    records = load_records(FIXTURES)
+    first = replay(records, repeat=3)
+    second = replay(records, repeat=3)
+    assert first.ticks == 3 * len(records)
+    assert first.decisions > 0
+    assert [a["action"] for a in first.actions] == [a["action"] for a in second.actions]
+
+
+def test_replay_reports_stage_timings():
+    result = replay(load_records(FIXTURES))
+    for stage in ("read", "trackers", "planner", "prompt", "llm"):
+        assert stage in result.timer.stages
+    assert result.timer.stages["read"].calls == result.ticks
+
+
+def test_replay_reads_recorded_trace(tmp_path):
+    trace = tmp_path / "session.trace.gz"
+    recorder = StateRecorder(trace)
+    for i, rec in enumerate(load_records(FIXTURES)):
+        recorder.record(rec.payload, seq=i, timestamp=1000.0 + i)
+    recorder.close()
+
+    result = replay(load_records(trace))
+    assert result.ticks == len(list(FIXTURES.glob("*.json")))
+
+
+def test_virtual_clock_sleep_advances_instantly():
+    clock = VirtualClock(100.0)
+    clock.sleep(5.0)
+    clock.set(90.0)  # never goes backwards
+    assert clock.time() == 105.0
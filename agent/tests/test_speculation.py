@@ -0,0 +1,122 @@
+"""Tests for speculation — predicted next states and speculative LLM calls."""
+
+import json
+import time
+from pathlib import Path
+
+from decision_cache import target_base
+from models import GameState
+from speculation import predict_state
+from stub_backend import StubBackend, first_valid_action
+from tools.replay import decide_on, fixture_state, wire_agent
+
+_FLINT = {"action": "pick_up_item", "target": "flint (15.8m)", "reason": "sharp"}
+
+
+def _state(fixture: str) -> GameState:
+    return GameState.model_validate(fixture_state(fixture))
+
+
+def _decide(agent, workdir: Path, state: GameState, seq: int) -> dict:
+    action = decide_on(agent, workdir, state, seq)
+    if agent.speculator.pending:
+        agent.speculator.worker._job.result()  # let the stub answer
+    return action
+
+
+def test_predict_pick_up_and_craft():
+    state = _state("day1_fresh.json")
+    after = predict_state(state, _FLINT)
+    assert after.inventory_view["flint"] == 1
+    assert "flint" not in {e.name for e in after.nearby_entities}
+    assert len(state.nearby_entities) == len(after.nearby_entities) + 1
+
+    night = _state("night_no_fire.json")
+    torch = {"action": "craft_item", "target": "torch (twigsx2+cutgrassx2)"}
+    assert dict(predict_state(night, torch).inventory_view) == {
+        "twigs": 10,
+        "cutgrass": 6,
+        "torch": 1,
+    }
+    assert predict_state(state, {"action": "explore", "target": "N"}) is None
+
+
+def _picked_up_flint(state: GameState) -> GameState:
+    """The pick-up happened as predicted; the player walked a few metres."""
+    real = predict_state(state, _FLINT).model_dump()
+    for entity in real["nearby_entities"]:
+        entity["distance"] += 2.5
+    return GameState.model_validate(real)
+
+
+def test_matching_state_uses_speculative_answer(tmp_path):
+    speculated: list[dict] = []
+
+    def speculate(prompt: str) -> str:
+        speculated.append(json.loads(first_valid_action(prompt)))
+        return json.dumps(speculated[-1])
+
+    llm = StubBackend(lambda prompt: json.dumps(_FLINT))
+    spec_llm = StubBackend(speculate)
+    agent, writer = wire_agent(tmp_path, llm, speculation_llm=spec_llm)
+    state = _state("day1_fresh.json")
+    _decide(agent, tmp_path, state, 1)
+    assert agent.speculator.stats.started == 1
+
+    real = _picked_up_flint(state)
+    _decide(agent, tmp_path, real, 2)
+    stats = agent.speculator.stats
+    assert (stats.hits, stats.misses) == (1, 0)
+    assert llm.calls == 1  # no fresh call for the real state
+    # The speculated target is rewritten to the real state's distance
+    emitted, guess = writer.actions[-1], speculated[0]
+    assert emitted["action"] == guess["action"]
+    assert target_base(emitted["target"]) == target_base(guess["target"])
+    assert emitted["target"] != guess["target"]
+
+
+def test_stale_speculative_answer_falls_through(tmp_path):
+    llm = StubBackend(first_valid_action)
+    # Picks the flint again, which the real state no longer offers
+    spec_llm = StubBackend(lambda prompt: json.dumps(_FLINT))
+    agent, writer = wire_agent(tmp_path, llm, speculation_llm=spec_llm)
+    state = _state("day1_fresh.json")
+    _decide(agent, tmp_path, state, 1)
+    _decide(agent, tmp_path, _picked_up_flint(state), 2)
+    stats = agent.speculator.stats
+    assert (stats.hits, stats.stale) == (0, 1)
+    assert llm.calls == 2  # the real state got its own call
+    assert writer.actions[-1] != _FLINT
+
+
+def test_different_state_cancels_speculation(tmp_path):
+    llm = StubBackend(lambda prompt: json.dumps(_FLINT))
+    agent, writer = wire_agent(tmp_path, llm, speculation_llm=StubBackend(llm.policy))
+    _decide(agent, tmp_path, _state("day1_fresh.json"), 1)
+    _decide(agent, tmp_path, _state("day2_spring_inventory.json"), 2)
+    stats = agent.speculator.stats
+    assert (stats.hits, stats.misses) == (0, 1)
+    assert len(writer.actions) == 2
+
+
+def test_late_speculative_call_is_adopted_not_restarted(tmp_path):
+    def slow(prompt: str) -> str:
+        time.sleep(0.3)
+        return first_valid_action(prompt)
+
+    llm = StubBackend(lambda prompt: json.dumps(_FLINT))
+    spec_llm = StubBackend(slow)
+    agent, _ = wire_agent(tmp_path, llm, deadline=0.05, speculation_llm=spec_llm)
+    state = _state("day1_fresh.json")
+    real = _picked_up_flint(state)
+    hungrier = real.model_copy(update={"hunger": real.hunger - 20})
+    decide_on(agent, tmp_path, state, 1)
+    decide_on(agent, tmp_path, real, 2)
+    # Matched but slow: deadline fallback now, the call keeps running
+    assert agent.speculator.stats.late == 1
+    assert agent._worker.pending
+    assert agent.deadline_stats.missed == 1
+    time.sleep(0.35)
+    decide_on(agent, tmp_path, hungrier, 3)
+    assert agent.deadline_stats.late_used == 1
+    assert llm.calls == 1  # the matched prompt was never sent again
@@ -0,0 +1,154 @@
+"""Tests for state_delta — keyframe + patch encoding and StateReader applying it."""
+
+import pytest
+
+from models import GameState
+from state_delta import DeltaError, apply_delta, encode, make_delta
+from state_handoff import write_atomic
+from state_reader import StateReader, patch_state
+from tools.debug_cli.state_loader import StateLoader, StateLoadError
+
+
+def _ent(name: str, distance: float) -> dict:
+    return {"name": name, "type": "harvestable", "distance": distance}
+
+
+_KEYFRAME = {
+    "day": 2,
+    "health": 100,
+    "hunger": 90,
+    "sanity": 150,
+    "equipped": "axe",
+    "inventory": ["log x2"],
+    "nearby_entities": [_ent("sapling", 3.0), _ent("grass", 5.0), _ent("flint", 8.0)],
+    "speech_log": ["Take that, nature!"],
+}
+
+
+# ── apply_delta / make_delta ─────────────────────────────────────────────────
+
+
+def test_roundtrip_field_changes():
+    current = dict(_KEYFRAME, health=95, speech_log=[])
+    patch = make_delta(_KEYFRAME, current)
+    assert "health" in patch["set"]
+    assert "hunger" not in patch["set"]
+    assert apply_delta(_KEYFRAME, patch) == current
+
+
+def test_roundtrip_unset_field():
+    current = {k: v for k, v in _KEYFRAME.items() if k != "equipped"}
+    patch = make_delta(_KEYFRAME, current)
+    assert patch["unset"] == ["equipped"]
+    assert apply_delta(_KEYFRAME, patch) == current
+
+
+def test_entity_add_remove_keeps_distance_order():
+    current = dict(
+        _KEYFRAME,
+        nearby_entities=[_ent("sapling", 3.0), _ent("rocks", 4.0), _ent("grass", 5.0)],
+    )
+    patch = make_delta(_KEYFRAME, current)
+    assert patch["entities_added"] == [_ent("rocks", 4.0)]
+    assert patch["entities_removed"] == [_ent("flint", 8.0)]
+    assert apply_delta(_KEYFRAME, patch) == current
+
+
+def test_high_churn_resends_entity_list():
+    current = dict(_KEYFRAME, nearby_entities=[_ent("evergreen", 2.0)])
+    patch = make_delta(_KEYFRAME, current)
+    assert patch["set"]["nearby_entities"] == [_ent("evergreen", 2.0)]
+    assert apply_delta(_KEYFRAME, patch) == current
+
+
+def test_log_buffers_always_sent():
+    patch = make_delta(_KEYFRAME, dict(_KEYFRAME))
+    assert patch["set"] == {"speech_log": ["Take that, nature!"]}
+
+
+def test_removed_entity_missing_from_keyframe():
+    with pytest.raises(DeltaError):
+        apply_delta(_KEYFRAME, {"entities_removed": [_ent("spider", 1.0)]})
+
+
+# ── patch_state ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    "current",
+    [
+        dict(_KEYFRAME, health=95, inventory=["log x3"], speech_log=[]),
+        {k: v for k, v in _KEYFRAME.items() if k != "equipped"},
+        dict(
+            _KEYFRAME,
+            nearby_entities=[
+                _ent("sapling", 3.0),
+                _ent("rocks", 4.0),
+                _ent("grass", 5.0),
+            ],
+        ),
+    ],
+)
+def test_patch_state_matches_full_validation(current):
+    keyframe = GameState.model_validate(_KEYFRAME)
+    assert keyframe.inventory_view["log"] == 2  # cached on the keyframe
+    patched = patch_state(keyframe, make_delta(_KEYFRAME, current))
+    assert patched == GameState.model_validate(current)
+    assert dict(patched.inventory_view) == dict(
+        GameState.model_validate(current).inventory_view
+    )
+
+
+def test_patch_state_rejects_unknown_removal():
+    keyframe = GameState.model_validate(_KEYFRAME)
+    with pytest.raises(DeltaError):
+        patch_state(keyframe, {"entities_removed": [_ent("spider", 1.0)]})
+
+
+# ── StateReader ───────────────────────────────────────────────────────────────
+
+
+def test_reader_applies_delta_to_keyframe(tmp_path):
+    path = tmp_path / "game_state.json"
+    reader = StateReader(path)
+    write_atomic(path, encode(_KEYFRAME), 10, keyframe=True)
+    assert reader.read().health == 100
+
+    current = dict(_KEYFRAME, health=80)
+    write_atomic(path, encode(make_delta(_KEYFRAME, current)), 11, base=10)
+    state = reader.read()
+    assert state.health == 80
+    assert [e.name for e in state.nearby_entities] == ["sapling", "grass", "flint"]
+    assert reader.stats.deltas == 1
+    # The full document is only rebuilt when someone asks for it
+    assert reader._payload is None
+    assert reader.last_payload == encode(current)
+
+
+def test_reader_joining_mid_stream_fetches_keyframe_file(tmp_path):
+    path = tmp_path / "game_state.json"
+    write_atomic(tmp_path / "game_state.keyframe.json", encode(_KEYFRAME), 10, True)
+    patch = make_delta(_KEYFRAME, dict(_KEYFRAME, hunger=40))
+    write_atomic(path, encode(patch), 13, base=10)
+    assert StateReader(path).read().hunger == 40
+
+
+def test_reader_without_matching_keyframe_fails_after_budget(tmp_path):
+    path = tmp_path / "game_state.json"
+    write_atomic(tmp_path / "game_state.keyframe.json", encode(_KEYFRAME), 20, True)
+    write_atomic(path, encode(make_delta(_KEYFRAME, _KEYFRAME)), 13, base=10)
+    reader = StateReader(path, retry_budget=0.02, retry_interval=0.005)
+    assert reader.read() is None
+
+
+def test_debug_loader_applies_delta_or_names_keyframe(tmp_path):
+    path = tmp_path / "game_state.json"
+    write_atomic(tmp_path / "game_state.keyframe.json", encode(_KEYFRAME), 10, True)
+    write_atomic(
+        path, encode(make_delta(_KEYFRAME, dict(_KEYFRAME, hunger=40))), 11, base=10
+    )
+    assert StateLoader.load(path).hunger == 40
+
+    write_atomic(tmp_path / "game_state.keyframe.json", encode(_KEYFRAME), 12, True)
+    with pytest.raises(StateLoadError, match="delta against keyframe 10"):
+        StateLoader.load(path)
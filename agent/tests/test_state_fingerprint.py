@@ -0,0 +1,123 @@
+"""Tests for state_fingerprint — raw vs semantic change detection."""
+
+from models import GameState
+from state_fingerprint import (
+    FingerprintConfig,
+    FingerprintEngine,
+    raw_fingerprint,
+    semantic_key,
+)
+
+
+def _state(**fields) -> GameState:
+    base = {"health": 100, "hunger": 100, "sanity": 150}
+    base.update(fields)
+    return GameState(**base)
+
+
+def _ent(name: str, distance: float, type_: str = "harvestable") -> dict:
+    return {"name": name, "type": type_, "distance": distance}
+
+
+# ── semantic_key ──────────────────────────────────────────────────────────────
+
+
+def test_distance_jitter_ignored():
+    a = _state(nearby_entities=[_ent("sapling", 5.1)])
+    b = _state(nearby_entities=[_ent("sapling", 5.9)])
+    assert semantic_key(a) == semantic_key(b)
+
+
+def test_distance_bucket_change_detected():
+    a = _state(nearby_entities=[_ent("sapling", 5.0)])
+    b = _state(nearby_entities=[_ent("sapling", 13.0)])
+    assert semantic_key(a) != semantic_key(b)
+
+
+def test_entity_order_irrelevant():
+    a = _state(nearby_entities=[_ent("sapling", 5.0), _ent("grass", 7.0)])
+    b = _state(nearby_entities=[_ent("grass", 7.0), _ent("sapling", 5.0)])
+    assert semantic_key(a) == semantic_key(b)
+
+
+def test_time_of_day_bucketed():
+    assert semantic_key(_state(time_of_day=0.30)) == semantic_key(
+        _state(time_of_day=0.32)
+    )
+    assert semantic_key(_state(time_of_day=0.74)) != semantic_key(
+        _state(time_of_day=0.76)
+    )
+
+
+def test_log_buffers_ignored_by_default():
+    a = _state(speech_log=["Take that, nature!"])
+    b = _state(speech_log=[])
+    assert semantic_key(a) == semantic_key(b)
+
+
+def test_log_buffers_included_when_configured():
+    cfg = FingerprintConfig(ignored_fields=frozenset())
+    a = _state(speech_log=["Take that, nature!"])
+    b = _state(speech_log=[])
+    assert semantic_key(a, cfg) != semantic_key(b, cfg)
+
+
+def test_failed_action_kept_when_logs_ignored():
+    done = {"result": "success", "action": "chop_tree"}
+    failed = {"result": "failed", "action": "chop_tree", "reason": "no axe"}
+    assert semantic_key(_state(action_log=[done])) == semantic_key(_state())
+    assert semantic_key(_state(action_log=[failed])) != semantic_key(_state())
+
+
+def test_inventory_change_detected():
+    assert semantic_key(_state(inventory=["log x2"])) != semantic_key(
+        _state(inventory=["log x3"])
+    )
+
+
+# ── FingerprintEngine ─────────────────────────────────────────────────────────
+
+
+def test_first_observation_is_a_change():
+    change = FingerprintEngine().observe(_state(), raw_fingerprint(b"a"))
+    assert change.bytes_changed and change.decision_changed
+
+
+def test_identical_bytes_short_circuit():
+    engine = FingerprintEngine()
+    engine.observe(_state(), raw_fingerprint(b"a"))
+    change = engine.observe(_state(), raw_fingerprint(b"a"))
+    assert not change.bytes_changed and not change.decision_changed
+
+
+def test_bytes_changed_but_not_decision_relevant():
+    engine = FingerprintEngine()
+    engine.observe(_state(time_of_day=0.30), raw_fingerprint(b"a"))
+    change = engine.observe(_state(time_of_day=0.31), raw_fingerprint(b"b"))
+    assert change.bytes_changed
+    assert not change.decision_changed
+
+
+def test_draining_hunger_changes_once_per_bucket():
+    engine = FingerprintEngine()
+    changes = [
+        engine.observe(_state(hunger=100 - i * 0.5), raw_fingerprint(bytes([i])))
+        for i in range(41)  # 100 -> 80, one export at a time
+    ]
+    assert sum(c.decision_changed for c in changes) == 3  # first, <100, <90
+    assert all(c.bytes_changed for c in changes)
+
+
+def test_failure_only_snapshot_is_a_change():
+    engine = FingerprintEngine()
+    engine.observe(_state(), raw_fingerprint(b"a"))
+    failed = {"result": "failed", "action": "pick_up_item", "reason": "blocked"}
+    change = engine.observe(_state(action_log=[failed]), raw_fingerprint(b"b"))
+    assert change.decision_changed
+
+
+def test_reset_forces_change():
+    engine = FingerprintEngine()
+    engine.observe(_state(), raw_fingerprint(b"a"))
+    engine.reset()
+    assert engine.observe(_state(), raw_fingerprint(b"a")).decision_changed
@@ -0,0 +1,74 @@
+"""Tests for the game_state.json handoff envelope and torn-read handling."""
+
+import pytest
+
+from state_handoff import TornReadError, pack, unpack, write_atomic
+from state_reader import StateReader
+from tools.handoff_stress import run_stress
+
+_PAYLOAD = b'{"day": 2, "health": 100, "hunger": 100, "sanity": 100}'
+
+
+# ── envelope ──────────────────────────────────────────────────────────────────
+
+
+def test_pack_unpack_roundtrip():
+    env = unpack(pack(_PAYLOAD, 7))
+    assert env.seq == 7
+    assert env.payload == _PAYLOAD
+
+
+def test_legacy_file_without_header():
+    env = unpack(_PAYLOAD)
+    assert env.seq is None
+    assert env.payload == _PAYLOAD
+
+
+def test_truncated_payload_is_torn():
+    with pytest.raises(TornReadError):
+        unpack(pack(_PAYLOAD, 1)[:-5])
+
+
+def test_truncated_header_is_torn():
+    with pytest.raises(TornReadError):
+        unpack(b"#DSLLM1 12")
+
+
+# ── StateReader ───────────────────────────────────────────────────────────────
+
+
+def test_reader_tracks_sequence(tmp_path):
+    path = tmp_path / "game_state.json"
+    reader = StateReader(path)
+    write_atomic(path, _PAYLOAD, 41)
+    assert reader.read().day == 2
+    assert reader.last_seq == 41
+
+
+def test_reader_gives_up_after_budget(tmp_path):
+    path = tmp_path / "game_state.json"
+    path.write_bytes(pack(_PAYLOAD, 1)[:-3])
+    reader = StateReader(path, retry_budget=0.02, retry_interval=0.005)
+    assert reader.read() is None
+    assert reader.stats.failed == 1
+    assert reader.stats.retried >= 1
+
+
+def test_header_change_alone_is_not_a_new_snapshot(tmp_path):
+    path = tmp_path / "game_state.json"
+    reader = StateReader(path)
+    write_atomic(path, _PAYLOAD, 1)
+    reader.has_changed(reader.read())
+    write_atomic(path, _PAYLOAD, 2)
+    assert reader.has_changed(reader.read()) is False
+    assert reader.last_change.bytes_changed is False  # only the seq moved
+
+
+# ── concurrent rewrites ───────────────────────────────────────────────────────
+
+
+def test_atomic_writer_never_loses_a_read(tmp_path):
+    result = run_stress(tmp_path / "game_state.json", seconds=0.5)
+    assert result.writes > 10
+    assert result.lost == 0
+    assert result.seq_regressions == 0
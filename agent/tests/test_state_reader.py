@@ -1,9 +1,10 @@
 """Tests for StateReader — file reading, change detection, death/reset detection."""
 
 import json
+import os
 import pytest
 from pathlib import Path
-from state_reader import StateReader
+from state_reader import ParseMode, StateReader
 
 from models import GameState
 
@@ -55,13 +56,26 @@ def test_same_state_not_changed(reader):
 
 
 def test_different_state_changed(reader):
-    reader.has_changed({"day": 1, "health": 100})
-    assert reader.has_changed({"day": 1, "health": 80}) is True
+    reader.has_changed(GameState(day=1, health=100, hunger=100, sanity=100))
+    assert (
+        reader.has_changed(GameState(day=1, health=80, hunger=100, sanity=100)) is True
+    )
 
 
 def test_key_order_irrelevant(reader):
-    reader.has_changed({"a": 1, "b": 2})
-    assert reader.has_changed({"b": 2, "a": 1}) is False
+    a = {"name": "sapling", "type": "harvestable", "distance": 5.0}
+    b = {"name": "grass", "type": "harvestable", "distance": 7.0}
+    vitals = {"health": 100, "hunger": 100, "sanity": 100}
+    reader.has_changed(GameState(nearby_entities=[a, b], **vitals))
+    assert reader.has_changed(GameState(nearby_entities=[b, a], **vitals)) is False
+
+
+def test_distance_jitter_not_a_change(reader):
+    vitals = {"health": 100, "hunger": 100, "sanity": 100}
+    ent = {"name": "sapling", "type": "harvestable", "distance": 5.0}
+    reader.has_changed(GameState(nearby_entities=[ent], **vitals))
+    moved = dict(ent, distance=5.4)
+    assert reader.has_changed(GameState(nearby_entities=[moved], **vitals)) is False
 
 
 # ── is_game_over ──────────────────────────────────────────────────────────────
@@ -99,3 +113,76 @@ def test_world_reset_not_triggered_on_first_day(reader):
 def test_world_reset_not_triggered_on_normal_progression(reader):
     reader.is_world_reset({"day": 3})
     assert reader.is_world_reset({"day": 4}) is False
+
+
+# ── is_modified / read counters ───────────────────────────────────────────────
+
+
+def _write_state(state_file: Path, **fields) -> None:
+    state = GameState(health=100, hunger=100, sanity=100, **fields)
+    state_file.write_text(state.model_dump_json())
+
+
+def test_missing_file_counts_as_modified(reader):
+    assert reader.is_modified() is True
+
+
+def test_unread_file_is_modified(reader, state_file):
+    _write_state(state_file)
+    assert reader.is_modified() is True
+
+
+def test_untouched_file_skipped_after_read(reader, state_file):
+    _write_state(state_file)
+    assert reader.read() is not None
+    assert reader.is_modified() is False
+    assert reader.is_modified() is False
+    assert reader.stats.parsed == 1
+    assert reader.stats.skipped == 2
+
+
+def test_rewrite_detected_by_stat(reader, state_file):
+    _write_state(state_file, day=1)
+    reader.read()
+    _write_state(state_file, day=2)
+    os.utime(state_file, ns=(0, 12345))  # force a distinct mtime on coarse clocks
+    assert reader.is_modified() is True
+
+
+def test_failed_parse_counted_and_not_remembered(reader, state_file):
+    state_file.write_text("not json {{{")
+    assert reader.read() is None
+    assert reader.stats.failed == 1
+    assert reader.is_modified() is True  # never cache a signature for bad data
+
+
+def test_hash_mode_skips_identical_rewrite(state_file):
+    reader = StateReader(state_file, hash_bytes=True)
+    _write_state(state_file, day=3)
+    reader.read()
+    _write_state(state_file, day=3)
+    os.utime(state_file, ns=(0, 12345))
+    assert reader.is_modified() is False
+    assert reader.stats.skipped == 1
+
+
+def test_hash_mode_reuses_bytes_for_read(state_file):
+    reader = StateReader(state_file, hash_bytes=True)
+    _write_state(state_file, day=3)
+    reader.read()
+    _write_state(state_file, day=4)
+    os.utime(state_file, ns=(0, 12345))
+    assert reader.is_modified() is True
+    assert reader.read().day == 4
+
+
+# ── parse modes ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("mode", list(ParseMode))
+def test_every_mode_parses_fixture(state_file, mode):
+    fixture = Path(__file__).parent.parent / "fixtures" / "day1_fresh.json"
+    state_file.write_bytes(fixture.read_bytes())
+    state = StateReader(state_file, mode=mode).read()
+    assert state is not None
+    assert state.nearby_entities[0].name == "evergreen"
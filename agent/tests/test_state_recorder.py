@@ -0,0 +1,89 @@
+"""Tests for state_recorder — chunked gzip trace + index."""
+
+import gzip
+import threading
+
+from clock import VirtualClock
+from state_recorder import StateRecorder, iter_trace, read_index
+
+
+def _payload(health: int) -> bytes:
+    return f'{{"health":{health},"hunger":100,"sanity":150}}'.encode()
+
+
+def test_roundtrip_records_in_order(tmp_path):
+    trace = tmp_path / "session.trace.gz"
+    recorder = StateRecorder(trace, chunk_records=2)
+    for i in range(5):
+        recorder.record(_payload(100 - i), seq=i, timestamp=1000.0 + i)
+    recorder.close()
+
+    records = list(iter_trace(trace))
+    assert [r.seq for r in records] == [0, 1, 2, 3, 4]
+    assert records[2].payload == _payload(98)
+    assert records[2].timestamp == 1002.0
+    assert [c.records for c in read_index(trace)] == [2, 2, 1]
+
+
+def test_consecutive_duplicates_skipped(tmp_path):
+    trace = tmp_path / "session.trace.gz"
+    recorder = StateRecorder(trace)
+    recorder.record(_payload(100), seq=1)
+    recorder.record(_payload(100), seq=2)
+    recorder.record(_payload(90), seq=3)
+    recorder.close()
+
+    assert [r.seq for r in iter_trace(trace)] == [1, 3]
+    assert recorder.stats.duplicates == 1
+
+
+def test_timestamps_follow_injected_clock(tmp_path):
+    trace = tmp_path / "session.trace.gz"
+    clock = VirtualClock(5000.0)
+    recorder = StateRecorder(trace, clock=clock)
+    recorder.record(_payload(100), seq=1)
+    clock.sleep(2.5)
+    recorder.record(_payload(90), seq=2)
+    recorder.close()
+
+    assert [r.timestamp for r in iter_trace(trace)] == [5000.0, 5002.5]
+
+
+def test_index_limits_time_range(tmp_path):
+    trace = tmp_path / "session.trace.gz"
+    recorder = StateRecorder(trace, chunk_records=1)
+    for i in range(4):
+        recorder.record(_payload(i), seq=i, timestamp=float(i))
+    recorder.close()
+
+    assert [r.seq for r in iter_trace(trace, start=1.0, end=2.0)] == [1, 2]
+
+
+def test_trace_is_plain_multi_member_gzip(tmp_path):
+    trace = tmp_path / "session.trace.gz"
+    recorder = StateRecorder(trace, chunk_records=1)
+    recorder.record(_payload(1), seq=1)
+    recorder.record(_payload(2), seq=2)
+    recorder.close()
+
+    with gzip.open(trace, "rb") as f:
+        assert f.read().count(b'"health"') == 2
+    trace.with_name(trace.name + ".idx").unlink()
+    assert [r.seq for r in iter_trace(trace)] == [1, 2]
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    release = threading.Event()
+
+    class StalledRecorder(StateRecorder):
+        def _add(self, *item):
+            release.wait()
+            super()._add(*item)
+
+    recorder = StalledRecorder(tmp_path / "session.trace.gz", max_pending=2)
+    for i in range(10):
+        recorder.record(_payload(i), seq=i)
+    assert recorder.stats.dropped >= 7
+    release.set()
+    recorder.close()
+    assert recorder.stats.recorded == 10 - recorder.stats.dropped
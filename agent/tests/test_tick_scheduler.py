@@ -0,0 +1,135 @@
+"""Tests for tick_scheduler — event-driven ticks, debounce and adaptive cadence."""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from models import GameState
+from state_handoff import write_atomic
+from state_reader import StateReader
+from tick_scheduler import InotifyWatcher, StatWatcher, TickScheduler
+
+
+def _scheduler(path, **kwargs) -> TickScheduler:
+    kwargs.setdefault("watcher", StatWatcher(path, poll=0.005))
+    return TickScheduler(path, **kwargs)
+
+
+def _write_later(path, delay: float, count: int = 1, gap: float = 0.01) -> None:
+    def writer():
+        time.sleep(delay)
+        for i in range(count):
+            write_atomic(path, b'{"health": 100}', i)
+            time.sleep(gap)
+
+    threading.Thread(target=writer, daemon=True).start()
+
+
+def test_first_tick_fires_immediately(tmp_path):
+    tick = _scheduler(tmp_path / "game_state.json").wait()
+    assert tick.reason == "startup"
+
+
+def test_times_out_without_changes(tmp_path):
+    sched = _scheduler(tmp_path / "game_state.json", base_interval=0.05)
+    sched.wait()
+    tick = sched.wait()
+    assert tick.reason == "interval elapsed"
+    assert tick.waited >= 0.05
+
+
+def test_burst_of_writes_coalesced(tmp_path):
+    path = tmp_path / "game_state.json"
+    sched = _scheduler(path, base_interval=5.0, min_interval=0.2, debounce=0.05)
+    sched.wait()
+    _write_later(path, 0.02, count=4, gap=0.01)
+    tick = sched.wait()
+    assert tick.reason == "file changed"
+    assert tick.events >= 2
+    assert tick.waited < 1.0
+
+
+def test_backoff_and_urgency(tmp_path):
+    sched = _scheduler(
+        tmp_path / "game_state.json",
+        base_interval=2.0,
+        min_interval=0.5,
+        max_interval=6.0,
+    )
+    calm = GameState(health=100, hunger=100, sanity=150)
+    sched.feedback(calm, decided=False)
+    sched.feedback(calm, decided=False)
+    assert sched.interval == 6.0  # 2 -> 4 -> capped at 6
+    sched.feedback(calm, decided=True)
+    assert sched.interval == 2.0
+    sched.feedback(GameState(health=100, hunger=100, sanity=150, phase="night"), False)
+    assert sched.interval == 0.5
+    assert sched.cadence == "urgent: night"
+
+
+def test_unchanged_state_ignores_rewrites_until_interval(tmp_path):
+    path = tmp_path / "game_state.json"
+    sched = _scheduler(path, base_interval=0.1, min_interval=0.01, max_interval=1.0)
+    sched.wait()
+    calm = GameState(health=100, hunger=100, sanity=150)
+    sched.feedback(calm, decided=False, changed=False)
+    assert sched.idle and sched.interval == 0.2
+    # The exporter keeps rewriting the file although nothing happens
+    _write_later(path, 0.02, count=5, gap=0.02)
+    tick = sched.wait()
+    assert tick.reason == "interval elapsed"
+    assert tick.waited >= 0.2
+    assert tick.events >= 1
+
+    # A changed snapshot ends the idle backoff: file changes fire at once again
+    sched.feedback(calm, decided=True, changed=True)
+    assert not sched.idle
+    _write_later(path, 0.02)
+    assert sched.wait().reason == "file changed"
+
+
+def test_idle_scheduler_fires_on_threat(tmp_path):
+    path = tmp_path / "game_state.json"
+    calm = GameState(health=100, hunger=100, sanity=150)
+    sched = _scheduler(
+        path, base_interval=5.0, min_interval=0.01, probe=StateReader(path).read
+    )
+    sched.wait()
+    sched.feedback(calm, decided=False, changed=False)
+    assert sched.idle
+
+    def writer():
+        time.sleep(0.02)
+        write_atomic(path, calm.model_dump_json().encode(), 1)  # rewrite: ignored
+        time.sleep(0.05)
+        spider = GameState(
+            health=100,
+            hunger=100,
+            sanity=150,
+            threats=[{"name": "spider", "distance": 6.0}],
+        )
+        write_atomic(path, spider.model_dump_json().encode(), 2)
+
+    threading.Thread(target=writer, daemon=True).start()
+    tick = sched.wait()
+    assert tick.reason == "state changed"
+    assert tick.events >= 2
+    assert tick.waited < 1.0
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+def test_inotify_sees_atomic_rename(tmp_path):
+    path = tmp_path / "game_state.json"
+    watcher = InotifyWatcher(path)
+    try:
+        assert not watcher.wait(0.02)
+        (tmp_path / "unrelated.json").write_text("{}")
+        assert not watcher.wait(0.02)
+        _write_later(path, 0.01)
+        assert watcher.wait(1.0)
+    finally:
+        watcher.close()
@@ -0,0 +1,312 @@
+"""
+tick_scheduler.py — Decides when DSAIAgent.decide() runs next.
+
+Replaces the fixed ``--interval`` sleep. A tick fires when game_state.json
+changes (inotify on Linux, stat polling elsewhere) or, failing that, when
+the current interval elapses. The interval adapts:
+
+    decision made           -> back to base_interval
+    nothing to decide       -> doubles (paused game, idle exporter) up to max_interval
+    dusk / night / threats  -> min_interval (and file changes are acted on at once)
+
+Whether the game is idle comes from the state fingerprint
+(StateReader.has_changed), not from file events: the exporter rewrites the
+file on every export whether or not anything happened. While the last
+snapshot was unchanged, plain rewrites do not end the wait; the tick fires
+when the backed-off interval runs out. With a ``probe`` the snapshot behind
+each such event is read, and a decision-relevant change (semantic key, or a
+threat / dusk / night) fires at once.
+
+Bursts of writes are debounced: after the first change the scheduler waits
+until the file has been quiet for ``debounce`` seconds (at most
+min_interval) before firing, and never fires sooner than min_interval
+after the previous tick. Every tick is logged with the reason it fired.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from models import GameState
+from state_fingerprint import FingerprintConfig, semantic_key
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class StatWatcher:
+    """Portable fallback: polls the file's stat signature."""
+
+    def __init__(self, path: Path, poll: float = 0.1):
+        self.path = path
+        self.poll = poll
+        self._last = self._signature()
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to *timeout* seconds; True if the file changed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            sig = self._signature()
+            if sig != self._last:
+                self._last = sig
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll, remaining))
+
+    def close(self) -> None:
+        pass
+
+    def _signature(self) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class InotifyWatcher:
+    """Linux inotify on the state file's directory, via ctypes (no dependency).
+
+    The directory is watched rather than the file because the exporter
+    replaces the file by rename, which would orphan a file watch.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_MODIFY
+        directory = str(path.parent).encode()
+        if self._libc.inotify_add_watch(self._fd, directory, mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, f"inotify_add_watch failed for {path.parent}")
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to *timeout* seconds; True if the file changed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._drain():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def _drain(self) -> bool:
+        """Read all queued events; True if any concerned the state file."""
+        name = self.path.name.encode()
+        hit = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return hit
+            pos = 0
+            while pos < len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, pos)
+                start = pos + _EVENT_HEADER.size
+                if data[start : start + length].rstrip(b"\0") == name:
+                    hit = True
+                pos = start + length
+
+
+def make_watcher(path: Path) -> InotifyWatcher | StatWatcher:
+    """inotify where available, stat polling otherwise."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError) as e:
+            print(f"[TickScheduler] inotify unavailable ({e}), polling instead")
+    return StatWatcher(path)
+
+
+@dataclass(frozen=True)
+class Tick:
+    n: int
+    reason: str  # "file changed", "state changed", "interval elapsed", "startup"
+    waited: float  # seconds since the previous tick
+    events: int  # file changes coalesced into this tick
+    interval: float  # timeout that was in force while waiting
+    cadence: str  # why that timeout was chosen
+
+
+class TickScheduler:
+    def __init__(
+        self,
+        state_file: Path,
+        base_interval: float = 5.0,
+        min_interval: float = 0.5,
+        max_interval: float = 30.0,
+        debounce: float = 0.1,
+        backoff: float = 2.0,
+        watcher: InotifyWatcher | StatWatcher | None = None,
+        history: int = 200,
+        probe: Callable[[], GameState | None] | None = None,
+        fingerprint: FingerprintConfig | None = None,
+    ):
+        """
+        Args:
+            base_interval: Timeout after a tick that produced a decision.
+            min_interval:  Floor between ticks; also the cadence when urgent.
+            max_interval:  Ceiling for the backed-off timeout.
+            debounce:      Quiet period that ends a burst of file changes.
+            backoff:       Timeout multiplier per tick with nothing to decide.
+            watcher:       Change source (default: make_watcher(state_file)).
+            history:       How many recent Ticks to keep in ``history``.
+            probe:         Reads the current snapshot (e.g. a second
+                           StateReader's read) on file events while idle;
+                           without one, idle waits run to the interval.
+            fingerprint:   What counts as a change for the probe (the
+                           agent's StateReader config).
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.debounce = debounce
+        self.backoff = backoff
+        self.watcher = watcher or make_watcher(state_file)
+        self.interval = base_interval
+        self.cadence = "base"
+        self.idle = False  # last snapshot unchanged: file events don't fire ticks
+        self.history: deque[Tick] = deque(maxlen=history)
+        self.probe = probe
+        self.fingerprint = fingerprint
+        self._idle_key: tuple | None = None  # semantic key of the idle snapshot
+        self._count = 0
+        self._last_tick: float | None = None
+
+    def wait(self) -> Tick:
+        """Block until the next tick should fire and return why it did."""
+        now = time.monotonic()
+        if self._last_tick is None:
+            return self._fire("startup", 0, now)
+
+        deadline = self._last_tick + self.interval
+        if self.idle:
+            # Rewrites of an unchanged game don't end the backoff; news does
+            events = 0
+            while (remaining := deadline - time.monotonic()) > 0:
+                if not self.watcher.wait(remaining):
+                    continue
+                events += 1
+                if self._woken():
+                    earliest = self._last_tick + self.min_interval
+                    if time.monotonic() < earliest:
+                        time.sleep(earliest - time.monotonic())
+                    return self._fire("state changed", events, time.monotonic())
+            return self._fire("interval elapsed", events, time.monotonic())
+
+        if not self.watcher.wait(max(0.0, deadline - now)):
+            return self._fire("interval elapsed", 0, time.monotonic())
+
+        # Coalesce the burst: keep absorbing changes until quiet (capped)
+        events = 1
+        burst_end = time.monotonic() + self.min_interval
+        while time.monotonic() < burst_end and self.watcher.wait(
+            min(self.debounce, max(0.0, burst_end - time.monotonic()))
+        ):
+            events += 1
+
+        earliest = self._last_tick + self.min_interval
+        if time.monotonic() < earliest:
+            time.sleep(earliest - time.monotonic())
+        return self._fire("file changed", events, time.monotonic())
+
+    def feedback(
+        self, state: GameState | None, decided: bool, changed: bool | None = None
+    ) -> None:
+        """Adapt the timeout to what the last tick found.
+
+        *changed* is the fingerprint verdict on the tick's snapshot (False
+        when the file was untouched or StateReader.has_changed said no);
+        False makes the scheduler idle until the next interval runs out or
+        the probe sees a change.
+        """
+        urgent = self._urgency(state)
+        self.idle = False
+        if urgent:
+            self.interval, self.cadence = self.min_interval, urgent
+        elif decided:
+            self.interval, self.cadence = self.base_interval, "base"
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+            self.idle = changed is False
+            if self.idle and state is not None:
+                self._idle_key = semantic_key(state, self.fingerprint)
+            self.cadence = (
+                "backing off (state unchanged)"
+                if self.idle
+                else "backing off (nothing to decide)"
+            )
+
+    def close(self) -> None:
+        self.watcher.close()
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _urgency(state: GameState | None) -> str | None:
+        if state is None:
+            return None
+        if state.has_threats:
+            return "urgent: threats"
+        if state.is_night:
+            return "urgent: night"
+        if state.is_dusk:
+            return "urgent: dusk"
+        return None
+
+    def _woken(self) -> bool:
+        """True if the snapshot behind an idle-time file event needs a decision."""
+        if self.probe is None:
+            return False
+        state = self.probe()
+        if state is None:
+            return False
+        if self._urgency(state):
+            return True
+        return semantic_key(state, self.fingerprint) != self._idle_key
+
+    def _fire(self, reason: str, events: int, now: float) -> Tick:
+        self._count += 1
+        waited = now - self._last_tick if self._last_tick is not None else 0.0
+        self._last_tick = now
+        tick = Tick(
+            n=self._count,
+            reason=reason,
+            waited=waited,
+            events=events,
+            interval=self.interval,
+            cadence=self.cadence,
+        )
+        self.history.append(tick)
+        burst = f", {events} changes" if events > 1 else ""
+        print(
+            f"[TickScheduler] #{tick.n} {reason}{burst} after {waited:.2f}s "
+            f"(timeout {self.interval:.1f}s, {self.cadence})"
+        )
+        return tick
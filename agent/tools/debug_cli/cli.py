@@ -8,6 +8,8 @@ import argparse
 import sys
 from pathlib import Path
 
+from inference_backend import BACKENDS
+
 from .formatters import (
     ActionsFormatter,
     JsonFormatter,
@@ -44,12 +46,23 @@ class DebugCli:
         parser.add_argument(
             "--with-llm",
             action="store_true",
-            help="Actually call Ollama and show response",
+            help="Actually call the model and show response",
+        )
+        parser.add_argument(
+            "--backend",
+            choices=BACKENDS,
+            default="ollama",
+            help="Inference backend to call (if --with-llm)",
         )
         parser.add_argument(
             "--model",
             default="llama3.2:latest",
-            help="Ollama model to use (if --with-llm)",
+            help="Model to use (if --with-llm)",
+        )
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Inference server URL (default depends on --backend)",
         )
         return parser
 
@@ -76,7 +89,11 @@ class DebugCli:
             # Call LLM if requested
             llm_response = None
             if parsed_args.with_llm:
-                llm_client = LlmClient(model=parsed_args.model)
+                llm_client = LlmClient(
+                    model=parsed_args.model,
+                    backend=parsed_args.backend,
+                    url=parsed_args.url,
+                )
                 llm_response = llm_client.call(result.prompt_text)
 
             # Select formatter based on flags
@@ -1,25 +1,30 @@
 """
 llm_client.py — LLM interaction wrapper.
 
-Handles calling Ollama and parsing responses.
+Handles calling the inference backend and parsing responses.
 """
 
 from action_parser import ActionParser
-from ollama_client import OllamaClient
+from inference_backend import create_backend
 
 
 class LlmClient:
     """Wrapper for LLM calls with response parsing."""
 
-    def __init__(self, model: str = "llama3.2:latest"):
-        """Initialize with specified model."""
+    def __init__(
+        self,
+        model: str = "llama3.2:latest",
+        backend: str = "ollama",
+        url: str | None = None,
+    ):
+        """Initialize with specified model on *backend* (see create_backend)."""
         self.model = model
-        self.client = OllamaClient(model=model)
+        self.client = create_backend(backend, model=model, url=url)
         self.parser = ActionParser()
 
     def call(self, prompt: str) -> dict:
         """
-        Call Ollama with prompt and parse response.
+        Call the backend with prompt and parse response.
 
         Returns dict with 'raw', 'action', and optionally 'error' keys.
         """
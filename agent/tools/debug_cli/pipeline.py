@@ -8,6 +8,7 @@ results. Single Responsibility: pipeline execution only.
 from pathlib import Path
 
 from action_planner import ActionPlanner
+from decision_context import DecisionContext
 from goal_manager import GoalManager
 from inventory_tracker import InventoryTracker
 from memory import AgentMemory
@@ -61,12 +62,14 @@ class DebugPipeline:
         inv = self.inv_tracker.update(state)
         self.world_tracker.update(state)
 
+        ctx = DecisionContext(state, inv, self.goal_manager, self.action_planner)
+
         # Compute goals
-        goals_text = self.goal_manager.format_for_prompt(state, inv)
-        short_term_goal = self.goal_manager.get_short_term_goal(state, inv)
+        goals_text = ctx.goals_text
+        short_term_goal = ctx.short_term_goal
 
         # Build action list
-        concrete_actions = self.action_planner.get_concrete_actions(inv, state)
+        concrete_actions = ctx.concrete_actions
 
         # Generate prompt
         world_history = self.world_tracker.summary_lines(state)
@@ -8,6 +8,9 @@ import json
 from pathlib import Path
 
 from models import GameState
+from state_delta import apply_delta
+from state_handoff import unpack
+from state_reader import keyframe_path
 
 
 class StateLoadError(Exception):
@@ -25,7 +28,8 @@ class StateLoader:
         Load game state from JSON file.
 
         Args:
-            path: Path to game_state.json file
+            path: Path to game_state.json file (a delta export is applied
+                  to the keyframe mirrored next to it)
 
         Returns:
             Parsed GameState model instance
@@ -37,11 +41,33 @@ class StateLoader:
             raise StateLoadError(f"State file not found: {path}")
 
         try:
-            with open(path) as f:
-                data = json.load(f)
-                state = GameState.model_validate(data)
-                return state
+            # Live exporter files carry a handoff header; fixtures don't
+            envelope = unpack(path.read_bytes())
+            data = json.loads(envelope.payload)
+            if envelope.base is not None:
+                data = apply_delta(StateLoader._keyframe(path, envelope.base), data)
+            state = GameState.model_validate(data)
+            return state
+        except StateLoadError:
+            raise
         except json.JSONDecodeError as e:
             raise StateLoadError(f"Invalid JSON in {path}: {e}")
         except Exception as e:
             raise StateLoadError(f"Failed to load {path}: {e}")
+
+    @staticmethod
+    def _keyframe(path: Path, base: int) -> dict:
+        """The keyframe document a delta export of *path* was built against."""
+        keyframe_file = keyframe_path(path)
+        if not keyframe_file.exists():
+            raise StateLoadError(
+                f"{path} is a delta against keyframe {base}, but {keyframe_file} "
+                "is missing; load the keyframe instead"
+            )
+        envelope = unpack(keyframe_file.read_bytes())
+        if envelope.seq != base:
+            raise StateLoadError(
+                f"{path} is a delta against keyframe {base}, but {keyframe_file} "
+                f"holds keyframe {envelope.seq}; load the keyframe instead"
+            )
+        return json.loads(envelope.payload)
@@ -0,0 +1,363 @@
+"""
+fake_ollama.py — Local stand-in for an Ollama server with injectable latency and failures.
+
+Speaks enough of the Ollama API for the agent, the debug CLI and the
+benchmarks: POST /api/generate and /api/chat (blocking or streamed NDJSON,
+with eval counters), GET/HEAD / and GET /api/tags. Answers are built from
+the prompt's [VALID_ACTIONS] block, so every tick gets a valid decision.
+
+Latency per request = prefill (sampled from the latency model) + token_ms
+per generated token; streams emit their tokens at that pace. Every random
+draw for a request comes from an RNG seeded with --seed and the request's
+number, so a run with the same requests in the same order is reproducible.
+
+    uv run python -m tools.fake_ollama --port 11434 --latency lognormal --median 1.5
+    uv run python -m tools.fake_ollama --latency heavy-tail --alpha 1.2 --error-rate 0.05
+    uv run main.py --url http://127.0.0.1:11434
+
+Latency models:
+    fixed       always --median seconds
+    lognormal   median --median, shape --sigma
+    heavy-tail  Pareto with median --median and shape --alpha (lower = heavier)
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from stub_backend import first_valid_action, offered_options
+
+LATENCY_KINDS = ("fixed", "lognormal", "heavy-tail")
+POLICIES = ("first", "random", "script")
+_RAMBLE = " I chose this because it moves us toward the current goal."
+
+
+@dataclass
+class LatencyModel:
+    kind: str = "fixed"
+    median: float = 0.5  # seconds
+    sigma: float = 0.5  # lognormal shape
+    alpha: float = 1.5  # Pareto shape for heavy-tail
+    cap: float = 120.0  # no single sample above this
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            value = self.median
+        elif self.kind == "lognormal":
+            value = self.median * math.exp(rng.gauss(0.0, self.sigma))
+        elif self.kind == "heavy-tail":
+            # Pareto(x_m, alpha) has median x_m * 2 ** (1 / alpha)
+            x_m = self.median / 2 ** (1 / self.alpha)
+            value = x_m * rng.paretovariate(self.alpha)
+        else:
+            raise ValueError(f"Unknown latency model {self.kind!r}")
+        return min(self.cap, value)
+
+
+@dataclass
+class FakeConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    token_ms: float = 0.0  # per generated token, on top of the sampled prefill
+    error_rate: float = 0.0  # fraction answered with HTTP 500
+    timeout_rate: float = 0.0  # fraction that hang for `hang` seconds, then drop
+    hang: float = 300.0
+    policy: str = "first"  # first | random | script
+    script: list[str] = field(default_factory=list)  # responses, cycled
+    ramble: int = 0  # filler tokens after the action (what --stream saves)
+    seed: int = 0
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    errors: int = 0  # injected HTTP 500s
+    timeouts: int = 0  # injected hangs
+    generated: int = 0  # tokens actually sent (a cancelled stream stops early)
+    prefill: list[float] = field(default_factory=list)  # sampled latencies
+
+
+def _tokens(text: str) -> list[str]:
+    """~4-character tokens, like the stub's token estimate."""
+    return [text[i : i + 4] for i in range(0, len(text), 4)] or [""]
+
+
+class FakeOllama:
+    def __init__(
+        self, config: FakeConfig | None = None, host: str = "127.0.0.1", port: int = 0
+    ):
+        """Port 0 picks a free port; see ``url`` once constructed."""
+        self.config = config or FakeConfig()
+        self.stats = ServerStats()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread (the CLI) until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Request planning (called from handler threads)
+    # ------------------------------------------------------------------
+
+    def plan(self, prompt: str) -> tuple[str, float, list[str]]:
+        """(fate, prefill seconds, tokens) for the next request.
+
+        fate is "ok", "error" or "timeout".
+        """
+        cfg = self.config
+        with self._lock:
+            n = self.stats.requests
+            self.stats.requests += 1
+        rng = random.Random(cfg.seed * 1_000_003 + n)
+
+        roll = rng.random()
+        if roll < cfg.error_rate:
+            fate = "error"
+        elif roll < cfg.error_rate + cfg.timeout_rate:
+            fate = "timeout"
+        else:
+            fate = "ok"
+        prefill = cfg.latency.sample(rng)
+        answer = self._answer(prompt, n, rng)
+        filler = _tokens(_RAMBLE)
+        tokens = _tokens(answer) + [filler[i % len(filler)] for i in range(cfg.ramble)]
+        with self._lock:
+            if fate == "error":
+                self.stats.errors += 1
+            elif fate == "timeout":
+                self.stats.timeouts += 1
+            self.stats.prefill.append(prefill)
+        return fate, prefill, tokens
+
+    def count_token(self) -> None:
+        with self._lock:
+            self.stats.generated += 1
+
+    def _answer(self, prompt: str, n: int, rng: random.Random) -> str:
+        cfg = self.config
+        if cfg.policy == "script" and cfg.script:
+            return cfg.script[n % len(cfg.script)]
+        if cfg.policy == "random":
+            options = offered_options(prompt)
+            if options:
+                pick = rng.choice(options)
+                return json.dumps(
+                    {"action": pick.action, "target": pick.target, "reason": "fake"}
+                )
+        return first_valid_action(prompt)
+
+
+def _make_handler(fake: FakeOllama) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_HEAD(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self) -> None:
+            if self.path == "/api/tags":
+                self._send_json(200, {"models": [{"name": "fake"}]})
+            else:
+                self._send_text(200, "Ollama is running")
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if self.path == "/api/generate":
+                chat, prompt = False, body.get("prompt", "")
+            elif self.path == "/api/chat":
+                messages = body.get("messages") or [{}]
+                chat, prompt = True, messages[-1].get("content", "")
+            else:
+                self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+                return
+
+            fate, prefill, tokens = fake.plan(prompt)
+            if fate == "timeout":
+                time.sleep(fake.config.hang)
+                self.close_connection = True
+                return
+            time.sleep(prefill)
+            if fate == "error":
+                self._send_json(500, {"error": "injected failure"})
+                return
+
+            token_s = fake.config.token_ms / 1000
+            counters = {
+                "prompt_eval_count": len(prompt) // 4,
+                "prompt_eval_duration": int(prefill * 1e9),
+                "eval_count": len(tokens),
+                "eval_duration": int(len(tokens) * token_s * 1e9),
+            }
+            if body.get("stream", True):  # Ollama streams by default
+                self._stream(chat, body, tokens, token_s, counters)
+                return
+            time.sleep(token_s * len(tokens))
+            for _ in tokens:
+                fake.count_token()
+            text = "".join(tokens)
+            self._send_json(200, self._chunk(chat, body, text, True) | counters)
+
+        # --------------------------------------------------------------
+
+        @staticmethod
+        def _chunk(chat: bool, body: dict, text: str, done: bool) -> dict:
+            chunk = {"model": body.get("model", "fake"), "done": done}
+            if chat:
+                chunk["message"] = {"role": "assistant", "content": text}
+            else:
+                chunk["response"] = text
+            return chunk
+
+        def _stream(
+            self,
+            chat: bool,
+            body: dict,
+            tokens: list[str],
+            token_s: float,
+            counters: dict,
+        ) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for tok in tokens:
+                    time.sleep(token_s)
+                    self._write_chunk(self._chunk(chat, body, tok, False))
+                    fake.count_token()
+                self._write_chunk(self._chunk(chat, body, "", True) | counters)
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # client cancelled
+
+        def _send_json(self, status: int, obj: dict) -> None:
+            data = json.dumps(obj).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_text(self, status: int, text: str) -> None:
+            data = text.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _write_chunk(self, obj: dict) -> None:
+            line = json.dumps(obj).encode() + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    script = []
+    if args.script:
+        script = [line for line in args.script.read_text("utf-8").splitlines() if line]
+    return FakeConfig(
+        latency=LatencyModel(
+            kind=args.latency, median=args.median, sigma=args.sigma, alpha=args.alpha
+        ),
+        token_ms=args.token_ms,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        hang=args.hang,
+        policy="script" if script else args.policy,
+        script=script,
+        ramble=args.ramble,
+        seed=args.seed,
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Server options, shared with the benchmarks that start one in-process."""
+    parser.add_argument("--latency", choices=LATENCY_KINDS, default="fixed")
+    parser.add_argument(
+        "--median", type=float, default=0.5, help="Median prefill seconds"
+    )
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal shape")
+    parser.add_argument("--alpha", type=float, default=1.5, help="heavy-tail shape")
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--hang", type=float, default=300.0, help="Seconds an injected timeout hangs"
+    )
+    parser.add_argument("--policy", choices=POLICIES, default="first")
+    parser.add_argument(
+        "--script", type=Path, help="File of responses, one per line, cycled"
+    )
+    parser.add_argument(
+        "--ramble", type=int, default=0, help="Filler tokens after the action"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Fake Ollama server with injectable latency and failures"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    add_arguments(parser)
+    parsed = parser.parse_args(args)
+
+    fake = FakeOllama(config_from_args(parsed), parsed.host, parsed.port)
+    print(
+        f"[FakeOllama] Listening on {fake.url} — {parsed.latency} latency "
+        f"(median {parsed.median}s), {parsed.token_ms}ms/token, "
+        f"errors {parsed.error_rate:.0%}, timeouts {parsed.timeout_rate:.0%}"
+    )
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    fake.stop()
+    s = fake.stats
+    print(
+        f"\n[FakeOllama] {s.requests} requests, {s.errors} errors, "
+        f"{s.timeouts} timeouts, {s.generated} tokens"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
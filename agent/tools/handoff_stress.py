@@ -0,0 +1,154 @@
+"""
+handoff_stress.py — Stand-in for llm_state_exporter.lua that hammers StateReader.
+
+Runs a writer thread that rewrites game_state.json as fast as asked while the
+main thread polls it through StateReader, then reports how many reads were
+clean, retried or lost.
+
+    uv run python -m tools.handoff_stress --seconds 5 --interval 0.001
+    uv run python -m tools.handoff_stress --in-place   # the old, torn behaviour
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from state_handoff import pack, write_atomic
+from state_reader import StateReader
+
+
+def _payload(seq: int, n_entities: int) -> bytes:
+    """A valid snapshot whose size varies with *seq* (so tears are visible)."""
+    entities = [
+        {"name": f"sapling{i}", "type": "harvestable", "distance": float(i)}
+        for i in range(n_entities + seq % 7)
+    ]
+    state = {
+        "day": 1 + seq // 100,
+        "health": 100,
+        "hunger": 100,
+        "sanity": 150,
+        "nearby_entities": entities,
+    }
+    return json.dumps(state).encode()
+
+
+class StandInWriter(threading.Thread):
+    """Rewrites *path* every *interval* seconds until stopped.
+
+    atomic=True mirrors the exporter's temp-file + rename protocol.
+    atomic=False overwrites in place in small chunks, reproducing the torn
+    reads the handoff protocol exists to prevent.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        interval: float = 0.001,
+        atomic: bool = True,
+        n_entities: int = 30,
+    ):
+        super().__init__(daemon=True)
+        self.path = path
+        self.interval = interval
+        self.atomic = atomic
+        self.n_entities = n_entities
+        self.seq = 0
+        self._stop = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            self.seq += 1
+            payload = _payload(self.seq, self.n_entities)
+            if self.atomic:
+                write_atomic(self.path, payload, self.seq)
+            else:
+                self._write_in_place(pack(payload, self.seq))
+            time.sleep(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.join()
+
+    def _write_in_place(self, data: bytes, chunk: int = 256) -> None:
+        with open(self.path, "wb") as f:
+            for i in range(0, len(data), chunk):
+                f.write(data[i : i + chunk])
+                f.flush()
+
+
+@dataclass
+class StressResult:
+    reads: int
+    ok: int
+    lost: int
+    retried: int
+    writes: int
+    seq_regressions: int
+
+
+def run_stress(
+    path: Path, seconds: float, interval: float = 0.001, atomic: bool = True
+) -> StressResult:
+    """Poll *path* with StateReader for *seconds* while a StandInWriter rewrites it."""
+    writer = StandInWriter(path, interval=interval, atomic=atomic)
+    write_atomic(path, _payload(0, writer.n_entities), 0)
+    reader = StateReader(path)
+    writer.start()
+
+    reads = ok = regressions = 0
+    last_seq = -1
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline:
+            reads += 1
+            if reader.read() is not None:
+                ok += 1
+                if reader.last_seq is not None and reader.last_seq < last_seq:
+                    regressions += 1
+                last_seq = reader.last_seq if reader.last_seq is not None else last_seq
+    finally:
+        writer.stop()
+
+    return StressResult(
+        reads=reads,
+        ok=ok,
+        lost=reader.stats.failed,
+        retried=reader.stats.retried,
+        writes=writer.seq,
+        seq_regressions=regressions,
+    )
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stress-test the state handoff")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.001)
+    parser.add_argument(
+        "--in-place",
+        action="store_true",
+        help="Overwrite in place instead of temp file + rename",
+    )
+    parsed = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run_stress(
+            Path(tmp) / "game_state.json",
+            parsed.seconds,
+            interval=parsed.interval,
+            atomic=not parsed.in_place,
+        )
+    print(
+        f"writes={result.writes} reads={result.reads} ok={result.ok} "
+        f"lost={result.lost} retried={result.retried} "
+        f"seq_regressions={result.seq_regressions}"
+    )
+    return 0 if result.lost == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
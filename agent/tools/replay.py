@@ -0,0 +1,309 @@
+"""
+replay.py — Faster-than-real-time replay of recorded game states through DSAIAgent.
+
+Feeds a trace (state_recorder) or a directory of state JSON files through
+the real decide() pipeline — StateReader, trackers, ActionPlanner,
+GoalManager, build_prompt, ActionParser — with a VirtualClock and a
+deterministic LLM stand-in, then reports decisions/sec, per-stage timings
+and the resulting action stream.
+
+    uv run python -m tools.replay ../state/traces/20250101-120000.trace.gz
+    uv run python -m tools.replay fixtures/ --repeat 200 --actions-out actions.jsonl
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from action_parser import ActionParser
+from action_planner import ActionPlanner
+from action_writer import ActionWriter
+from clock import SYSTEM_CLOCK, Clock, VirtualClock
+from conversation_log import ConversationLog
+from decision_cache import DecisionCache
+from goal_manager import GoalManager
+from inference_backend import InferenceBackend
+from inventory_tracker import InventoryTracker
+from llm_agent import DSAIAgent
+from memory import AgentMemory
+from models import GameState
+from plan_executor import PlanStats
+from preemption import PreemptionPolicy
+from reflexes import ActionArbiter
+from stage_timer import StageTimer
+from state_handoff import write_atomic
+from state_reader import ParseMode, ReadStats, StateReader
+from state_recorder import TraceRecord, iter_trace
+from stub_backend import StubBackend, planning_policy
+from world_tracker import WorldTracker
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+class CollectingWriter(ActionWriter):
+    """ActionWriter that keeps actions in memory instead of writing the file."""
+
+    def __init__(self):
+        super().__init__(Path(os.devnull))
+        self.actions: list[dict] = []
+
+    def write(self, action: dict) -> None:
+        self.actions.append(action)
+
+
+@dataclass
+class ReplayResult:
+    ticks: int  # snapshots fed to decide()
+    decisions: int  # ticks that produced an action past the overrides
+    seconds: float  # wall time spent inside decide()
+    timer: StageTimer
+    read_stats: ReadStats
+    llm_calls: int = 0  # generate() calls answered by the LLM stand-in
+    actions: list[dict] = field(default_factory=list)  # every emitted action
+    plan_stats: PlanStats = field(default_factory=PlanStats)
+
+    @property
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.seconds if self.seconds else 0.0
+
+    @property
+    def decisions_per_sec(self) -> float:
+        return self.decisions / self.seconds if self.seconds else 0.0
+
+
+def load_records(path: Path, interval: float = 5.0) -> list[TraceRecord]:
+    """Read a trace file, a single state JSON file or a directory of them.
+
+    Plain JSON files get synthetic timestamps *interval* seconds apart.
+    """
+    if path.is_dir():
+        files = sorted(path.glob("*.json"))
+    elif path.suffix == ".json":
+        files = [path]
+    else:
+        return list(iter_trace(path))
+    return [
+        TraceRecord(timestamp=i * interval, seq=None, payload=f.read_bytes())
+        for i, f in enumerate(files)
+    ]
+
+
+def wire_agent(
+    workdir: Path,
+    llm,
+    clock: Clock = SYSTEM_CLOCK,
+    mode: ParseMode = ParseMode.JSON,
+    decision_cache: DecisionCache | None = None,
+    prompt_layout: str = "default",
+    deadline: float | None = None,
+    late_policy: str = "next-tick",
+    max_plan_steps: int = 0,
+    speculation_llm=None,
+    preemption: PreemptionPolicy | None = None,
+    reflexes: bool = False,
+) -> tuple[DSAIAgent, CollectingWriter]:
+    """A DSAIAgent with real collaborators whose files all live in *workdir*.
+
+    The agent reads ``workdir / "game_state.json"``; actions are collected
+    in the returned writer instead of being written out. With *reflexes*
+    the writer sits behind an ActionArbiter (agent.arbiter).
+    """
+    writer = CollectingWriter()
+    memory = AgentMemory(workdir / "agent_memory.jsonl")
+    agent = DSAIAgent(
+        state_reader=StateReader(workdir / "game_state.json", mode=mode),
+        memory=memory,
+        llm_client=llm,
+        action_parser=ActionParser(),
+        action_writer=writer,
+        inventory_tracker=InventoryTracker(memory),
+        conversation_log=ConversationLog(workdir / "conversation_log.jsonl"),
+        world_tracker=WorldTracker(ttl_seconds=120.0, clock=clock),
+        goal_planner=ActionPlanner(),
+        goal_manager=GoalManager(),
+        clock=clock,
+        decision_cache=decision_cache,
+        prompt_layout=prompt_layout,
+        deadline=deadline,
+        late_policy=late_policy,
+        max_plan_steps=max_plan_steps,
+        speculation_client=speculation_llm,
+        arbiter=ActionArbiter(writer, clock=clock) if reflexes else None,
+        preemption=preemption,
+    )
+    return agent, writer
+
+
+def fixture_state(name: str, **fields) -> dict:
+    """State document *name* from fixtures/, with *fields* replaced."""
+    doc = json.loads((FIXTURES / name).read_text())
+    doc.update(fields)
+    return doc
+
+
+def publish_state(workdir: Path, state: dict | GameState, seq: int) -> None:
+    """Write *state* to ``workdir / "game_state.json"`` as the exporter does."""
+    if isinstance(state, GameState):
+        payload = state.model_dump_json().encode()
+    else:
+        payload = json.dumps(state).encode()
+    write_atomic(workdir / "game_state.json", payload, seq)
+
+
+def decide_on(
+    agent: DSAIAgent, workdir: Path, state: dict | GameState, seq: int
+) -> dict | None:
+    """publish_state() then agent.decide(), with its console output swallowed."""
+    publish_state(workdir, state, seq)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return agent.decide()
+
+
+def replay(
+    records: Iterable[TraceRecord],
+    llm: InferenceBackend | None = None,
+    repeat: int = 1,
+    mode: ParseMode = ParseMode.JSON,
+    verbose: bool = False,
+    decision_cache: DecisionCache | None = None,
+    prompt_layout: str = "default",
+    max_plan_steps: int = 0,
+) -> ReplayResult:
+    """Run *records* through a freshly wired DSAIAgent *repeat* times."""
+    records = list(records)
+    span = (records[-1].timestamp - records[0].timestamp + 1.0) if records else 0.0
+    clock = VirtualClock(records[0].timestamp if records else 0.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        state_file = workdir / "game_state.json"
+        if decision_cache is not None:
+            decision_cache.clock = clock
+        agent, writer = wire_agent(
+            workdir,
+            llm or StubBackend(),
+            clock,
+            mode,
+            decision_cache,
+            prompt_layout,
+            max_plan_steps=max_plan_steps,
+        )
+
+        ticks = 0
+        spent = 0.0
+        with (
+            open(os.devnull, "w") as devnull,
+            (
+                contextlib.nullcontext()
+                if verbose
+                else contextlib.redirect_stdout(devnull)
+            ),
+        ):
+            for round_ in range(repeat):
+                for rec in records:
+                    clock.set(rec.timestamp + round_ * span)
+                    ticks += 1
+                    write_atomic(state_file, rec.payload, ticks)
+                    start = time.perf_counter()
+                    agent.decide()
+                    spent += time.perf_counter() - start
+
+    return ReplayResult(
+        ticks=ticks,
+        decisions=agent.decision_count,
+        seconds=spent,
+        timer=agent.timer,
+        read_stats=agent.state_reader.stats,
+        llm_calls=agent.llm_client.metrics.calls,
+        plan_stats=agent.plan.stats,
+        actions=writer.actions,
+    )
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay recorded game states through DSAIAgent.decide()"
+    )
+    parser.add_argument(
+        "source", type=Path, help="Trace file, state JSON file or directory"
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Replay N times")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Seconds between plain JSON snapshots (default: 5.0)",
+    )
+    parser.add_argument(
+        "--parse-mode",
+        choices=[m.value for m in ParseMode],
+        default=ParseMode.JSON.value,
+    )
+    parser.add_argument(
+        "--actions-out", type=Path, help="Write the action stream as JSONL"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Put an in-memory DecisionCache in front of the LLM stand-in",
+    )
+    parser.add_argument(
+        "--plan-steps",
+        type=int,
+        default=0,
+        help="Let the stand-in plan this many follow-up steps per reply",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Keep the agent's console output"
+    )
+    parsed = parser.parse_args(args)
+
+    records = load_records(parsed.source, parsed.interval)
+    if not records:
+        print(f"[Replay] No snapshots in {parsed.source}")
+        return 1
+
+    cache = DecisionCache() if parsed.cache else None
+    result = replay(
+        records,
+        llm=StubBackend(planning_policy(parsed.plan_steps))
+        if parsed.plan_steps
+        else None,
+        repeat=parsed.repeat,
+        mode=ParseMode(parsed.parse_mode),
+        verbose=parsed.verbose,
+        decision_cache=cache,
+        max_plan_steps=parsed.plan_steps,
+    )
+
+    print(
+        f"[Replay] {result.ticks} ticks, {result.decisions} decisions in "
+        f"{result.seconds:.3f}s — {result.ticks_per_sec:.0f} ticks/s, "
+        f"{result.decisions_per_sec:.0f} decisions/s, {result.llm_calls} LLM calls"
+    )
+    print(result.timer.report())
+    if cache is not None:
+        print(
+            f"[Replay] Cache: {cache.stats.hits} hits / "
+            f"{cache.stats.hits + cache.stats.misses} lookups "
+            f"({cache.stats.hit_rate:.0%}), {cache.stats.guarded} guarded"
+        )
+    counts = Counter(a["action"] for a in result.actions)
+    print("[Replay] Actions: " + ", ".join(f"{a}={n}" for a, n in counts.most_common()))
+
+    if parsed.actions_out:
+        with open(parsed.actions_out, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(action) + "\n" for action in result.actions)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,9 +6,9 @@ range disappears from the next snapshot. WorldTracker persists what was recently
 visible so the agent can reason about resources it saw a few ticks ago.
 """
 
-import time
 from dataclasses import dataclass
 
+from clock import SYSTEM_CLOCK, Clock
 from models import GameState
 
 
@@ -27,14 +27,21 @@ def _fmt_age(seconds: float) -> str:
 
 
 class WorldTracker:
-    def __init__(self, ttl_seconds: float = 120.0, max_entries: int = 30):
+    def __init__(
+        self,
+        ttl_seconds: float = 120.0,
+        max_entries: int = 30,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
         """
         Args:
             ttl_seconds:  How long to remember an entity after it leaves view.
             max_entries:  Maximum number of entities to keep in memory.
+            clock:        Time source (a VirtualClock during replay).
         """
         self.ttl = ttl_seconds
         self.max_entries = max_entries
+        self.clock = clock
         self._seen: dict[str, SeenEntity] = {}
 
     # ------------------------------------------------------------------
@@ -43,7 +50,7 @@ class WorldTracker:
 
     def update(self, state: GameState) -> None:
         """Ingest the current nearby_entities list and expire stale entries."""
-        now = time.time()
+        now = self.clock.time()
         for ent in state.nearby_entities:
             key = ent.name if ent.name else "unknown"
             if key in self._seen:
@@ -73,7 +80,7 @@ class WorldTracker:
 
     def summary_lines(self, state: GameState, now: float | None = None) -> str:
         """Return a compact prompt-ready string of recently-seen-but-gone entities."""
-        now = now or time.time()
+        now = now or self.clock.time()
         past = self.not_currently_visible(state)
         if not past:
             return ""
@@ -68,4 +68,31 @@ function JSONUtils._EncodeValue(tbl)
     end
 end
 
+-- Encode each top-level field separately: { key = "<json>" }.
+-- Used by the delta exporter to compare fields between exports as strings.
+function JSONUtils.EncodeFields(tbl)
+    local success, result = pcall(function()
+        local fields = {}
+        for k, v in pairs(tbl) do
+            fields[tostring(k)] = JSONUtils._EncodeValue(v)
+        end
+        return fields
+    end)
+
+    if success then
+        return result
+    else
+        return {}
+    end
+end
+
+-- Assemble a JSON object from pre-encoded field values (see EncodeFields)
+function JSONUtils.JoinObject(fields)
+    local parts = {}
+    for k, v in pairs(fields) do
+        table.insert(parts, '"' .. k .. '":' .. v)
+    end
+    return "{" .. table.concat(parts, ",") .. "}"
+end
+
 return JSONUtils
@@ -17,6 +17,16 @@ local LLMStateExporter = Class(function(self, inst)
     self.last_export_time = 0
     self.state_dir = "../mods/ds_llm/state"
     self.state_file = self.state_dir .. "/game_state.json"
+    -- Handoff sequence number: increases by one per export (see agent/state_handoff.py)
+    self.export_seq = 0
+
+    -- Delta export (see agent/state_delta.py): between keyframes only changed
+    -- fields and entity additions/removals are written. Off by default.
+    self.delta_export = false
+    self.keyframe_every = 12 -- exports per keyframe when delta_export is on
+    self.keyframe_file = self.state_dir .. "/game_state.keyframe.json"
+    self.keyframe = nil -- {seq, fields = {key = json}, entities = {json = count}}
+    self.exports_since_keyframe = 0
     self.memory_file = self.state_dir .. "/game_memory.json"
 
     print("[LLMStateExporter] Initializing...")
@@ -165,16 +175,7 @@ function LLMStateExporter:ExportGameState()
         self.pending_actions = {}
 
         -- Write to JSON file using JSONUtils
-        local json_str = JSONUtils.Encode(state)
-
-        local f = io.open(self.state_file, "w")
-
-        if f then
-            f:write(json_str)
-            f:close()
-        else
-            print("[ERROR] [LLMStateExporter] Failed to open: " .. self.state_file)
-        end
+        self:WriteState(state)
     end)
 
     if not success then
@@ -183,6 +184,125 @@ function LLMStateExporter:ExportGameState()
     end
 end
 
+-- Per-export event buffers: always sent in a delta (they are cleared each export)
+local ALWAYS_SEND = { speech_log = true, action_log = true, memory_log = true }
+
+-- Full snapshot, or keyframe/delta when delta_export is on
+function LLMStateExporter:WriteState(state)
+    local fields = JSONUtils.EncodeFields(state)
+    self.export_seq = self.export_seq + 1
+
+    if not self.delta_export then
+        self:WriteHandoff(self.state_file, JSONUtils.JoinObject(fields), nil)
+        return
+    end
+
+    if self.keyframe == nil or self.exports_since_keyframe >= self.keyframe_every then
+        local json_str = JSONUtils.JoinObject(fields)
+        -- Mirror the keyframe first so a reader that sees its deltas can find it
+        self:WriteHandoff(self.keyframe_file, json_str, "K")
+        self:WriteHandoff(self.state_file, json_str, "K")
+        local entities = {}
+        for _, e in ipairs(state.nearby_entities or {}) do
+            local enc = JSONUtils.Encode(e)
+            entities[enc] = (entities[enc] or 0) + 1
+        end
+        self.keyframe = { seq = self.export_seq, fields = fields, entities = entities }
+        self.exports_since_keyframe = 0
+        return
+    end
+
+    self.exports_since_keyframe = self.exports_since_keyframe + 1
+    self:WriteHandoff(self.state_file, self:EncodeDelta(state, fields), "D" .. self.keyframe.seq)
+end
+
+-- Patch against the current keyframe (cumulative, not against the last delta)
+function LLMStateExporter:EncodeDelta(state, fields)
+    local kf = self.keyframe
+    local set_parts = {}
+    local unset = {}
+    for k, v in pairs(fields) do
+        if k ~= "nearby_entities" and (ALWAYS_SEND[k] or kf.fields[k] ~= v) then
+            table.insert(set_parts, '"' .. k .. '":' .. v)
+        end
+    end
+    for k, _ in pairs(kf.fields) do
+        if fields[k] == nil then
+            table.insert(unset, '"' .. k .. '"')
+        end
+    end
+
+    -- Entity multiset diff against the keyframe
+    local remaining = {}
+    for enc, n in pairs(kf.entities) do
+        remaining[enc] = n
+    end
+    local added = {}
+    local current = state.nearby_entities or {}
+    for _, e in ipairs(current) do
+        local enc = JSONUtils.Encode(e)
+        if (remaining[enc] or 0) > 0 then
+            remaining[enc] = remaining[enc] - 1
+        else
+            table.insert(added, enc)
+        end
+    end
+    local removed = {}
+    for enc, n in pairs(remaining) do
+        for _ = 1, n do
+            table.insert(removed, enc)
+        end
+    end
+
+    local entities_part = ""
+    if #added + #removed >= #current then
+        -- High churn (Wilson walking): resending the list is smaller
+        table.insert(set_parts, '"nearby_entities":' .. (fields.nearby_entities or "[]"))
+    else
+        entities_part = ',"entities_added":[' .. table.concat(added, ",") .. ']'
+            .. ',"entities_removed":[' .. table.concat(removed, ",") .. ']'
+    end
+
+    return '{"set":{' .. table.concat(set_parts, ",") .. '},"unset":['
+        .. table.concat(unset, ",") .. ']' .. entities_part .. '}'
+end
+
+-- Versioned handoff: header + payload go to a temp file that is then renamed
+-- over the target, so the Python reader never sees a half-written file
+-- (except in the Windows fallback below, which its length check catches).
+-- Header: "#DSLLM1 <seq> <payload byte length>[ K|D<keyframe seq>]\n"
+function LLMStateExporter:WriteHandoff(path, json_str, kind)
+    local header = "#DSLLM1 " .. self.export_seq .. " " .. #json_str
+    if kind then
+        header = header .. " " .. kind
+    end
+    local tmp_path = path .. ".tmp"
+
+    local f = io.open(tmp_path, "wb")
+    if not f then
+        print("[ERROR] [LLMStateExporter] Failed to open: " .. tmp_path)
+        return
+    end
+    f:write(header .. "\n")
+    f:write(json_str)
+    f:close()
+
+    -- os.rename cannot replace an existing file on Windows: overwrite the
+    -- target in place with one write instead, so it never goes missing. A
+    -- reader that lands mid-write sees fewer payload bytes than the header
+    -- announces and re-reads once after StateReader.retry_interval (10 ms).
+    if not os.rename(tmp_path, path) then
+        local out = io.open(path, "wb")
+        if not out then
+            print("[ERROR] [LLMStateExporter] Failed to open: " .. path)
+            return
+        end
+        out:write(header .. "\n" .. json_str)
+        out:close()
+        os.remove(tmp_path)
+    end
+end
+
 -- Update loop
 function LLMStateExporter:OnUpdate(dt)
     local success = pcall(function()